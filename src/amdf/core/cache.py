@@ -0,0 +1,86 @@
+"""
+AMDF Local Cache
+On-disk cache under ~/.amdf shared by the cluster and schema sources
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from .config import config
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) a directory inside the AMDF cache"""
+    path = Path(config.cache_dir).expanduser().joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def cache_key(*parts: Optional[str]) -> str:
+    """Stable file-name-safe key for a tuple of strings"""
+    joined = "\0".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha256(joined.encode("utf-8")).hexdigest()[:32]
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file atomically so concurrent readers never see partial content"""
+    write_atomic_stream(path, io.BytesIO(data))
+
+
+def write_atomic_stream(path: Path, stream) -> None:
+    """Copy a binary stream to a file atomically, in chunks, without holding it in memory"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            shutil.copyfileobj(stream, f, 1024 * 1024)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_json(path: Path, ttl: Optional[float] = None) -> Optional[Any]:
+    """Load a cached JSON file, or None if missing, unreadable or older than ttl seconds"""
+    try:
+        if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_json(path: Path, value: Any) -> None:
+    """Store a JSON-serializable value in the cache"""
+    try:
+        write_atomic(path, json.dumps(value).encode("utf-8"))
+    except OSError:
+        # The cache is an optimization, never fail the operation because of it
+        pass
+
+
+def load_pickle(path: Path) -> Optional[Any]:
+    """Load a pickled cache entry, or None if missing or unreadable"""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+
+
+def store_pickle(path: Path, value: Any) -> None:
+    """Store a value in the cache in pickle form, which reloads much faster than JSON"""
+    try:
+        write_atomic(path, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except OSError:
+        pass
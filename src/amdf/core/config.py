@@ -17,9 +17,20 @@ class AMDFConfig(BaseSettings):
     
     # Kubernetes
     kubectl_context: Optional[str] = None
+    use_kube_client: bool = True  # Talk to the API server directly, kubectl is the fallback
+    list_page_size: int = 500  # Items per page when listing CRDs
+    fanout_workers: int = 8  # Clusters queried concurrently with several contexts
     
+    # Cache
+    cache_dir: str = "~/.amdf"
+    crd_list_ttl: int = 300  # Seconds a cached CRD listing stays fresh, 0 disables it
+    openapi_ttl: int = 86400  # Seconds before a cached Kubernetes OpenAPI spec is revalidated
+    openapi_timeout: int = 60  # Seconds to wait when downloading an OpenAPI spec
+    schema_store: Optional[str] = None  # Offline Kubernetes schema store, defaults to <cache_dir>/schemas.sqlite
+
     # KCL
     kcl_indent: str = "    "
+    max_schema_depth: int = 32  # Nesting levels rendered as schemas, deeper objects become {str:any}; 0 disables the limit
     
     # Output
     verbose: bool = False
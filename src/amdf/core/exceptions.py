@@ -18,6 +18,19 @@ class KubectlError(AMDFError):
     pass
 
 
+class KubeAPIError(KubectlError):
+    """Raised when a request to the Kubernetes API fails"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class KubeconfigError(AMDFError):
+    """Raised when kubeconfig cannot be used by the built-in API client"""
+    pass
+
+
 class KCLGenerationError(AMDFError):
     """Raised when KCL schema generation fails"""
     pass
@@ -0,0 +1,533 @@
+"""
+AMDF Kubernetes API Client
+Minimal in-process client that talks to the API server directly instead of
+spawning kubectl for every request
+"""
+
+import base64
+import gzip
+import http.client
+import json
+import os
+import queue
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+import yaml
+
+from .config import config
+from .exceptions import KubeAPIError, KubeconfigError
+
+CRD_API_PATH = "/apis/apiextensions.k8s.io/v1/customresourcedefinitions"
+
+# Ask the API server for metadata only, without the (large) CRD specs
+PARTIAL_METADATA = "application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1, application/json"
+PARTIAL_METADATA_LIST = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1, application/json"
+
+# Keys in kubeconfig entries that point to files relative to the kubeconfig itself
+_PATH_KEYS = ("certificate-authority", "client-certificate", "client-key", "tokenFile")
+
+# kubeconfig settings the client does not implement: such contexts are left to kubectl
+_UNSUPPORTED_CLUSTER_KEYS = ("proxy-url", "tls-server-name")
+_UNSUPPORTED_USER_KEYS = ("as", "as-uid", "as-groups", "as-user-extra")
+
+
+def _kubeconfig_paths(kubeconfig: Optional[str] = None) -> List[Path]:
+    if kubeconfig:
+        return [Path(kubeconfig).expanduser()]
+    env_value = os.environ.get("KUBECONFIG")
+    if env_value:
+        return [Path(p).expanduser() for p in env_value.split(os.pathsep) if p]
+    return [Path.home() / ".kube" / "config"]
+
+
+def load_kubeconfig(kubeconfig: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load and merge kubeconfig files the same way kubectl does.
+
+    Files come from the explicit path, $KUBECONFIG or ~/.kube/config. For
+    clusters, users and contexts the first file defining a name wins, and
+    relative file references are resolved against the file that declared them.
+    """
+    merged = {"clusters": {}, "users": {}, "contexts": {}, "current-context": None}
+
+    for path in _kubeconfig_paths(kubeconfig):
+        if not path.is_file():
+            continue
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            raise KubeconfigError(f"Could not read kubeconfig {path}: {e}")
+
+        for section, entry_key in (("clusters", "cluster"), ("users", "user"), ("contexts", "context")):
+            for item in data.get(section) or []:
+                name = item.get("name")
+                if name is None or name in merged[section]:
+                    continue
+                entry = dict(item.get(entry_key) or {})
+                for key in _PATH_KEYS:
+                    if entry.get(key) and not os.path.isabs(entry[key]):
+                        entry[key] = str(path.parent / entry[key])
+                merged[section][name] = entry
+
+        if not merged["current-context"] and data.get("current-context"):
+            merged["current-context"] = data["current-context"]
+
+    if not merged["contexts"]:
+        raise KubeconfigError("No kubeconfig found")
+    return merged
+
+
+def list_contexts(kubeconfig: Optional[str] = None) -> List[str]:
+    """List the context names defined in kubeconfig"""
+    return sorted(load_kubeconfig(kubeconfig)["contexts"])
+
+
+def cluster_identity(context: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Return (context name, API server URL) for a context, as far as kubeconfig tells"""
+    try:
+        kube_config = load_kubeconfig()
+    except KubeconfigError:
+        return context, None
+    context_name = context or kube_config["current-context"]
+    cluster_name = kube_config["contexts"].get(context_name, {}).get("cluster")
+    return context_name, kube_config["clusters"].get(cluster_name, {}).get("server")
+
+
+def trim_crd(crd: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only what schema generation needs from a CRD, dropping managedFields and status"""
+    metadata = crd.get("metadata", {})
+    return {
+        "apiVersion": crd.get("apiVersion"),
+        "kind": crd.get("kind"),
+        "metadata": {
+            key: metadata[key]
+            for key in ("name", "uid", "generation", "resourceVersion")
+            if key in metadata
+        },
+        "spec": crd.get("spec", {}),
+    }
+
+
+def _write_temp(data: bytes) -> str:
+    fd, path = tempfile.mkstemp(prefix="amdf-", suffix=".pem")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+
+def _run_exec_plugin(exec_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a client-go credential plugin (aws, gke-gcloud-auth-plugin, kubelogin...)"""
+    env = os.environ.copy()
+    for item in exec_config.get("env") or []:
+        env[item["name"]] = item["value"]
+    command = [exec_config["command"]] + list(exec_config.get("args") or [])
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=True, env=env)
+        return json.loads(result.stdout).get("status", {})
+    except (OSError, subprocess.CalledProcessError, json.JSONDecodeError) as e:
+        raise KubeconfigError(f"Credential plugin '{exec_config['command']}' failed: {e}")
+
+
+def _expiration(status: Dict[str, Any]) -> Optional[float]:
+    """Epoch seconds of a credential plugin's expirationTimestamp (RFC 3339), if any"""
+    timestamp = status.get("expirationTimestamp")
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _build_auth(
+    cluster: Dict[str, Any], user: Dict[str, Any]
+) -> Tuple[Dict[str, str], Optional[ssl.SSLContext], Optional[float]]:
+    """Request headers, TLS context and, for exec plugins, when the credentials expire"""
+    headers = {}
+    cert_data = key_data = None
+    expires_at = None
+
+    if user.get("exec"):
+        status = _run_exec_plugin(user["exec"])
+        expires_at = _expiration(status)
+        if status.get("token"):
+            headers["Authorization"] = f"Bearer {status['token']}"
+        if status.get("clientCertificateData"):
+            cert_data = status["clientCertificateData"].encode()
+            key_data = status.get("clientKeyData", "").encode()
+    elif user.get("token"):
+        headers["Authorization"] = f"Bearer {user['token']}"
+    elif user.get("tokenFile"):
+        headers["Authorization"] = f"Bearer {Path(user['tokenFile']).read_text().strip()}"
+    elif user.get("auth-provider"):
+        id_token = (user["auth-provider"].get("config") or {}).get("id-token")
+        if not id_token:
+            raise KubeconfigError(
+                f"Unsupported auth-provider '{user['auth-provider'].get('name')}'"
+            )
+        headers["Authorization"] = f"Bearer {id_token}"
+    elif user.get("username") and user.get("password"):
+        credentials = base64.b64encode(f"{user['username']}:{user['password']}".encode()).decode()
+        headers["Authorization"] = f"Basic {credentials}"
+
+    if user.get("client-certificate-data"):
+        cert_data = base64.b64decode(user["client-certificate-data"])
+        key_data = base64.b64decode(user.get("client-key-data", ""))
+
+    if not cluster.get("server", "").startswith("https"):
+        return headers, None, expires_at
+
+    context = ssl.create_default_context()
+    if cluster.get("insecure-skip-tls-verify"):
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif cluster.get("certificate-authority-data"):
+        context.load_verify_locations(
+            cadata=base64.b64decode(cluster["certificate-authority-data"]).decode()
+        )
+    elif cluster.get("certificate-authority"):
+        context.load_verify_locations(cafile=cluster["certificate-authority"])
+
+    # ssl only loads client certificates from files
+    if cert_data:
+        cert_file, key_file = _write_temp(cert_data), _write_temp(key_data)
+        try:
+            context.load_cert_chain(cert_file, key_file)
+        finally:
+            os.unlink(cert_file)
+            os.unlink(key_file)
+    elif user.get("client-certificate"):
+        context.load_cert_chain(user["client-certificate"], user.get("client-key"))
+
+    return headers, context, expires_at
+
+
+def _check_supported(context_name: str, cluster: Dict[str, Any], user: Dict[str, Any]) -> None:
+    """Reject contexts whose requests the client would send differently than kubectl"""
+    unsupported = [key for key in _UNSUPPORTED_CLUSTER_KEYS if cluster.get(key)]
+    unsupported += [key for key in _UNSUPPORTED_USER_KEYS if user.get(key)]
+    if unsupported:
+        raise KubeconfigError(
+            f"Context '{context_name}' uses unsupported settings: {', '.join(unsupported)}"
+        )
+
+    # kubectl honours HTTPS_PROXY/HTTP_PROXY, http.client does not
+    parts = urlsplit(cluster["server"])
+    if getproxies().get(parts.scheme or "https") and not proxy_bypass(parts.netloc):
+        raise KubeconfigError(f"Context '{context_name}' is reached through a proxy")
+
+
+class KubeClient:
+    """
+    Kubernetes API client keeping a small pool of keep-alive connections.
+
+    Responses are requested gzip-compressed. Both https and plain http
+    servers are supported, the latter mainly for local stand-in servers.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        headers: Optional[Dict[str, str]] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        timeout: float = 30.0,
+        pool_size: int = 4,
+    ):
+        parts = urlsplit(server)
+        self.server = server
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+            "User-Agent": "amdf",
+            **(headers or {}),
+        }
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        # Epoch seconds after which exec plugin credentials must be renewed
+        self.expires_at: Optional[float] = None
+
+    @classmethod
+    def from_kubeconfig(cls, context: Optional[str] = None, kubeconfig: Optional[str] = None) -> "KubeClient":
+        """Build a client for a kubeconfig context (the current context by default)"""
+        kube_config = load_kubeconfig(kubeconfig)
+        context_name = context or kube_config["current-context"]
+        if context_name not in kube_config["contexts"]:
+            raise KubeconfigError(f"Context '{context_name}' not found in kubeconfig")
+
+        context_entry = kube_config["contexts"][context_name]
+        cluster = kube_config["clusters"].get(context_entry.get("cluster"))
+        if not cluster or not cluster.get("server"):
+            raise KubeconfigError(f"Cluster for context '{context_name}' has no server")
+        user = kube_config["users"].get(context_entry.get("user"), {})
+        _check_supported(context_name, cluster, user)
+
+        headers, ssl_context, expires_at = _build_auth(cluster, user)
+        client = cls(cluster["server"], headers=headers, ssl_context=ssl_context)
+        client.expires_at = expires_at
+        return client
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout, context=self.ssl_context
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> Tuple[http.client.HTTPConnection, bool]:
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def _release(self, connection: http.client.HTTPConnection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def close(self):
+        """Close every pooled connection"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a request and return status, headers and the decompressed body"""
+        url = self.base_path + path
+        if params:
+            url += "?" + urlencode(params)
+        request_headers = {**self.headers, **(headers or {})}
+
+        while True:
+            connection, reused = self._acquire()
+            try:
+                connection.request(method, url, headers=request_headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError) as e:
+                connection.close()
+                # A pooled keep-alive connection may have been closed by the server
+                if reused:
+                    continue
+                raise KubeAPIError(f"Request to {self.server}{url} failed: {e}")
+            except OSError as e:
+                connection.close()
+                raise KubeAPIError(f"Could not reach Kubernetes API at {self.server}: {e}")
+            break
+
+        if response.getheader("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+
+        return response.status, response.headers, body
+
+    def get_json(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """GET a path and decode the JSON response, raising KubeAPIError on failure"""
+        status, _, body = self.request("GET", path, params=params, headers=headers)
+        if status >= 400:
+            message = body.decode("utf-8", errors="replace")
+            try:
+                message = json.loads(message).get("message", message)
+            except (ValueError, AttributeError):
+                pass
+            raise KubeAPIError(f"{status} {message}", status=status)
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise KubeAPIError(f"Invalid JSON response from {path}")
+
+    def get_if_changed(self, path: str, etag: Optional[str] = None) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        GET a path, revalidating a cached copy by its ETag.
+
+        Returns (body, etag), with body None when the server answers 304 Not Modified.
+        """
+        headers = {"If-None-Match": etag} if etag else None
+        status, response_headers, body = self.request("GET", path, headers=headers)
+        if status == 304:
+            return None, etag
+        if status >= 400:
+            message = body.decode("utf-8", errors="replace")
+            raise KubeAPIError(f"{status} {message}", status=status)
+        return body, response_headers.get("ETag")
+
+    def iter_pages(
+        self,
+        path: str,
+        limit: int = 500,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the items of a list endpoint one page at a time, following continue tokens"""
+        params = {"limit": limit}
+        while True:
+            page = self.get_json(path, params=params, headers=headers)
+            yield page.get("items") or []
+            token = (page.get("metadata") or {}).get("continue")
+            if not token:
+                return
+            params = {"limit": limit, "continue": token}
+
+    def iter_crds(self, limit: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Yield CRDs page by page, trimmed to their specs"""
+        for items in self.iter_pages(CRD_API_PATH, limit):
+            yield [trim_crd(item) for item in items]
+
+    def iter_crd_metadata(self, limit: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """Yield CRD metadata page by page, without downloading the specs"""
+        headers = {"Accept": PARTIAL_METADATA_LIST}
+        for items in self.iter_pages(CRD_API_PATH, limit, headers=headers):
+            yield [item.get("metadata", {}) for item in items]
+
+    def get_crd_metadata(self, name: str) -> Dict[str, Any]:
+        """Get the metadata of one CRD, without its spec"""
+        headers = {"Accept": PARTIAL_METADATA}
+        return self.get_json(f"{CRD_API_PATH}/{name}", headers=headers).get("metadata", {})
+
+    def list_resource_version(self, path: str) -> Optional[str]:
+        """Current resourceVersion of a collection, from a one-item metadata-only list"""
+        page = self.get_json(path, params={"limit": 1}, headers={"Accept": PARTIAL_METADATA_LIST})
+        return (page.get("metadata") or {}).get("resourceVersion")
+
+    def watch(
+        self,
+        path: str,
+        resource_version: Optional[str] = None,
+        timeout_seconds: int = 300,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield watch events ({"type": ..., "object": ...}) from one long-lived request.
+
+        The server closes the stream after timeout_seconds; callers resume
+        from the last resourceVersion they saw.
+        """
+        params = {"watch": "true", "allowWatchBookmarks": "true", "timeoutSeconds": timeout_seconds}
+        if resource_version:
+            params["resourceVersion"] = resource_version
+        url = f"{self.base_path}{path}?{urlencode(params)}"
+        # Events are small and arrive one by one, so skip compression
+        headers = {**self.headers, "Accept-Encoding": "identity"}
+
+        connection = self._new_connection()
+        connection.timeout = timeout_seconds + 30
+        try:
+            try:
+                connection.request("GET", url, headers=headers)
+                response = connection.getresponse()
+            except (http.client.HTTPException, OSError) as e:
+                raise KubeAPIError(f"Could not watch {path}: {e}")
+            if response.status >= 400:
+                raise KubeAPIError(
+                    f"{response.status} {response.read().decode('utf-8', errors='replace')}",
+                    status=response.status,
+                )
+            for line in response:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        except (http.client.HTTPException, OSError) as e:
+            raise KubeAPIError(f"Watch on {path} interrupted: {e}")
+        finally:
+            connection.close()
+
+    def get_crd(self, name: str) -> Dict[str, Any]:
+        """Get one CRD, trimmed to its spec"""
+        return trim_crd(self.get_json(f"{CRD_API_PATH}/{name}"))
+
+    def list_crds(self) -> List[Dict[str, Any]]:
+        """List every CRD, trimmed to their specs"""
+        return [trim_crd(item) for item in self.get_json(CRD_API_PATH).get("items", [])]
+
+
+_clients: Dict[Tuple[Optional[str], Optional[str]], Optional[KubeClient]] = {}
+_clients_lock = threading.Lock()
+# One lock per context, held while its client is built, so exec plugins of
+# different contexts run in parallel but each runs once
+_build_locks: Dict[Tuple[Optional[str], Optional[str]], threading.Lock] = {}
+
+# Renew exec plugin credentials this long before they expire
+_EXPIRY_MARGIN_SECONDS = 60
+
+
+def _cached_client(key: Tuple[Optional[str], Optional[str]]) -> Tuple[bool, Optional[KubeClient]]:
+    """Whether a usable client is cached for key, and that client"""
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None and client.expires_at and time.time() >= client.expires_at - _EXPIRY_MARGIN_SECONDS:
+            # Expired exec plugin token (e.g. EKS): run the plugin again
+            evicted = _clients.pop(key)
+            evicted.close()
+        return key in _clients, _clients.get(key)
+
+
+def get_kube_client(context: Optional[str] = None) -> Optional[KubeClient]:
+    """
+    Return a shared client for a context, or None when kubectl should be used instead.
+
+    kubectl remains the fallback when the client is disabled (AMDF_USE_KUBE_CLIENT=false)
+    or the kubeconfig cannot be handled in-process.
+    """
+    if not config.use_kube_client:
+        return None
+
+    key = (os.environ.get("KUBECONFIG"), context)
+    cached, client = _cached_client(key)
+    if cached:
+        return client
+
+    with _clients_lock:
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+    with build_lock:
+        cached, client = _cached_client(key)
+        if cached:
+            return client
+        try:
+            client = KubeClient.from_kubeconfig(context)
+        except (KubeconfigError, OSError, ssl.SSLError):
+            client = None
+        with _clients_lock:
+            _clients[key] = client
+        return client
+
+
+def evict_kube_client(context: Optional[str] = None) -> None:
+    """
+    Drop the shared client of a context, so the next get_kube_client builds a
+    new one with fresh credentials (e.g. after a 401 Unauthorized)
+    """
+    key = (os.environ.get("KUBECONFIG"), context)
+    with _clients_lock:
+        client = _clients.pop(key, None)
+    if client is not None:
+        client.close()
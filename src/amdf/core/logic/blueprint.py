@@ -47,6 +47,18 @@ def generate_blueprint_from_schema(detailed_kcl_schema: str, input_filepath: Pat
     
     schema_alias = main_schema_name.lower() + "_schema"
     
+    # Types the schema file imports from shared type modules (alias.Type) are
+    # referenced through the same import, not through the schema module
+    type_modules = {alias: path for path, alias in re.findall(r"^import (\S+) as (\w+)$", detailed_kcl_schema, re.MULTILINE)}
+    used_type_modules = set()
+    
+    def qualify(type_name: str) -> str:
+        module_alias = type_name.split(".")[0]
+        if "." in type_name and module_alias in type_modules:
+            used_type_modules.add(module_alias)
+            return type_name
+        return f"{schema_alias}.{type_name}"
+    
     # Find spec schema
     spec_match = re.search(r"^\s*spec\s*:\s*(\w+)", main_schema_text, re.MULTILINE | re.IGNORECASE)
     
@@ -127,7 +139,7 @@ def generate_blueprint_from_schema(detailed_kcl_schema: str, input_filepath: Pat
                 if inner_type in ["str", "int", "bool", "any", "float"]:
                     display_type = type_clean
                 else:
-                    display_type = f"[{schema_alias}.{inner_type}]"
+                    display_type = f"[{qualify(inner_type)}]"
             elif type_clean.startswith("{") and type_clean.endswith("}"):
                 # Handle typed dictionaries: {str:Type}
                 dict_match = re.match(r'\{([^:]+):([^}]+)\}', type_clean)
@@ -137,11 +149,11 @@ def generate_blueprint_from_schema(detailed_kcl_schema: str, input_filepath: Pat
                     if val_type in ["str", "int", "bool", "any", "float"]:
                         display_type = type_clean
                     else:
-                        display_type = f"{{{key_type}:{schema_alias}.{val_type}}}"
+                        display_type = f"{{{key_type}:{qualify(val_type)}}}"
                 else:
                     display_type = type_clean
             else:
-                display_type = f"{schema_alias}.{type_clean}"
+                display_type = qualify(type_clean)
                 
             blueprint_params[f"{param_name}{'' if is_required else '?'} "] = display_type
         else:
@@ -162,8 +174,12 @@ def generate_blueprint_from_schema(detailed_kcl_schema: str, input_filepath: Pat
                 for_provider_param_mappings[name] = param_name
                 is_required = not bool(optional_marker)
                 type_clean = type_str.strip().split(" ")[0].rstrip(",")
-                
-                if (type_clean.split('.')[-1] in schemas or 
+                inner_type = type_clean.strip("[]")
+
+                if "." in inner_type and inner_type.split(".")[0] in type_modules:
+                    # Type from an imported module (e.g. common.Policy)
+                    display_type = f"[{qualify(inner_type)}]" if type_clean.startswith("[") else qualify(type_clean)
+                elif (type_clean.split('.')[-1] in schemas or
                     (type_clean.startswith('[') and type_clean.strip('[]').split('.')[-1] in schemas)):
                     if type_clean.startswith('[') and type_clean.endswith(']'):
                         inner_type = type_clean[1:-1]
@@ -207,9 +223,11 @@ def generate_blueprint_from_schema(detailed_kcl_schema: str, input_filepath: Pat
         spec_mappings_str = "\n".join([f"    {field} = {param}" for field, param in spec_param_mappings.items()])
         spec_block = "\n" + spec_mappings_str if spec_mappings_str else ""
     
+    type_imports = "".join(f"\nimport {type_modules[alias]} as {alias}" for alias in sorted(used_type_modules))
+    
     blueprint_code = f'''# --- High-Level Blueprint (Auto-Generated) ---
 
-import {import_path} as {schema_alias}
+import {import_path} as {schema_alias}{type_imports}
 
 schema {blueprint_name}({schema_alias}.{main_schema_name}):
     """This Blueprint simplifies the creation of a {main_schema_name} resource,
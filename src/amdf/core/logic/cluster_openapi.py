@@ -0,0 +1,159 @@
+"""
+Cluster OpenAPI v3 source
+Reads a cluster's /openapi/v3 discovery document and fetches only the
+group-version documents that are needed, e.g. apis/apps/v1. Documents are
+cached per API server and revalidated with their ETags; their schemas are
+stored as swagger-style definitions so they are indexed and read exactly
+like the upstream spec
+"""
+
+import json
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from ..cache import cache_dir, cache_key, load_json, store_json, write_atomic
+from ..config import config
+from ..exceptions import KubectlError
+from ..kube_client import cluster_identity, get_kube_client
+from .openapi_cache import DefinitionTable, open_definition_table
+
+OPENAPI_V3_PATH = "/openapi/v3"
+
+_COMPONENTS_PREFIX = "#/components/schemas/"
+
+# Discovery documents already read by this process, by context
+_discoveries: Dict[Optional[str], Dict[str, str]] = {}
+
+
+def group_version_path(api_version: str) -> str:
+    """Discovery path of a group/version: v1 -> api/v1, apps/v1 -> apis/apps/v1"""
+    if "/" in api_version:
+        return f"apis/{api_version}"
+    return f"api/{api_version}"
+
+
+def _cluster_cache_dir(context: Optional[str]) -> Path:
+    name, server = cluster_identity(context)
+    return cache_dir("openapi", "cluster", cache_key(server or name))
+
+
+def _get(context: Optional[str], path: str, etag: Optional[str]) -> Tuple[Optional[bytes], Optional[str]]:
+    """GET a server-relative path; body is None when the cached copy is still current"""
+    client = get_kube_client(context)
+    if client is None:
+        # kubectl cannot revalidate, the document is always downloaded
+        command = ["kubectl"]
+        if context:
+            command.extend(["--context", context])
+        command.extend(["get", "--raw", path])
+        try:
+            result = subprocess.run(command, capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise KubectlError(f"kubectl get --raw {path} failed: {e.stderr.decode('utf-8', errors='replace')}")
+        except FileNotFoundError:
+            raise KubectlError("kubectl not found. Please install kubectl.")
+        return result.stdout, None
+    return client.get_if_changed(path, etag)
+
+
+def _to_definitions(node: Any) -> Any:
+    """
+    Rewrite an OpenAPI v3 schema into the swagger form the generators read.
+
+    #/components/schemas/ references become #/definitions/ references, and
+    the allOf wrapper v3 puts around a single reference (to attach a
+    description or default to it) is unwrapped.
+    """
+    if isinstance(node, list):
+        return [_to_definitions(value) for value in node]
+    if not isinstance(node, dict):
+        return node
+
+    all_of = node.get("allOf")
+    if isinstance(all_of, list) and len(all_of) == 1 and isinstance(all_of[0], dict) and "$ref" in all_of[0]:
+        node = {**{k: v for k, v in node.items() if k != "allOf"}, "$ref": all_of[0]["$ref"]}
+
+    converted = {}
+    for key, value in node.items():
+        if key == "$ref" and isinstance(value, str) and value.startswith(_COMPONENTS_PREFIX):
+            converted[key] = "#/definitions/" + value[len(_COMPONENTS_PREFIX):]
+        else:
+            converted[key] = _to_definitions(value)
+    return converted
+
+
+def _fetch(context: Optional[str], path: str, name: str, convert=None) -> Path:
+    """
+    Make sure the document at path is cached as <name>.json and return its path.
+
+    Paths carrying a content hash (?hash=...) are immutable, so a cached copy
+    of the same path is used without any request. Otherwise the cached copy
+    is revalidated with its ETag, and used as is if the cluster is unreachable.
+    """
+    directory = _cluster_cache_dir(context)
+    document_path, meta_path = directory / f"{name}.json", directory / f"{name}.meta.json"
+    meta = load_json(meta_path) if document_path.exists() else None
+    meta = meta or {}
+
+    if meta.get("path") == path and "hash=" in path:
+        return document_path
+
+    try:
+        body, etag = _get(context, path, meta.get("etag"))
+    except KubectlError as e:
+        if meta:
+            if config.verbose:
+                print(f"💾 Cluster unreachable, using cached OpenAPI document {path}: {e}")
+            return document_path
+        raise
+
+    if body is not None:
+        if convert:
+            body = json.dumps(convert(json.loads(body))).encode("utf-8")
+        write_atomic(document_path, body)
+        # The definition index belongs to the previous document
+        try:
+            os.unlink(directory / f"{name}.index.pickle")
+        except OSError:
+            pass
+    store_json(meta_path, {"path": path, "etag": etag, "checked_at": time.time()})
+    return document_path
+
+
+def load_openapi_v3_paths(context: Optional[str] = None) -> Dict[str, str]:
+    """
+    Group-version documents the cluster serves, read once per process:
+    {"apis/apps/v1": "/openapi/v3/apis/apps/v1?hash=..."}
+    """
+    paths = _discoveries.get(context)
+    if paths is None:
+        with open(_fetch(context, OPENAPI_V3_PATH, "discovery"), "r", encoding="utf-8") as f:
+            discovery = json.load(f)
+        paths = _discoveries[context] = {
+            path: entry.get("serverRelativeURL") or f"{OPENAPI_V3_PATH}/{path}"
+            for path, entry in (discovery.get("paths") or {}).items()
+        }
+    return paths
+
+
+def load_cluster_definition_table(api_version: str, context: Optional[str] = None) -> DefinitionTable:
+    """
+    Definitions of the cluster's OpenAPI v3 document for one group/version.
+
+    Only that group-version document is downloaded; it already carries every
+    schema its kinds reference, such as ObjectMeta and PodSpec.
+    """
+    path = group_version_path(api_version)
+    paths = load_openapi_v3_paths(context)
+    if path not in paths:
+        raise ValueError(f"API group/version '{api_version}' is not served by the cluster")
+
+    name = cache_key(path)
+    document_path = _fetch(
+        context, paths[path], name,
+        convert=lambda document: {"definitions": _to_definitions((document.get("components") or {}).get("schemas") or {})},
+    )
+    return open_definition_table(document_path, document_path.with_name(f"{name}.index.pickle"))
@@ -0,0 +1,50 @@
+"""
+Content-addressed cache of fetched CRD documents
+Entries are keyed by CRD uid and generation, so a cheap metadata-only request
+is enough to know whether the cached schema is still current
+"""
+
+from typing import Any, Dict, Optional
+
+from ..cache import cache_dir, cache_key, load_pickle, store_pickle
+from ..config import config
+
+# Hits and misses of the current process, reported in verbose mode
+stats = {"hits": 0, "misses": 0}
+
+
+def crd_cache_key(metadata: Dict[str, Any]) -> Optional[str]:
+    """Cache key for a CRD version: uid plus generation (resourceVersion if absent)"""
+    uid = metadata.get("uid")
+    revision = metadata.get("generation") or metadata.get("resourceVersion")
+    if not uid or not revision:
+        return None
+    return cache_key(uid, str(revision))
+
+
+def _entry_path(key: str):
+    return cache_dir("crds") / f"{key}.pickle"
+
+
+def load_cached_crd(metadata: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the cached CRD document matching this metadata, or None"""
+    key = crd_cache_key(metadata)
+    crd = load_pickle(_entry_path(key)) if key else None
+    name = metadata.get("name")
+    if crd is None:
+        stats["misses"] += 1
+        if config.verbose:
+            print(f"💾 CRD cache miss: {name}")
+        return None
+
+    stats["hits"] += 1
+    if config.verbose:
+        print(f"💾 CRD cache hit: {name}")
+    return crd
+
+
+def store_cached_crd(crd: Dict[str, Any]) -> None:
+    """Cache a trimmed CRD document (spec with its parsed openAPIV3Schema)"""
+    key = crd_cache_key(crd.get("metadata", {}))
+    if key:
+        store_pickle(_entry_path(key), crd)
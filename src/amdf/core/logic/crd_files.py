@@ -0,0 +1,253 @@
+"""
+Local CRD file source
+Streams CustomResourceDefinitions and Crossplane XRDs from YAML/JSON files,
+directories, Crossplane xpkg / Helm chart archives and OCI image layouts,
+so schemas can be generated without a cluster
+"""
+
+import bz2
+import fnmatch
+import gzip
+import json
+import lzma
+import tarfile
+import zlib
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import yaml
+
+from ..kube_client import trim_crd
+
+# The libyaml loader is several times faster when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+CRD_FILE_SUFFIXES = (".yaml", ".yml", ".json")
+ARCHIVE_SUFFIXES = (".xpkg", ".tgz", ".tar", ".tar.gz")
+
+# Magic bytes, decompressing reader and file suffix of the compression formats tarfile can stream
+_COMPRESSIONS = (
+    (b"\x1f\x8b", lambda stream: gzip.GzipFile(fileobj=stream), ".gz"),
+    (b"BZh", bz2.BZ2File, ".bz2"),
+    (b"\xfd7zXZ", lzma.LZMAFile, ".xz"),
+)
+
+# Errors of a source that is not what its name or magic bytes promised
+_UNREADABLE_ERRORS = (
+    yaml.YAMLError, ValueError, tarfile.TarError, EOFError, gzip.BadGzipFile, zlib.error, lzma.LZMAError
+)
+
+
+def xrd_to_crds(xrd: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Convert a Crossplane CompositeResourceDefinition into the CRDs Crossplane derives from it.
+
+    Returns the composite resource CRD and, when claimNames is set, the claim CRD.
+    """
+    spec = xrd.get("spec", {})
+    group = spec["group"]
+    versions = [
+        {
+            "name": version["name"],
+            "served": version.get("served", True),
+            "storage": version.get("referenceable", False),
+            "schema": version.get("schema", {}),
+        }
+        for version in spec.get("versions", [])
+    ]
+
+    def _crd(names: Dict[str, Any], scope: str) -> Dict[str, Any]:
+        return {
+            "apiVersion": "apiextensions.k8s.io/v1",
+            "kind": "CustomResourceDefinition",
+            "metadata": {"name": f"{names['plural']}.{group}"},
+            "spec": {"group": group, "names": names, "scope": scope, "versions": versions},
+        }
+
+    # Crossplane v2 XRDs carry their own scope, v1 composites are cluster scoped
+    crds = [_crd(spec["names"], spec.get("scope", "Cluster"))]
+    if spec.get("claimNames"):
+        crds.append(_crd(spec["claimNames"], "Namespaced"))
+    return crds
+
+
+def _as_crds(document: Any) -> Iterator[Dict[str, Any]]:
+    """Yield the CRDs contained in one parsed document (List objects are unpacked)"""
+    if not isinstance(document, dict):
+        return
+    kind = document.get("kind")
+    if kind == "CustomResourceDefinition" and document.get("spec"):
+        yield trim_crd(document)
+    elif kind == "CompositeResourceDefinition" and document.get("spec"):
+        yield from xrd_to_crds(document)
+    elif kind and kind.endswith("List"):
+        for item in document.get("items") or []:
+            yield from _as_crds(item)
+
+
+def iter_documents_from_stream(stream, name: str = "") -> Iterator[Any]:
+    """Parse YAML or JSON documents one at a time from an open text or binary stream"""
+    if name.endswith(".json"):
+        yield json.load(stream)
+        return
+    yield from yaml.load_all(stream, Loader=_YamlLoader)
+
+
+def iter_crds_from_stream(stream, name: str = "") -> Iterator[Dict[str, Any]]:
+    """Yield the CRDs found in a YAML or JSON stream"""
+    for document in iter_documents_from_stream(stream, name):
+        yield from _as_crds(document)
+
+
+def _skip_unreadable(name: str, crds: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield from crds; a source that cannot be parsed (e.g. a Helm template
+    with {{ }} next to the CRDs) is skipped with a warning instead of ending the walk
+    """
+    try:
+        yield from crds
+    except _UNREADABLE_ERRORS as e:
+        print(f"⚠️ Skipping {name}, not a readable CRD file: {e}")
+
+
+class _PrefixedStream:
+    """Read-only stream that replays bytes already consumed while sniffing the format"""
+
+    def __init__(self, prefix: bytes, stream):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if not self._prefix:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), b""
+            return data
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        if len(data) < size:
+            data += self._stream.read(size - len(data))
+        return data
+
+
+def _is_crd_member(name: str) -> bool:
+    """package.yaml of a Crossplane package, or a file under a Helm chart crds/ directory"""
+    path = PurePosixPath(name)
+    if path.name == "package.yaml":
+        return True
+    return "crds" in path.parts[:-1] and path.suffix.lower() in CRD_FILE_SUFFIXES
+
+
+def _iter_crds_from_tar(stream) -> Iterator[Dict[str, Any]]:
+    """
+    Stream through a (possibly compressed) tarball, decompressing on the fly.
+
+    CRD documents are parsed straight from the archive members, and nested
+    tarballs such as OCI image layers are descended into without extracting
+    anything to disk.
+    """
+    with tarfile.open(fileobj=stream, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            member_stream = archive.extractfile(member)
+            if _is_crd_member(member.name):
+                yield from _skip_unreadable(member.name, iter_crds_from_stream(member_stream, member.name.lower()))
+                continue
+            yield from _skip_unreadable(member.name, _iter_crds_from_blob(member.name, member_stream))
+
+
+def _iter_crds_from_blob(name: str, stream) -> Iterator[Dict[str, Any]]:
+    """
+    Sniff an archive member or OCI blob by its content: tarballs (compressed
+    or not, e.g. OCI image layers) are descended into and compressed CRD
+    files such as crds/widgets.yaml.gz are parsed. Anything else, including
+    compressed files that are neither, is skipped.
+    """
+    header = stream.read(512)
+    compressed = False
+    for magic, decompress, suffix in _COMPRESSIONS:
+        if header.startswith(magic):
+            stream = decompress(_PrefixedStream(header, stream))
+            header = stream.read(512)
+            compressed = True
+            if name.lower().endswith(suffix):
+                name = name[: -len(suffix)]
+            break
+
+    if header[257:262] == b"ustar":
+        yield from _iter_crds_from_tar(_PrefixedStream(header, stream))
+    elif compressed and _is_crd_member(name):
+        yield from iter_crds_from_stream(_PrefixedStream(header, stream), name.lower())
+
+
+def iter_crds_from_archive(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield CRDs from an xpkg, Helm chart or other tarball on disk"""
+    with open(path, "rb") as stream:
+        yield from _iter_crds_from_tar(stream)
+
+
+def iter_crds_from_oci_layout(path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield CRDs from the layer blobs of an OCI image layout directory"""
+    for blob in sorted((path / "blobs").rglob("*")):
+        if not blob.is_file():
+            continue
+        with open(blob, "rb") as stream:
+            yield from _skip_unreadable(str(blob), _iter_crds_from_blob(blob.name, stream))
+
+
+def _is_archive(path: Path) -> bool:
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _iter_directory(path: Path) -> Iterator[Path]:
+    """Walk a directory in sorted order; OCI image layouts inside it are yielded as one source"""
+    if (path / "oci-layout").is_file():
+        yield path
+        return
+    for child in sorted(path.iterdir()):
+        if child.is_dir():
+            yield from _iter_directory(child)
+        elif child.suffix.lower() in CRD_FILE_SUFFIXES or _is_archive(child):
+            yield child
+
+
+def _iter_sources(paths: Iterable[str]) -> Iterator[Path]:
+    for raw_path in paths:
+        path = Path(raw_path).expanduser()
+        if path.is_dir():
+            yield from _iter_directory(path)
+        elif path.is_file():
+            yield path
+        else:
+            raise FileNotFoundError(f"CRD file or directory not found: {raw_path}")
+
+
+def _iter_crds_from_source(path: Path) -> Iterator[Dict[str, Any]]:
+    if path.is_dir():
+        yield from iter_crds_from_oci_layout(path)
+    elif _is_archive(path):
+        yield from iter_crds_from_archive(path)
+    else:
+        with open(path, "rb") as stream:
+            yield from iter_crds_from_stream(stream, path.name.lower())
+
+
+def iter_crds_from_files(
+    paths: Iterable[str], patterns: Optional[List[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream CRDs from files, directories (searched recursively) and archives.
+
+    Crossplane .xpkg packages, Helm chart .tgz files, other tarballs and OCI
+    image layout directories are read in streaming mode. Documents are parsed
+    one at a time and only the CRDs (and Crossplane XRDs) are yielded,
+    optionally filtered by name glob patterns, so memory stays bounded by the
+    largest single document. Files (or archive members) that cannot be
+    parsed are skipped with a warning.
+    """
+    for path in _iter_sources(paths):
+        for crd in _skip_unreadable(str(path), _iter_crds_from_source(path)):
+            name = crd["metadata"].get("name", "")
+            if patterns and not any(fnmatch.fnmatchcase(name, p) for p in patterns):
+                continue
+            yield crd
@@ -1,13 +1,31 @@
+import fnmatch
+import hashlib
 import json
 import os
+import re
 import subprocess
 import textwrap
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+from ..cache import cache_dir, cache_key, load_json, store_json
+from ..config import config
+from ..exceptions import KubeAPIError
+from ..kube_client import cluster_identity, get_kube_client, trim_crd
+from ..models import CRDInfo
+from .crd_cache import load_cached_crd, store_cached_crd
+
 # Format constants
 INDENT = "    "
 MODELS_DIR_NAME = "models"  # Directory name for generated schemas
 
+# Cross-CRD common types: schemas shared by at least COMMON_MIN_CRDS CRDs of a
+# group live in library/models/<group>/common.k, imported as `common`
+COMMON_MODULE = "common"
+COMMON_MIN_CRDS = 2
+
 def init_kcl_module_if_needed(base_dir: str):
     """
     Initialize KCL module in library directory if it doesn't exist.
@@ -38,25 +56,167 @@ def init_kcl_module_if_needed(base_dir: str):
     except FileNotFoundError:
         print("⚠️ 'kcl' command not found. Make sure KCL is installed.")
 
+@lru_cache(maxsize=4096)
 def to_pascal_case(name):
     """Convert a string to PascalCase."""
     return name.replace("_", " ").title().replace(" ", "")
 
+def truncation_warning(kind, max_depth, locations, shown=5):
+    """Warning listing where a kind's schemas were cut at max_depth."""
+    locations = list(dict.fromkeys(locations))
+    listed = ", ".join(locations[:shown])
+    if len(locations) > shown:
+        listed += f" and {len(locations) - shown} more"
+    return f"⚠️ {kind}: nesting deeper than {max_depth} levels collapsed to any at {listed}"
+
+def _node_digest(node, digests, skip=()):
+    """Digest of a dict or list from the cached digests of its children."""
+    def child(value):
+        if isinstance(value, (dict, list)):
+            return digests[id(value)][1]
+        return json.dumps(value)
+    if isinstance(node, dict):
+        canonical = "{" + ",".join(
+            f"{json.dumps(key)}:{child(node[key])}" for key in sorted(node) if key not in skip
+        ) + "}"
+    else:
+        canonical = "[" + ",".join(child(value) for value in node) + "]"
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def json_digest(value, digests):
+    """
+    Digest of a JSON document, computed bottom-up with an explicit stack:
+    each dict and list is hashed from its children's digests, so every node
+    is hashed once however deep it is. digests caches them by id, as
+    {id: (node, digest)} so the ids stay valid.
+    """
+    if not isinstance(value, (dict, list)):
+        return hashlib.sha256(json.dumps(value).encode("utf-8")).hexdigest()
+    stack = [value]
+    expanded = set()
+    while stack:
+        node = stack[-1]
+        if id(node) in digests:
+            stack.pop()
+            continue
+        children = node.values() if isinstance(node, dict) else node
+        missing = [c for c in children if isinstance(c, (dict, list)) and id(c) not in digests]
+        if missing:
+            if id(node) in expanded:
+                raise ValueError("Recursive document: a schema contains itself")
+            expanded.add(id(node))
+            stack.extend(missing)
+            continue
+        stack.pop()
+        digests[id(node)] = (node, _node_digest(node, digests))
+    return digests[id(value)][1]
+
+
 class KCLSchemaGenerator:
     """
     Generate a KCL schema from a CRD definition in JSON OpenAPI format.
     Adapted for library use.
     """
 
-    def __init__(self, crd_name, context=None):
+    def __init__(self, crd_name=None, context=None, crd_json=None, dedupe=False, common_types=None, max_depth=None):
+        if crd_json is not None and crd_name is None:
+            crd_name = crd_json.get("metadata", {}).get("name")
         self.crd_name = crd_name
         self.context = context
-        self.crd_json = None
+        self.crd_json = crd_json
         self.schemas_to_generate = {}
         self.generated_schemas = set()
+        # Structural deduplication: identical nested schemas are emitted once,
+        # under the name of their first occurrence
+        self.dedupe = dedupe
+        self._shape_names = {}
+        self._schema_names = {}
+        # Shapes that live in the group's common module ({shape key: name}),
+        # referenced with the module prefix; schemas kept local by identity
+        self.common_types = common_types or {}
+        self._common_prefix = f"{COMMON_MODULE}."
+        self._common_ids = set()
+        self._local_ids = set()
+        # Nesting levels rendered as schemas; deeper subtrees collapse to {str:any}
+        self.max_depth = config.max_schema_depth if max_depth is None else max_depth
+        self._truncated_names = set()
+        self.truncated = []
+        # KCL types of each schema's properties, resolved once and shared by the
+        # docstring and attribute emitters: {(schema name, id): (schema, types)}
+        self._kcl_types = {}
+        # Digests of schema nodes and shape keys of nested schemas, by id
+        self._digests = {}
+        self._shape_keys = {}
+
+    def _shape_key(self, schema_def):
+        """
+        Hash of a nested schema's structure. Its own description is left out,
+        since the parent's attribute documentation already carries it. Built
+        from the cached digests of its children, so keying every schema of a
+        deep CRD stays linear.
+        """
+        entry = self._shape_keys.get(id(schema_def))
+        if entry is None:
+            json_digest(schema_def, self._digests)
+            key = _node_digest(schema_def, self._digests, skip=("description",))[:16]
+            entry = self._shape_keys[id(schema_def)] = (schema_def, key)
+        return entry[1]
+
+    def _nested_schema_name(self, path_name, schema_def):
+        """
+        Name of a nested schema: its path, the common module type of its shape,
+        or the first path of an identical shape when deduplicating
+        """
+        if not self.dedupe and not self.common_types:
+            return path_name
+        key = self._shape_key(schema_def)
+        if key in self.common_types and id(schema_def) not in self._local_ids:
+            name = self._common_prefix + self.common_types[key]
+            self._common_ids.add(id(schema_def))
+        elif self.dedupe:
+            name = self._shape_names.setdefault(key, path_name)
+        else:
+            name = path_name
+        self._schema_names[id(schema_def)] = name
+        return name
+
+    def _nested_schemas(self, schema_name, schema_def):
+        """Yield (path name, property-based name, definition) for each nested object schema of a schema"""
+        properties = schema_def.get("properties", {})
+        for prop_name, prop_def in properties.items():
+            prop_type = prop_def.get("type")
+
+            if prop_type == "object" and "properties" in prop_def:
+                yield to_pascal_case(f"{schema_name}_{prop_name}"), prop_name, prop_def
+            elif prop_type == "object" and "additionalProperties" in prop_def:
+                # Handle dictionaries with typed values
+                additional_props = prop_def["additionalProperties"]
+                if additional_props.get("type") == "object" and "properties" in additional_props:
+                    yield to_pascal_case(f"{schema_name}_{prop_name}Value"), f"{prop_name}Value", additional_props
+            elif prop_type == "array" and prop_def.get("items", {}).get("type") == "object":
+                items_def = prop_def.get("items", {})
+                if "properties" in items_def:
+                    yield to_pascal_case(f"{schema_name}_{prop_name}Item"), f"{prop_name}Item", items_def
+
+    def _mark_local_schemas(self, root_schema):
+        """
+        The kind's spec and spec.forProvider always stay in the model file,
+        blueprints are built from them
+        """
+        spec = root_schema.get("properties", {}).get("spec") or {}
+        for_provider = spec.get("properties", {}).get("forProvider") or {}
+        self._local_ids.update(id(schema) for schema in (spec, for_provider) if schema)
 
     def _get_crd_json(self):
         """Get CRD definition from Kubernetes."""
+        client = get_kube_client(self.context)
+        if client is not None:
+            try:
+                self.crd_json = _get_crd_cached(client, self.crd_name)
+                return
+            except KubeAPIError as e:
+                raise RuntimeError(f"Could not get CRD '{self.crd_name}'. {e}")
+
         try:
             command = ["kubectl"]
             if self.context:
@@ -69,38 +229,73 @@ class KCLSchemaGenerator:
                 text=True,
                 check=True,
             )
-            self.crd_json = json.loads(result.stdout)
+            self.crd_json = trim_crd(json.loads(result.stdout))
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Could not get CRD '{self.crd_name}'. Stderr: {e.stderr}")
         except json.JSONDecodeError:
             raise ValueError("kubectl output is not valid JSON.")
 
+    def _truncate(self, path_name, location):
+        """Collapse the schema at path_name to {str:any} and record where"""
+        self._truncated_names.add(path_name)
+        self.truncated.append(location)
+
     def _find_all_schemas(self, schema_name, schema_def):
+        """
+        Collect the schemas to generate, depth first, with an explicit stack
+        of per-schema iterators so the order matches a recursive walk.
+        Schemas nested deeper than max_depth are not generated.
+        """
         if not schema_def or schema_name in self.schemas_to_generate:
             return
 
         self.schemas_to_generate[schema_name] = schema_def
+        stack = [(schema_name, 1, self._nested_schemas(schema_name, schema_def))]
+        while stack:
+            parent_name, depth, nested = stack[-1]
+            entry = next(nested, None)
+            if entry is None:
+                stack.pop()
+                continue
 
-        properties = schema_def.get("properties", {})
-        for prop_name, prop_def in properties.items():
-            prop_type = prop_def.get("type")
-
-            if prop_type == "object" and "properties" in prop_def:
-                nested_schema_name = to_pascal_case(f"{schema_name}_{prop_name}")
-                self._find_all_schemas(nested_schema_name, prop_def)
-            elif prop_type == "object" and "additionalProperties" in prop_def:
-                # Handle dictionaries with typed values
-                additional_props = prop_def["additionalProperties"]
-                if additional_props.get("type") == "object" and "properties" in additional_props:
-                    nested_schema_name = to_pascal_case(f"{schema_name}_{prop_name}Value")
-                    self._find_all_schemas(nested_schema_name, additional_props)
-            elif prop_type == "array" and prop_def.get("items", {}).get("type") == "object":
-                items_def = prop_def.get("items", {})
-                if "properties" in items_def:
-                    nested_schema_name = to_pascal_case(f"{schema_name}_{prop_name}Item")
-                    self._find_all_schemas(nested_schema_name, items_def)
+            path_name, prop_name, nested_def = entry
+            if self.max_depth and depth >= self.max_depth:
+                self._truncate(path_name, f"{parent_name}.{prop_name}")
+                continue
+            nested_schema_name = self._nested_schema_name(path_name, nested_def)
+            # Common types are rendered in the group's common module
+            if id(nested_def) in self._common_ids or nested_schema_name in self.schemas_to_generate:
+                continue
+            self.schemas_to_generate[nested_schema_name] = nested_def
+            stack.append((nested_schema_name, depth + 1, self._nested_schemas(nested_schema_name, nested_def)))
 
     def _get_kcl_type(self, prop_name, prop_def, parent_schema_name):
+        """
+        KCL type of a property. Array and map wrappers are unwrapped in a loop;
+        past max_depth wrappers the element type collapses to any.
+        """
+        wrappers = []
+        while True:
+            prop_type = prop_def.get("type")
+            if prop_type == "array":
+                wrappers.append(("[", "]"))
+                prop_name, prop_def = f"{prop_name}Item", prop_def.get("items", {})
+            elif prop_type == "object" and "properties" not in prop_def and "additionalProperties" in prop_def:
+                wrappers.append(("{str:", "}"))
+                prop_name, prop_def = f"{prop_name}Value", prop_def["additionalProperties"]
+            else:
+                break
+            if self.max_depth and len(wrappers) >= self.max_depth:
+                self.truncated.append(f"{parent_schema_name}.{prop_name}")
+                prop_def = {}
+                break
+
+        kcl_type = self._element_kcl_type(prop_name, prop_def, parent_schema_name)
+        for opening, closing in reversed(wrappers):
+            kcl_type = f"{opening}{kcl_type}{closing}"
+        return kcl_type
+
+    def _element_kcl_type(self, prop_name, prop_def, parent_schema_name):
         prop_type = prop_def.get("type")
         if prop_type == "string":
             if "enum" in prop_def:
@@ -112,18 +307,13 @@ class KCLSchemaGenerator:
             return "int"
         if prop_type == "number":
             return "float"
-        if prop_type == "array":
-            items = prop_def.get("items", {})
-            item_type = self._get_kcl_type(f"{prop_name}Item", items, parent_schema_name)
-            return f"[{item_type}]"
-        if prop_type == "object":
-            if "properties" in prop_def:
-                return to_pascal_case(f"{parent_schema_name}_{prop_name}")
-            if "additionalProperties" in prop_def:
-                val_type = self._get_kcl_type(
-                    f"{prop_name}Value", prop_def["additionalProperties"], parent_schema_name
-                )
-                return f"{{str:{val_type}}}"
+        if prop_type == "object" and "properties" in prop_def:
+            if id(prop_def) in self._schema_names:
+                return self._schema_names[id(prop_def)]
+            path_name = to_pascal_case(f"{parent_schema_name}_{prop_name}")
+            if path_name in self._truncated_names:
+                return "{str:any}"
+            return path_name
         if "$ref" in prop_def:
             ref_name = prop_def["$ref"].split("/")[-1]
             if "io.k8s.apimachinery.pkg.apis.meta.v1" in prop_def["$ref"]:
@@ -132,6 +322,18 @@ class KCLSchemaGenerator:
 
         return "any"
 
+    def _property_types(self, schema_name, schema_def):
+        """KCL type of each property of a schema, resolved once per generation"""
+        key = (schema_name, id(schema_def))
+        entry = self._kcl_types.get(key)
+        if entry is None:
+            # The schema is kept alongside its types so its id cannot be reused
+            entry = self._kcl_types[key] = (schema_def, {
+                prop_name: self._get_kcl_type(prop_name, prop_def, schema_name)
+                for prop_name, prop_def in schema_def.get("properties", {}).items()
+            })
+        return entry[1]
+
     def _generate_docstring(self, schema_name, schema_def):
         description = textwrap.dedent(schema_def.get("description", f"{schema_name} schema.")).strip()
         # Escape ${...} to avoid KCL string interpolation in docstrings
@@ -142,9 +344,10 @@ class KCLSchemaGenerator:
             lines.append('Attributes')
             lines.append('----------')
             required_fields = schema_def.get("required", [])
+            kcl_types = self._property_types(schema_name, schema_def)
 
             for prop_name, prop_def in properties.items():
-                kcl_type = self._get_kcl_type(prop_name, prop_def, schema_name)
+                kcl_type = kcl_types[prop_name]
                 req_opt = "required" if prop_name in required_fields else "optional"
                 attr_line = f"{prop_name} : {kcl_type}, {req_opt}"
                 prop_desc = textwrap.dedent(prop_def.get("description", "No description available.")).strip()
@@ -163,6 +366,7 @@ class KCLSchemaGenerator:
         attributes = []
         properties = schema_def.get("properties", {})
         required_fields = schema_def.get("required", [])
+        kcl_types = self._property_types(schema_name, schema_def)
 
         # For root schemas, always add Kubernetes standard fields first
         if is_root:
@@ -178,7 +382,7 @@ class KCLSchemaGenerator:
             if is_root and prop_name in ["apiVersion", "kind"]:
                 continue
                 
-            kcl_type = self._get_kcl_type(prop_name, prop_def, schema_name)
+            kcl_type = kcl_types[prop_name]
             is_required = prop_name in required_fields
             attr_name = prop_name
             attr_line = f"{attr_name}{ '' if is_required else '?'} : {kcl_type}"
@@ -188,17 +392,18 @@ class KCLSchemaGenerator:
         self.generated_schemas.add(schema_name)
         return "schema " + schema_name + ":\n" + textwrap.indent(docstring, INDENT) + "\n" + schema_body
 
-    def generate(self, base_dir=""):
-        """Return the path of the generated file and its content."""
-        self._get_crd_json()
+    def render(self):
+        """
+        Render the KCL schema without touching the filesystem.
+
+        Returns the output path relative to the base directory and the file content.
+        """
+        if self.crd_json is None:
+            self._get_crd_json()
 
         try:
             crd_spec = self.crd_json["spec"]
-            gvk_info = crd_spec["versions"][0]
-            for v in crd_spec["versions"]:
-                if v.get("served", True):
-                    gvk_info = v
-                    break
+            gvk_info = served_version(crd_spec)
 
             spec_schema = gvk_info["schema"]["openAPIV3Schema"]
             group = crd_spec["group"]
@@ -207,6 +412,7 @@ class KCLSchemaGenerator:
         except KeyError as e:
             raise ValueError(f"CRD JSON does not have expected structure: {e}")
 
+        self._mark_local_schemas(spec_schema)
         self._find_all_schemas(to_pascal_case(kind), spec_schema)
 
         schema_names_ordered = list(self.schemas_to_generate.keys())
@@ -219,6 +425,9 @@ class KCLSchemaGenerator:
                 group=group, version=version, kind=kind
             ))
 
+        if self.truncated:
+            print(truncation_warning(kind, self.max_depth, self.truncated))
+
         file_header = textwrap.dedent('''
             """
             This file was generated automatically and is intended to be a KCL Schema
@@ -227,40 +436,497 @@ class KCLSchemaGenerator:
             """
         ''').strip()
 
+        group_path = group.replace(".", "_")
+        if self._common_ids:
+            file_header += f"\n\nimport {common_module_import(group)} as {COMMON_MODULE}"
+
         file_content = f"{file_header}\n\n" + "\n\n".join(all_kcl_code)
 
-        group_path = group.replace(".", "_")
         filename = f"{group_path}_{version}_{kind}.k"
-        
+
+        # Structure library/<MODELS_DIR_NAME>/group/version/file.k
+        relative_path = Path("library") / MODELS_DIR_NAME / group_path / version / filename
+        return relative_path, file_content
+
+    def generate(self, base_dir=""):
+        """Return the path of the generated file and its content."""
+        relative_path, file_content = self.render()
+
         # Initialize KCL module if needed
         init_kcl_module_if_needed(base_dir)
-        
-        # Structure library/<MODELS_DIR_NAME>/group/version/file.k
-        output_dir = Path(base_dir) / "library" / MODELS_DIR_NAME / group_path / version
-        output_path = output_dir / filename
 
-        os.makedirs(output_dir, exist_ok=True)
-        
-        with open(output_path, "w", encoding='utf-8') as f:
-            f.write(file_content)
+        return write_schema(base_dir, relative_path, file_content), file_content
+
+
+def write_schema(base_dir, relative_path, file_content):
+    """Write rendered schema content under base_dir and return its path."""
+    output_path = Path(base_dir) / relative_path
+    os.makedirs(output_path.parent, exist_ok=True)
+
+    with open(output_path, "w", encoding='utf-8') as f:
+        f.write(file_content)
+
+    return str(output_path)
+
+
+def render_crd(crd_json, dedupe=False, common_types=None, max_depth=None):
+    """Render one CRD document. Module-level so it can run in a worker process."""
+    return KCLSchemaGenerator(
+        crd_json=crd_json, dedupe=dedupe, common_types=common_types, max_depth=max_depth
+    ).render()
+
+
+def common_module_import(group):
+    """KCL import path of a group's common module, e.g. models.ec2_aws_upbound_io.common"""
+    return f"{MODELS_DIR_NAME}.{group.replace('.', '_')}.{COMMON_MODULE}"
+
+
+def _common_module_path(base_dir, group):
+    return Path(base_dir) / "library" / MODELS_DIR_NAME / group.replace(".", "_") / f"{COMMON_MODULE}.k"
+
+
+def _read_common_module(path):
+    """Schema blocks of an existing common module by shape key: {key: (name, block)}"""
+    if not path.exists():
+        return {}
+    blocks = {}
+    for block in re.split(r"\n(?=# shape: )", path.read_text(encoding="utf-8")):
+        match = re.match(r"# shape: (\w+)\nschema (\w+)", block)
+        if match:
+            blocks[match.group(1)] = (match.group(2), block.strip())
+    return blocks
+
+
+def find_common_shapes(crds, min_crds=COMMON_MIN_CRDS, max_depth=None):
+    """
+    Find nested schemas shared by several CRDs of the same group.
+
+    Returns {group: {shape key: (property-based name, definition)}} for the
+    shapes found in at least min_crds CRDs of the group, in first-seen order.
+    Only the levels rendered (max_depth, default: AMDF_MAX_SCHEMA_DEPTH) are
+    walked. Nested schemas of a shared shape within them are shared too, so
+    each group's set is closed under references up to the depth limit.
+    """
+    if max_depth is None:
+        max_depth = config.max_schema_depth
+    counts = {}
+    for crd in crds:
+        generator = KCLSchemaGenerator(crd_json=crd, max_depth=max_depth)
+        group = crd["spec"]["group"]
+        root = served_version(crd["spec"])["schema"]["openAPIV3Schema"]
+        generator._mark_local_schemas(root)
+
+        group_counts = counts.setdefault(group, {})
+        # Shallowest depth each shape was walked from; a shallower occurrence
+        # renders more of its nested schemas, so it is walked again
+        seen = {}
+        pending = [(to_pascal_case(crd["spec"]["names"]["kind"]), root, 1)]
+        while pending:
+            schema_name, schema_def, depth = pending.pop()
+            if max_depth and depth >= max_depth:
+                continue
+            for path_name, prop_name, nested_def in generator._nested_schemas(schema_name, schema_def):
+                if id(nested_def) not in generator._local_ids:
+                    key = generator._shape_key(nested_def)
+                    if key in seen and seen[key] <= depth + 1:
+                        continue
+                    if key not in seen:
+                        entry = group_counts.setdefault(key, [0, prop_name, nested_def])
+                        entry[0] += 1
+                    seen[key] = depth + 1
+                pending.append((path_name, nested_def, depth + 1))
+
+    return {
+        group: {key: (name, definition) for key, (count, name, definition) in group_counts.items() if count >= min_crds}
+        for group, group_counts in counts.items()
+    }
+
+
+def plan_common_modules(crds, base_dir="", min_crds=COMMON_MIN_CRDS, max_depth=None):
+    """
+    Decide the common types of each group for a batch of CRDs.
+
+    Shapes already in a group's common module keep their name, so model
+    files from earlier runs stay valid; new shapes are named after the
+    property they were first found under. Returns ({group: {shape key: name}},
+    {group: {shape key: schema block}}) with the blocks to add to each module.
+    """
+    names, blocks = {}, {}
+    for group, shapes in find_common_shapes(crds, min_crds, max_depth).items():
+        existing = _read_common_module(_common_module_path(base_dir, group))
+        group_names = {key: name for key, (name, _) in existing.items()}
+        taken = set(group_names.values())
+        for key, (prop_name, _) in shapes.items():
+            if key in group_names:
+                continue
+            base = name = to_pascal_case(prop_name)
+            suffix = 2
+            while name in taken:
+                name = f"{base}{suffix}"
+                suffix += 1
+            group_names[key] = name
+            taken.add(name)
+
+        # Common schemas are rendered without the description of any one occurrence
+        generator = KCLSchemaGenerator(common_types=group_names, max_depth=max_depth)
+        generator._common_prefix = ""
+        new_blocks = {}
+        for key, (_, definition) in shapes.items():
+            if key in existing:
+                continue
+            name = group_names[key]
+            for path_name, _, nested_def in generator._nested_schemas(name, definition):
+                if generator._shape_key(nested_def) in group_names:
+                    generator._nested_schema_name(path_name, nested_def)
+                else:
+                    # Only seen past the depth limit, where models collapse it too
+                    generator._truncated_names.add(path_name)
+            shape = {k: v for k, v in definition.items() if k != "description"}
+            new_blocks[key] = f"# shape: {key}\n" + generator._generate_single_schema(name, shape)
+        names[group] = group_names
+        if new_blocks:
+            blocks[group] = new_blocks
+    return names, blocks
+
+
+def write_common_modules(base_dir, blocks):
+    """Add rendered schema blocks to each group's common module, returning the module paths"""
+    header = textwrap.dedent('''
+        """
+        This file was generated automatically and holds the KCL schemas shared
+        by several Kubernetes CRDs of this group.
+        DO NOT EDIT MANUALLY.
+        """
+    ''').strip()
+    paths = []
+    for group, group_blocks in sorted(blocks.items()):
+        path = _common_module_path(base_dir, group)
+        existing = [block for _, block in _read_common_module(path).values()]
+        os.makedirs(path.parent, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n\n".join([header] + existing + list(group_blocks.values())))
+        paths.append(str(path))
+    return paths
+
+
+def render_crds(crds, workers, dedupe=False, common_types=None, render=render_crd, max_depth=None):
+    """
+    Render CRDs lazily, keeping a bounded window of work in the process pool.
+
+    render(crd, dedupe, common_types, max_depth) runs in the workers; it must
+    be picklable. Settings are resolved here and passed to every call, so
+    workers started with spawn render exactly like this process. CRDs nested
+    too deeply to be pickled are rendered in this process.
+    """
+    common_types = common_types or {}
+    if max_depth is None:
+        max_depth = config.max_schema_depth
+    if workers <= 1:
+        for crd in crds:
+            yield render(crd, dedupe, common_types.get(crd["spec"]["group"]), max_depth)
+        return
+
+    def _result(crd, future):
+        try:
+            return future.result()
+        except RecursionError:
+            return render(crd, dedupe, common_types.get(crd["spec"]["group"]), max_depth)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for crd in crds:
+            pending.append((
+                crd, executor.submit(render, crd, dedupe, common_types.get(crd["spec"]["group"]), max_depth)
+            ))
+            if len(pending) >= workers * 4:
+                yield _result(*pending.popleft())
+        while pending:
+            yield _result(*pending.popleft())
+
+
+def iter_generate_crds(crds, base_dir="", workers=1, dedupe=False, common_types=False, max_depth=None):
+    """
+    Render and write schemas for a stream of CRD documents.
+
+    With workers > 1 rendering is fanned out to a process pool (workers <= 0
+    uses every available core). Results come back in input order and are
+    written by the calling process, so the output is identical to the serial
+    path. Documents are consumed lazily, so CRDs streamed from files or
+    archives are never all held in memory. With dedupe, structurally
+    identical nested schemas of a CRD are emitted once. With common_types,
+    the whole batch is read first and schemas shared by several CRDs of a
+    group are written once to the group's common module, which the model
+    files import. Schemas nested deeper than max_depth (default:
+    AMDF_MAX_SCHEMA_DEPTH) collapse to {str:any}. Yields (schema_path, content).
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if max_depth is None:
+        max_depth = config.max_schema_depth
+
+    common_names, common_blocks = None, {}
+    if common_types:
+        crds = list(crds)
+        common_names, common_blocks = plan_common_modules(crds, base_dir, max_depth=max_depth)
+
+    initialized = False
+    for relative_path, content in render_crds(crds, workers, dedupe, common_names, max_depth=max_depth):
+        if not initialized:
+            init_kcl_module_if_needed(base_dir)
+            initialized = True
+        yield write_schema(base_dir, relative_path, content), content
+
+    if common_blocks:
+        write_common_modules(base_dir, common_blocks)
+
+
+def served_version(crd_spec):
+    """Return the version entry schemas are generated from: the first served one."""
+    for v in crd_spec["versions"]:
+        if v.get("served", True):
+            return v
+    return crd_spec["versions"][0]
+
+
+def crd_info_from_crd(crd):
+    """Build a CRDInfo record from a CRD document."""
+    spec = crd["spec"]
+    return CRDInfo(
+        name=crd["metadata"]["name"],
+        group=spec["group"],
+        version=served_version(spec)["name"],
+        kind=spec["names"]["kind"],
+        plural=spec["names"]["plural"],
+        scope=spec.get("scope", ""),
+    )
+
+
+# kubectl fallback columns, in CRDInfo field order
+_CRD_INFO_COLUMNS = (
+    "NAME:.metadata.name,"
+    "GROUP:.spec.group,"
+    "VERSION:.spec.versions[?(@.served==true)].name,"
+    "KIND:.spec.names.kind,"
+    "PLURAL:.spec.names.plural,"
+    "SCOPE:.spec.scope"
+)
+
+
+def _kubectl_crd_info_pages(context, page_size):
+    command = ["kubectl"]
+    if context:
+        command.extend(["--context", context])
+    command.extend([
+        "get", "crd", "--no-headers", f"--chunk-size={page_size}",
+        "-o", f"custom-columns={_CRD_INFO_COLUMNS}",
+    ])
+
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        page = []
+        for line in process.stdout:
+            columns = line.split()
+            if len(columns) != 6:
+                continue
+            name, group, versions, kind, plural, scope = columns
+            page.append(CRDInfo(
+                name=name, group=group, version=versions.split(",")[0],
+                kind=kind, plural=plural, scope=scope,
+            ))
+            if len(page) >= page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+        stderr = process.stderr.read()
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        returncode = process.wait()
+
+    if returncode != 0:
+        raise RuntimeError(f"Error listing CRDs: {stderr}")
+
+
+def _crd_info_pages(context, page_size):
+    client = get_kube_client(context)
+    if client is None:
+        yield from _kubectl_crd_info_pages(context, page_size)
+        return
+    try:
+        for crds in client.iter_crds(limit=page_size):
+            yield [crd_info_from_crd(crd) for crd in crds]
+    except KubeAPIError as e:
+        raise RuntimeError(f"Error listing CRDs: {e}")
+
+
+def _crd_list_cache_path(context):
+    return cache_dir("crd-list") / f"{cache_key(*cluster_identity(context))}.json"
+
+
+def iter_crd_pages(context=None, filter_text=None, page_size=None, refresh=False):
+    """
+    Yield CRDInfo records page by page as they arrive from the cluster.
+
+    The API is paged with limit/continue tokens (kubectl --chunk-size as
+    fallback) and filter_text is applied to each page, so callers can show
+    the first results before the whole list has been received. A complete
+    listing is cached on disk per cluster and context for config.crd_list_ttl
+    seconds; refresh=True bypasses the cached copy.
+    """
+    page_size = page_size or config.list_page_size
+    needle = filter_text.lower() if filter_text else None
+
+    def _filtered(infos):
+        if needle:
+            return [info for info in infos if needle in info.name.lower()]
+        return infos
+
+    cache_path = _crd_list_cache_path(context) if config.crd_list_ttl > 0 else None
+    cached = None
+    if cache_path is not None and not refresh:
+        cached = load_json(cache_path, ttl=config.crd_list_ttl)
+
+    if cached is not None:
+        infos = [CRDInfo(**item) for item in cached]
+        for start in range(0, len(infos), page_size):
+            yield _filtered(infos[start:start + page_size])
+        return
+
+    collected = []
+    for infos in _crd_info_pages(context, page_size):
+        collected.extend(infos)
+        yield _filtered(infos)
+
+    # Only complete listings are cached
+    if cache_path is not None:
+        store_json(cache_path, [info.model_dump() for info in collected])
+
+
+def list_crd_infos(context=None, filter_text=None, refresh=False):
+    """List CRDInfo records for the CRDs in the cluster, sorted by name."""
+    infos = [info for page in iter_crd_pages(context, filter_text, refresh=refresh) for info in page]
+    return sorted(infos, key=lambda info: info.name)
 
-        return str(output_path), file_content
 
 def list_available_crds(context=None):
     """List all available CRDs in the cluster."""
+    return [info.name for info in list_crd_infos(context)]
+
+
+# Above this many cache misses a single list call beats individual requests
+_MAX_SINGLE_FETCHES = 10
+
+# Up to this many exact names are looked up one by one; beyond that a single
+# metadata list resolves them all
+_MAX_NAME_LOOKUPS = 3
+
+
+def _is_glob(pattern):
+    return any(c in pattern for c in "*?[")
+
+
+def fetch_crds(patterns=None, context=None):
+    """
+    Fetch several CRD definitions from Kubernetes in a single pass.
+
+    A few exact names are requested directly; for more names, a glob or no
+    pattern at all, CRD metadata is listed once and filtered locally. With
+    the built-in API client full documents are taken from the local CRD cache
+    when their uid and generation still match, so only cache misses are
+    downloaded; otherwise a single kubectl call is used. Returns the trimmed
+    CRD documents sorted by name.
+    """
+    patterns = list(patterns or [])
+    exact_names = patterns and not any(_is_glob(p) for p in patterns)
+    names = set(patterns) if exact_names else set()
+
+    def _matches(name):
+        if exact_names:
+            return name in names
+        return not patterns or any(fnmatch.fnmatchcase(name, p) for p in patterns)
+
+    client = get_kube_client(context)
+    if client is None:
+        items = _kubectl_get_crds(patterns if exact_names else [], context)
+        items = [item for item in items if _matches(item["metadata"]["name"])]
+        return sorted(items, key=lambda item: item["metadata"]["name"])
+
     try:
-        command = ["kubectl"]
-        if context:
-            command.extend(["--context", context])
-        command.extend(["get", "crd", "--no-headers", "-o", "custom-columns=NAME:.metadata.name"])
+        if exact_names and len(names) <= _MAX_NAME_LOOKUPS:
+            # A few exact names are cheap single requests over the pooled connection
+            items = [_get_crd_cached(client, name) for name in dict.fromkeys(patterns)]
+            return sorted(items, key=lambda item: item["metadata"]["name"])
+
+        # List metadata only and download full documents just for cache misses
+        items, misses = [], []
+        for page in client.iter_crd_metadata(limit=config.list_page_size):
+            for metadata in page:
+                if not _matches(metadata["name"]):
+                    continue
+                cached = load_cached_crd(metadata)
+                if cached is not None:
+                    items.append(cached)
+                else:
+                    misses.append(metadata["name"])
+
+        if exact_names:
+            # Like kubectl get crd <names>, every requested name must exist
+            not_found = names - {item["metadata"]["name"] for item in items} - set(misses)
+            if not_found:
+                raise RuntimeError(f"Could not get CRDs. Not found: {', '.join(sorted(not_found))}")
+
+        if len(misses) > _MAX_SINGLE_FETCHES:
+            missing = set(misses)
+            fetched = [crd for crd in client.list_crds() if crd["metadata"]["name"] in missing]
+        else:
+            fetched = [client.get_crd(name) for name in misses]
+        for crd in fetched:
+            store_cached_crd(crd)
+        items.extend(fetched)
+    except KubeAPIError as e:
+        raise RuntimeError(f"Could not get CRDs. {e}")
+
+    return sorted(items, key=lambda item: item["metadata"]["name"])
+
+
+def _get_crd_cached(client, name):
+    """Get one CRD, reusing the local cache when its uid and generation still match."""
+    crd = load_cached_crd(client.get_crd_metadata(name))
+    if crd is None:
+        crd = client.get_crd(name)
+        store_cached_crd(crd)
+    return crd
+
+
+def _kubectl_get_crds(names, context=None):
+    """Get the named CRDs, or all of them, with a single kubectl call."""
+    command = ["kubectl"]
+    if context:
+        command.extend(["--context", context])
+    command.extend(["get", "crd"])
+    command.extend(dict.fromkeys(names))
+    command.extend(["-o", "json"])
 
+    try:
         result = subprocess.run(
             command,
             capture_output=True,
             text=True,
             check=True,
         )
-        crds = [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
-        return sorted(crds)
+        data = json.loads(result.stdout)
     except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Error listing CRDs: {e.stderr}")
+        raise RuntimeError(f"Could not get CRDs. Stderr: {e.stderr}")
+    except json.JSONDecodeError:
+        raise ValueError("kubectl output is not valid JSON.")
+
+    # A single name returns the object itself, several names return a List
+    items = data["items"] if "items" in data else [data]
+    return [trim_crd(item) for item in items]
@@ -3,52 +3,175 @@ Kubernetes Native Object Schema Generator
 Generates KCL schemas from Kubernetes OpenAPI specifications
 """
 
-import json
+import os
+import re
 import textwrap
-import urllib.request
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 
-from .generator import to_pascal_case, init_kcl_module_if_needed
+from ..config import config
+from .generator import to_pascal_case, init_kcl_module_if_needed, truncation_warning, write_schema
+from .k8s_source import (
+    definition_api_version,
+    find_cluster_definition_key,
+    find_k8s_definition_key,
+    load_k8s_definitions,
+)
 
 INDENT = "    "
 
+FILE_HEADER = textwrap.dedent('''
+    """
+    This file was generated automatically from Kubernetes OpenAPI specification.
+    DO NOT EDIT MANUALLY.
+    """
+''').strip()
+
+# Shared type modules live in library/models/k8s/types and are imported as models.k8s.types.<module>
+TYPES_IMPORT_PREFIX = "models.k8s.types"
+
+
+def types_module_name(def_key: str) -> str:
+    """
+    Shared module of a definition, named after its group and version.
+
+    io.k8s.api.core.v1.Container -> core_v1,
+    io.k8s.apimachinery.pkg.apis.meta.v1.ObjectMeta -> meta_v1
+    """
+    package = def_key.split(".")[:-1]
+    parts = package[-2:] if re.fullmatch(r"v\d+\w*", package[-1]) else package[-1:]
+    return "_".join(parts).replace("-", "_")
+
+
+def _split_module(content: str) -> Tuple[Set[str], Dict[str, str]]:
+    """Split a generated module into its imported modules and its schema blocks by name"""
+    imports = set(re.findall(r"^import \S+ as (\w+)$", content, re.MULTILINE))
+    blocks = {}
+    for block in re.split(r"\n(?=schema )", content):
+        match = re.match(r"schema (\w+)", block)
+        if match:
+            blocks[match.group(1)] = block.strip()
+    return imports, blocks
+
+
+def _module_content(imports: Set[str], blocks: List[str]) -> str:
+    parts = [FILE_HEADER]
+    if imports:
+        parts.append("\n".join(f"import {TYPES_IMPORT_PREFIX}.{m} as {m}" for m in sorted(imports)))
+    return "\n\n".join(parts + blocks)
+
+
+def merge_shared_modules(target: Dict[str, Tuple[Set[str], Dict[str, str]]],
+                         modules: Dict[str, Tuple[Set[str], Dict[str, str]]]) -> None:
+    """Merge rendered shared type modules ({module: (imports, blocks)}) into target"""
+    for module, (imports, blocks) in modules.items():
+        target_imports, target_blocks = target.setdefault(module, (set(), {}))
+        target_imports |= imports
+        target_blocks.update(blocks)
+
+
+def write_shared_modules(base_dir: str, modules: Dict[str, Tuple[Set[str], Dict[str, str]]]) -> List[str]:
+    """Write shared type modules to library/models/k8s/types, merged with the schemas already there"""
+    types_dir = Path(base_dir) / "library" / "models" / "k8s" / "types"
+    types_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for module, (imports, blocks) in sorted(modules.items()):
+        module_path = types_dir / f"{module}.k"
+        if module_path.exists():
+            existing_imports, existing_blocks = _split_module(module_path.read_text(encoding="utf-8"))
+            imports = imports | existing_imports
+            blocks = {**existing_blocks, **blocks}
+        with open(module_path, "w", encoding="utf-8") as f:
+            f.write(_module_content(imports, list(blocks.values())))
+        paths.append(str(module_path))
+    return paths
+
+
+# Per process: resolved definitions by (source, shared_types) and rendered
+# shared types by (source, max_depth, definition key), reused by every kind.
+# The source is the Kubernetes version, or the context for schemas read from a cluster.
+# A resolution memo holds {key: resolved}, {id(resolved): key} and {key: closure}
+_resolution_memos: Dict[Tuple[str, bool], Tuple[Dict[str, Any], Dict[int, str], Dict[str, FrozenSet[str]]]] = {}
+_shared_type_renders: Dict[Tuple[str, int, str], Tuple[str, Set[str], Dict[str, str], List[str]]] = {}
+
 
 class K8SNativeGenerator:
     """Generator for native Kubernetes object schemas"""
     
-    def __init__(self, kind: str, k8s_version: str = "1.35.0"):
+    def __init__(
+        self,
+        kind: str,
+        k8s_version: str = "1.35.0",
+        api_version: Optional[str] = None,
+        shared_types: bool = False,
+        from_cluster: bool = False,
+        context: Optional[str] = None,
+        max_depth: Optional[int] = None,
+    ):
         self.kind = kind
         self.k8s_version = k8s_version
+        self.api_version = api_version
+        self.shared_types = shared_types
+        # Read the kind's group-version document from the cluster's /openapi/v3 instead of upstream
+        self.from_cluster = from_cluster
+        self.context = context
+        self._source = f"cluster:{context or ''}" if from_cluster else k8s_version
+        self._cluster_def_key = None
         self.openapi_spec = None
         self.schemas_to_generate = {}
         self.generated_schemas = set()
+        # Resolved definitions by key, shared by every place (and every kind) that references them
+        self._resolved, self._resolved_keys, self._resolved_closures = _resolution_memos.setdefault(
+            (self._source, shared_types), ({}, {}, {})
+        )
+        # Resolutions that cut a cycle back to an ancestor: {key: [(resolved, closure, cut keys)]}
+        self._cut_resolved = {}
+        self._cut_resolved_keys = {}
+        self._resolving = set()
+        # Definitions reached and references cut while resolving the current subtree
+        self._reached = set()
+        self._cuts = set()
+        self._ref_schema_names = {}
+        # Shared types mode: referenced definitions and the imports of the module being rendered
+        self._shared_defs = {}
+        self._current_module = None
+        self._imports = set()
+        self.shared_modules = {}
+        self.shared_type_paths = []
+        # Nesting levels rendered as schemas; deeper subtrees collapse to {str:any}
+        self.max_depth = config.max_schema_depth if max_depth is None else max_depth
+        self._truncated_names = set()
+        self.truncated = []
+        # KCL types of each schema's properties, shared by the docstring and
+        # attribute emitters of one module: {(schema name, id): (schema, types)}
+        self._kcl_types = {}
         
     def _load_openapi_spec(self):
-        """Load Kubernetes OpenAPI specification"""
+        """Load Kubernetes OpenAPI specification (shared by every generator in the process)"""
         if self.openapi_spec:
             return
-            
-        url = f"https://raw.githubusercontent.com/kubernetes/kubernetes/v{self.k8s_version}/api/openapi-spec/swagger.json"
+        
+        if self.from_cluster:
+            # Only the group-version document serving the kind is fetched
+            definitions, self._cluster_def_key = find_cluster_definition_key(
+                self.kind, self.api_version, self.context
+            )
+            self.openapi_spec = {"definitions": definitions}
+            return
         
         try:
-            with urllib.request.urlopen(url) as response:
-                self.openapi_spec = json.loads(response.read())
+            # Definitions are parsed lazily, so only the kind's closure is loaded
+            self.openapi_spec = {"definitions": load_k8s_definitions(self.k8s_version)}
         except Exception as e:
             raise ValueError(f"Failed to load Kubernetes OpenAPI spec: {e}")
     
     def _find_definition_key(self) -> str:
-        """Find the definition key for the given kind"""
+        """Find the definition key for the given kind (and apiVersion, when set)"""
         self._load_openapi_spec()
-        
-        definitions = self.openapi_spec.get("definitions", {})
-        
-        # Search for the kind in definitions
-        for key in definitions.keys():
-            if key.endswith(f".{self.kind}"):
-                return key
-        
-        raise ValueError(f"Kind '{self.kind}' not found in Kubernetes v{self.k8s_version}")
+        if self.from_cluster:
+            return self._cluster_def_key
+        return find_k8s_definition_key(self.kind, self.k8s_version, self.api_version)
     
     def _resolve_ref(self, ref: str) -> Dict[str, Any]:
         """Resolve a $ref to its definition"""
@@ -63,10 +186,70 @@ class K8SNativeGenerator:
         
         return definition
     
+    def _reusable_resolution(self, def_key: str) -> Optional[Dict[str, Any]]:
+        """
+        A memoized resolution of def_key equal to what resolving it here would
+        give: none of the definitions it reached may be in the middle of being
+        resolved now, except exactly the ones it cut a cycle at.
+        """
+        if def_key in self._resolved:
+            closure = self._resolved_closures[def_key]
+            if self._resolving.isdisjoint(closure):
+                self._reached |= closure
+                return self._resolved[def_key]
+        for resolved, closure, cuts in self._cut_resolved.get(def_key, ()):
+            if self._resolving & closure == cuts:
+                self._reached |= closure
+                self._cuts |= cuts
+                return resolved
+        return None
+
     def _resolve_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively resolve all $ref in a schema"""
+        """
+        Recursively resolve all $ref in a schema.
+
+        Each definition is resolved once and the result is shared by every
+        reference to it. A reference back to a definition that is still being
+        resolved (e.g. JSONSchemaProps) becomes a named reference marked with
+        x-amdf-ref instead of recursing forever. A resolution is reused only
+        where it cuts the same cycles, so a kind renders the same whichever
+        kinds were generated before it in the process.
+        """
         if "$ref" in schema:
-            return self._resolve_ref(schema["$ref"])
+            ref = schema["$ref"]
+            def_key = ref.replace("#/definitions/", "")
+            reused = self._reusable_resolution(def_key)
+            if reused is not None:
+                return reused
+            definition = self._resolve_ref(ref)
+            # Object definitions become a shared type in shared types mode
+            if (self.shared_types and "properties" in definition) or def_key in self._resolving:
+                if def_key in self._resolving:
+                    self._reached.add(def_key)
+                    self._cuts.add(def_key)
+                named_ref = {k: definition[k] for k in ("type", "description") if k in definition}
+                named_ref["x-amdf-ref"] = def_key
+                return named_ref
+            
+            self._resolving.add(def_key)
+            outer_reached, outer_cuts = self._reached, self._cuts
+            self._reached, self._cuts = {def_key}, set()
+            try:
+                resolved = self._resolve_schema(definition)
+            finally:
+                self._resolving.discard(def_key)
+                self._cuts.discard(def_key)
+                closure, cuts = frozenset(self._reached), frozenset(self._cuts)
+                self._reached, self._cuts = outer_reached | closure, outer_cuts | cuts
+            if cuts:
+                # Depends on the ancestors it cut at, only reused below the same ones
+                self._cut_resolved.setdefault(def_key, []).append((resolved, closure, cuts))
+                self._cut_resolved_keys[id(resolved)] = def_key
+            else:
+                self._resolved[def_key] = resolved
+                self._resolved_keys[id(resolved)] = def_key
+                self._resolved_closures[def_key] = closure
+            return resolved
         
         resolved = schema.copy()
         
@@ -84,33 +267,90 @@ class K8SNativeGenerator:
         
         return resolved
     
-    def _find_all_schemas(self, schema_name: str, schema_def: Dict[str, Any]):
-        """Discover all schemas needed for generation"""
-        if not schema_def or schema_name in self.schemas_to_generate:
-            return
-
-        self.schemas_to_generate[schema_name] = schema_def
-
+    def _nested_schemas(self, schema_name: str, schema_def: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield (name, property name, definition) for each inline object schema of a schema"""
         properties = schema_def.get("properties", {})
         for prop_name, prop_def in properties.items():
             prop_type = prop_def.get("type")
 
             if prop_type == "object" and "properties" in prop_def:
-                nested_schema_name = to_pascal_case(f"{schema_name}_{prop_name}")
-                self._find_all_schemas(nested_schema_name, prop_def)
+                yield to_pascal_case(f"{schema_name}_{prop_name}"), prop_name, prop_def
             elif prop_type == "object" and "additionalProperties" in prop_def:
                 additional_props = prop_def["additionalProperties"]
                 if additional_props.get("type") == "object" and "properties" in additional_props:
-                    nested_schema_name = to_pascal_case(f"{schema_name}_{prop_name}Value")
-                    self._find_all_schemas(nested_schema_name, additional_props)
+                    yield to_pascal_case(f"{schema_name}_{prop_name}Value"), f"{prop_name}Value", additional_props
             elif prop_type == "array" and prop_def.get("items", {}).get("type") == "object":
                 items_def = prop_def.get("items", {})
                 if "properties" in items_def:
-                    nested_schema_name = to_pascal_case(f"{schema_name}_{prop_name}Item")
-                    self._find_all_schemas(nested_schema_name, items_def)
+                    yield to_pascal_case(f"{schema_name}_{prop_name}Item"), f"{prop_name}Item", items_def
+    
+    def _add_schema(self, schema_name: str, schema_def: Dict[str, Any]):
+        self.schemas_to_generate[schema_name] = schema_def
+        def_key = self._resolved_keys.get(id(schema_def)) or self._cut_resolved_keys.get(id(schema_def))
+        if def_key:
+            # Named references to this definition use the first schema emitted for it
+            self._ref_schema_names.setdefault(def_key, schema_name)
+    
+    def _find_all_schemas(self, schema_name: str, schema_def: Dict[str, Any]):
+        """
+        Discover all schemas needed for generation, depth first with an
+        explicit stack. Resolved definitions are shared by every reference,
+        so the walk is bounded by max_depth rather than by the spec's size.
+        """
+        if not schema_def or schema_name in self.schemas_to_generate:
+            return
+
+        self._add_schema(schema_name, schema_def)
+        stack = [(schema_name, 1, self._nested_schemas(schema_name, schema_def))]
+        while stack:
+            parent_name, depth, nested = stack[-1]
+            entry = next(nested, None)
+            if entry is None:
+                stack.pop()
+                continue
+
+            nested_schema_name, prop_name, nested_def = entry
+            if self.max_depth and depth >= self.max_depth:
+                self._truncated_names.add(nested_schema_name)
+                self.truncated.append(f"{parent_name}.{prop_name}")
+                continue
+            if nested_schema_name in self.schemas_to_generate:
+                continue
+            self._add_schema(nested_schema_name, nested_def)
+            stack.append((nested_schema_name, depth + 1, self._nested_schemas(nested_schema_name, nested_def)))
     
     def _get_kcl_type(self, prop_name: str, prop_def: Dict[str, Any], parent_schema_name: str) -> str:
-        """Convert OpenAPI type to KCL type"""
+        """
+        Convert OpenAPI type to KCL type. Array and map wrappers are unwrapped
+        in a loop; past max_depth wrappers the element type collapses to any.
+        """
+        wrappers = []
+        while "x-amdf-ref" not in prop_def:
+            prop_type = prop_def.get("type")
+            if prop_type == "array":
+                wrappers.append(("[", "]"))
+                prop_name, prop_def = f"{prop_name}Item", prop_def.get("items", {})
+            elif prop_type == "object" and "properties" not in prop_def and "additionalProperties" in prop_def:
+                wrappers.append(("{str:", "}"))
+                prop_name, prop_def = f"{prop_name}Value", prop_def["additionalProperties"]
+            else:
+                break
+            if self.max_depth and len(wrappers) >= self.max_depth:
+                self.truncated.append(f"{parent_schema_name}.{prop_name}")
+                prop_def = {}
+                break
+        
+        kcl_type = self._element_kcl_type(prop_name, prop_def, parent_schema_name)
+        for opening, closing in reversed(wrappers):
+            kcl_type = f"{opening}{kcl_type}{closing}"
+        return kcl_type
+    
+    def _element_kcl_type(self, prop_name: str, prop_def: Dict[str, Any], parent_schema_name: str) -> str:
+        """KCL type of a property that is not an array or map"""
+        if "x-amdf-ref" in prop_def:
+            if self.shared_types:
+                return self._shared_type_name(prop_def["x-amdf-ref"])
+            return self._ref_schema_names.get(prop_def["x-amdf-ref"], "any")
         prop_type = prop_def.get("type")
         
         if prop_type == "string":
@@ -123,21 +363,25 @@ class K8SNativeGenerator:
             return "int"
         if prop_type == "number":
             return "float"
-        if prop_type == "array":
-            items = prop_def.get("items", {})
-            item_type = self._get_kcl_type(f"{prop_name}Item", items, parent_schema_name)
-            return f"[{item_type}]"
-        if prop_type == "object":
-            if "properties" in prop_def:
-                return to_pascal_case(f"{parent_schema_name}_{prop_name}")
-            if "additionalProperties" in prop_def:
-                val_type = self._get_kcl_type(
-                    f"{prop_name}Value", prop_def["additionalProperties"], parent_schema_name
-                )
-                return f"{{str:{val_type}}}"
+        if prop_type == "object" and "properties" in prop_def:
+            path_name = to_pascal_case(f"{parent_schema_name}_{prop_name}")
+            if path_name in self._truncated_names:
+                return "{str:any}"
+            return path_name
         
         return "any"
     
+    def _property_types(self, schema_name: str, schema_def: Dict[str, Any]) -> Dict[str, str]:
+        """KCL type of each property of a schema, resolved once per rendered module"""
+        key = (schema_name, id(schema_def))
+        entry = self._kcl_types.get(key)
+        if entry is None:
+            entry = self._kcl_types[key] = (schema_def, {
+                prop_name: self._get_kcl_type(prop_name, prop_def, schema_name)
+                for prop_name, prop_def in schema_def.get("properties", {}).items()
+            })
+        return entry[1]
+    
     def _generate_docstring(self, schema_name: str, schema_def: Dict[str, Any]) -> str:
         """Generate docstring for schema"""
         description = textwrap.dedent(schema_def.get("description", f"{schema_name} schema.")).strip()
@@ -151,6 +395,7 @@ class K8SNativeGenerator:
             lines.append("")
             lines.append("Attributes")
             lines.append("----------")
+            kcl_types = self._property_types(schema_name, schema_def)
             for prop_name, prop_def in properties.items():
                 prop_desc = prop_def.get("description", "No description available.")
                 prop_desc = textwrap.dedent(prop_desc).strip().replace("\n", " ")
@@ -158,8 +403,7 @@ class K8SNativeGenerator:
                 prop_desc = prop_desc.replace("${", "\\${")
                 required = prop_name in schema_def.get("required", [])
                 req_text = "" if required else ", optional"
-                kcl_type = self._get_kcl_type(prop_name, prop_def, schema_name)
-                lines.append(f"{prop_name} : {kcl_type}{req_text}")
+                lines.append(f"{prop_name} : {kcl_types[prop_name]}{req_text}")
                 lines.append(f"    {prop_desc}")
         
         lines.append('"""')
@@ -175,6 +419,7 @@ class K8SNativeGenerator:
         attributes = []
         properties = schema_def.get("properties", {})
         required_fields = schema_def.get("required", [])
+        kcl_types = self._property_types(schema_name, schema_def)
 
         # For root schemas, always add Kubernetes standard fields first
         if is_root:
@@ -186,68 +431,205 @@ class K8SNativeGenerator:
             if is_root and prop_name in ["apiVersion", "kind"]:
                 continue
                 
-            kcl_type = self._get_kcl_type(prop_name, prop_def, schema_name)
             is_required = prop_name in required_fields
-            attr_line = f"{prop_name}{ '' if is_required else '?'} : {kcl_type}"
+            attr_line = f"{prop_name}{ '' if is_required else '?'} : {kcl_types[prop_name]}"
             attributes.append(attr_line)
 
         schema_body = textwrap.indent("\n".join(attributes), INDENT)
         self.generated_schemas.add(schema_name)
         return "schema " + schema_name + ":\n" + textwrap.indent(docstring, INDENT) + "\n" + schema_body
     
-    def generate(self, base_dir: str = "") -> Tuple[str, str]:
-        """Generate KCL schema file"""
+    def _shared_type_name(self, def_key: str) -> str:
+        """KCL type of a shared definition, qualified when it lives in another module"""
+        self._shared_defs.setdefault(def_key, None)
+        module = types_module_name(def_key)
+        type_name = def_key.rsplit(".", 1)[-1]
+        if module == self._current_module:
+            return type_name
+        self._imports.add(module)
+        return f"{module}.{type_name}"
+    
+    def _render_schemas(self, schema_name: str, schema_def: Dict[str, Any],
+                        is_root: bool = False, api_version: str = None) -> Dict[str, str]:
+        """Render a schema and the inline object schemas nested in it, by name"""
+        self.schemas_to_generate = {}
+        # Types depend on the module being rendered (imports, qualified names)
+        self._kcl_types = {}
+        self._find_all_schemas(schema_name, schema_def)
+        
+        rendered = {}
+        for i, (name, nested_def) in enumerate(self.schemas_to_generate.items()):
+            rendered[name] = self._generate_single_schema(
+                name, nested_def, is_root=is_root and i == 0, api_version=api_version
+            )
+        return rendered
+    
+    def _render_shared_type(self, def_key: str) -> Tuple[str, Set[str], Dict[str, str], List[str]]:
+        """Render one shared definition: (module, imports, schema blocks, definitions it references)"""
+        outer_defs, self._shared_defs = self._shared_defs, {}
+        self._current_module = types_module_name(def_key)
+        self._imports = set()
+        self.generated_schemas = set()
+        resolved = self._resolve_schema(self._resolve_ref(f"#/definitions/{def_key}"))
+        blocks = self._render_schemas(def_key.rsplit(".", 1)[-1], resolved)
+        referenced = list(self._shared_defs)
+        self._shared_defs = outer_defs
+        return self._current_module, self._imports, blocks, referenced
+    
+    def _render_shared_types(self) -> Dict[str, Tuple[Set[str], Dict[str, str]]]:
+        """
+        Render every definition referenced so far (and the ones they reference)
+        into its group/version module. Each definition is rendered once per process.
+        """
+        modules: Dict[str, Tuple[Set[str], Dict[str, str]]] = {}
+        rendered = set()
+        while len(rendered) < len(self._shared_defs):
+            for def_key in [k for k in self._shared_defs if k not in rendered]:
+                rendered.add(def_key)
+                entry = _shared_type_renders.get((self._source, self.max_depth, def_key))
+                if entry is None:
+                    entry = self._render_shared_type(def_key)
+                    _shared_type_renders[(self._source, self.max_depth, def_key)] = entry
+                module, imports, blocks, referenced = entry
+                for referenced_key in referenced:
+                    self._shared_defs.setdefault(referenced_key, None)
+                merge_shared_modules(modules, {module: (imports, blocks)})
+        return modules
+    
+    def render(self) -> Tuple[str, str]:
+        """
+        Render the KCL schema file, returning (relative_path, content).
+
+        In shared types mode the referenced types are rendered into
+        self.shared_modules ({module: (imports, schema blocks)}).
+        """
         self._load_openapi_spec()
         
         # Find and resolve the main definition
         def_key = self._find_definition_key()
-        main_def = self.openapi_spec["definitions"][def_key]
         
-        # Resolve all $ref recursively
-        resolved_def = self._resolve_schema(main_def)
-        
-        # Extract API version from definition key (e.g., io.k8s.api.core.v1.Pod -> core/v1)
-        parts = def_key.split(".")
-        if len(parts) >= 5:
-            group = parts[3] if parts[3] != "core" else ""
-            version = parts[4]
-            api_version = f"{group}/{version}" if group else version
+        # Resolve all $ref recursively (in shared types mode, referenced objects stay named)
+        if self.shared_types:
+            resolved_def = self._resolve_schema(self.openapi_spec["definitions"][def_key])
+            spec = resolved_def.get("properties", {}).get("spec")
+            if spec and "x-amdf-ref" in spec:
+                # The kind's own spec stays in the kind's file, blueprints are built from it
+                local_spec = self._resolve_schema(self._resolve_ref(f"#/definitions/{spec['x-amdf-ref']}"))
+                resolved_def["properties"] = {**resolved_def["properties"], "spec": local_spec}
         else:
-            api_version = "v1"
+            resolved_def = self._resolve_schema({"$ref": f"#/definitions/{def_key}"})
         
-        # Find all schemas
-        self._find_all_schemas(self.kind, resolved_def)
+        # The real group/version of the kind (e.g. networking.k8s.io/v1), not pieces of its key
+        api_version = definition_api_version(
+            self.openapi_spec["definitions"][def_key], def_key, self.kind, self.api_version
+        )
         
-        # Generate all schemas
-        schema_names_ordered = list(self.schemas_to_generate.keys())
-        all_kcl_code = []
+        # Find and generate all schemas
+        all_kcl_code = list(self._render_schemas(
+            self.kind, resolved_def, is_root=True, api_version=api_version
+        ).values())
         
-        for i, schema_name in enumerate(schema_names_ordered):
-            schema_def = self.schemas_to_generate[schema_name]
-            is_root = (i == 0)
-            all_kcl_code.append(self._generate_single_schema(
-                schema_name, schema_def, is_root=is_root, api_version=api_version
-            ))
+        if self.shared_types:
+            final_content = _module_content(self._imports, all_kcl_code)
+            self.shared_modules = self._render_shared_types()
+        else:
+            final_content = FILE_HEADER + "\n\n" + "\n\n".join(all_kcl_code)
         
-        file_header = textwrap.dedent('''
-            """
-            This file was generated automatically from Kubernetes OpenAPI specification.
-            DO NOT EDIT MANUALLY.
-            """
-        ''').strip()
+        if self.truncated:
+            print(truncation_warning(self.kind, self.max_depth, self.truncated))
         
-        final_content = file_header + "\n\n" + "\n\n".join(all_kcl_code)
+        api_dir = api_version.replace(".", "_").replace("/", "_")
+        relative_path = Path("library") / "models" / "k8s" / api_dir / f"k8s_{api_dir}_{self.kind}.k"
+        return str(relative_path), final_content
+    
+    def generate(self, base_dir: str = "") -> Tuple[str, str]:
+        """Generate KCL schema file"""
+        relative_path, final_content = self.render()
         
         # Initialize KCL module if needed
         init_kcl_module_if_needed(base_dir)
         
-        # Save to file
-        output_path = Path(base_dir) / "library" / "models" / "k8s" / api_version.replace("/", "_")
-        output_path.mkdir(parents=True, exist_ok=True)
-        
-        file_path = output_path / f"k8s_{api_version.replace('/', '_')}_{self.kind}.k"
-        
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(final_content)
+        if self.shared_types:
+            self.shared_type_paths = write_shared_modules(base_dir, self.shared_modules)
         
-        return str(file_path), final_content
+        return write_schema(base_dir, relative_path, final_content), final_content
+
+
+K8SKindTask = Tuple[str, str, Optional[str], bool, bool, Optional[str], int]
+
+
+def render_k8s_kind(task: K8SKindTask):
+    """
+    Render one kind: task is (kind, k8s_version, api_version, shared_types,
+    from_cluster, context, max_depth). Module-level so it can run in a worker
+    process; returns (relative_path, content, shared_modules).
+    """
+    kind, k8s_version, api_version, shared_types, from_cluster, context, max_depth = task
+    generator = K8SNativeGenerator(
+        kind, k8s_version, api_version=api_version, shared_types=shared_types,
+        from_cluster=from_cluster, context=context, max_depth=max_depth,
+    )
+    relative_path, content = generator.render()
+    return relative_path, content, generator.shared_modules
+
+
+def render_k8s_kinds(tasks: List[K8SKindTask], workers: int = 1) -> Iterator:
+    """
+    Render render_k8s_kind tasks in input order, on a process pool when workers > 1
+    (workers <= 0 uses every available core).
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        yield from map(render_k8s_kind, tasks)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Contiguous chunks keep related kinds in the same process, reusing its resolved definitions
+        yield from executor.map(render_k8s_kind, tasks, chunksize=max(1, len(tasks) // (workers * 2)))
+
+
+def iter_generate_k8s_kinds(
+    kinds: Iterable[str],
+    k8s_version: str = "1.35.0",
+    base_dir: str = "",
+    api_version: Optional[str] = None,
+    shared_types: bool = False,
+    workers: int = 1,
+    from_cluster: bool = False,
+    context: Optional[str] = None,
+    max_depth: Optional[int] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    Render and write schemas for several native kinds from one loaded spec.
+
+    Resolved definitions and rendered shared types are reused across the
+    kinds handled by each process. With workers > 1 kinds are rendered on a
+    process pool (workers <= 0 uses every available core); results come back
+    in input order. Shared type modules are merged and written once at the
+    end. With from_cluster, kinds are read from the group-version documents
+    the cluster serves instead. Schemas nested deeper than max_depth (default:
+    AMDF_MAX_SCHEMA_DEPTH) collapse to {str:any}. Yields (schema_path, content).
+    """
+    kinds = list(kinds)
+    if max_depth is None:
+        max_depth = config.max_schema_depth
+    tasks = [(kind, k8s_version, api_version, shared_types, from_cluster, context, max_depth) for kind in kinds]
+    
+    # Load (and index) the spec, or the cluster documents, once before any worker needs them
+    if from_cluster:
+        for kind in kinds:
+            find_cluster_definition_key(kind, api_version, context)
+    else:
+        load_k8s_definitions(k8s_version)
+    
+    shared_modules: Dict[str, Tuple[Set[str], Dict[str, str]]] = {}
+    init_kcl_module_if_needed(base_dir)
+    
+    for relative_path, content, modules in render_k8s_kinds(tasks, workers):
+        merge_shared_modules(shared_modules, modules)
+        yield write_schema(base_dir, relative_path, content), content
+    
+    if shared_modules:
+        write_shared_modules(base_dir, shared_modules)
@@ -0,0 +1,142 @@
+"""
+Multi-version Kubernetes schema generation
+Generates native kinds for several Kubernetes versions into version-scoped
+model directories, rendering each distinct definition closure only once, and
+reports which types changed between versions
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config import config
+from .generator import init_kcl_module_if_needed, write_schema
+from .k8s_generator import render_k8s_kinds
+from .k8s_source import find_k8s_definition_key, load_k8s_definitions
+from .openapi_cache import definition_closure
+
+# (k8s_version, definition key) -> hash of the definition's own content
+_definition_hashes: Dict[Tuple[str, str], str] = {}
+
+
+def version_dir(k8s_version: str) -> str:
+    """Model directory of a Kubernetes version: 1.31.0 -> v1_31_0"""
+    return "v" + k8s_version.replace(".", "_")
+
+
+def definition_hash(k8s_version: str, def_key: str) -> str:
+    """Content hash of one definition, equal across versions when the definition is unchanged"""
+    key = (k8s_version, def_key)
+    if key not in _definition_hashes:
+        canonical = json.dumps(load_k8s_definitions(k8s_version)[def_key], sort_keys=True, separators=(",", ":"))
+        _definition_hashes[key] = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return _definition_hashes[key]
+
+
+def closure_hashes(kind: str, k8s_version: str, api_version: Optional[str] = None) -> Tuple[str, Dict[str, str]]:
+    """Definition key of a kind and the content hash of every definition in its closure"""
+    def_key = find_k8s_definition_key(kind, k8s_version, api_version)
+    closure = definition_closure(load_k8s_definitions(k8s_version), def_key)
+    return def_key, {key: definition_hash(k8s_version, key) for key in sorted(closure)}
+
+
+def _version_path(relative_path: str, k8s_version: str) -> Path:
+    """library/models/k8s/apps_v1/x.k -> library/models/k8s/v1_31_0/apps_v1/x.k"""
+    parts = Path(relative_path).parts
+    return Path(*parts[:3], version_dir(k8s_version), *parts[3:])
+
+
+def iter_generate_k8s_matrix(
+    kinds: List[str],
+    versions: List[str],
+    base_dir: str = "",
+    api_version: Optional[str] = None,
+    workers: int = 1,
+    report: Optional[Dict[str, Any]] = None,
+    max_depth: Optional[int] = None,
+) -> Iterator[Tuple[str, str, str, str, bool]]:
+    """
+    Generate kinds for several Kubernetes versions into library/models/k8s/<vX_Y_Z>.
+
+    Every definition is hashed on its own, and a kind whose closure (the
+    hashes of all the definitions it uses) is the same as in an earlier
+    version is rendered once and its output reused. Reuse is per kind, as
+    a kind's module inlines the schemas of its whole closure. If report is given it is filled
+    with the per-version changes (see k8s_version_changes). Yields
+    (k8s_version, kind, schema_path, content, reused); kinds missing from a
+    version are skipped and listed in the report, which is also written to
+    library/models/k8s/version-changes.json.
+    """
+    if max_depth is None:
+        max_depth = config.max_schema_depth
+    plan = []  # (version, kind, render key or None)
+    tasks = {}
+    hashes: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for k8s_version in versions:
+        hashes[k8s_version] = {}
+        for kind in kinds:
+            try:
+                def_key, closure = closure_hashes(kind, k8s_version, api_version)
+            except ValueError:
+                plan.append((k8s_version, kind, None))
+                continue
+            hashes[k8s_version][kind] = closure
+            render_key = (kind, def_key, hashlib.sha256(json.dumps(closure).encode("utf-8")).hexdigest())
+            # Render each distinct closure once, from the first version that has it
+            tasks.setdefault(render_key, (kind, k8s_version, api_version, False, False, None, max_depth))
+            plan.append((k8s_version, kind, render_key))
+
+    changes = k8s_version_changes(hashes, versions, kinds)
+    if report is not None:
+        report.update(changes)
+
+    rendered = dict(zip(tasks, render_k8s_kinds(list(tasks.values()), workers)))
+    init_kcl_module_if_needed(base_dir)
+
+    seen = set()
+    for k8s_version, kind, render_key in plan:
+        if render_key is None:
+            continue
+        relative_path, content, _ = rendered[render_key]
+        path = write_schema(base_dir, _version_path(relative_path, k8s_version), content)
+        yield k8s_version, kind, path, content, render_key in seen
+        seen.add(render_key)
+
+    report_path = Path(base_dir) / "library" / "models" / "k8s" / "version-changes.json"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(changes, f, indent=2)
+
+
+def k8s_version_changes(
+    hashes: Dict[str, Dict[str, Dict[str, str]]], versions: List[str], kinds: List[str]
+) -> Dict[str, Any]:
+    """
+    Compare the definitions used by the generated kinds between consecutive versions.
+
+    hashes is {version: {kind: {definition key: content hash}}}. Returns
+    {"versions": [...], "missing": {version: [kinds]}, "changes":
+    [{"from", "to", "changed", "added", "removed"}]} with definition keys.
+    """
+    definitions = {
+        version: {key: h for closure in hashes[version].values() for key, h in closure.items()}
+        for version in versions
+    }
+    changes = []
+    for previous, current in zip(versions, versions[1:]):
+        before, after = definitions[previous], definitions[current]
+        changes.append({
+            "from": previous,
+            "to": current,
+            "changed": sorted(k for k in before.keys() & after.keys() if before[k] != after[k]),
+            "added": sorted(after.keys() - before.keys()),
+            "removed": sorted(before.keys() - after.keys()),
+        })
+    return {
+        "versions": versions,
+        "missing": {
+            version: [kind for kind in kinds if kind not in hashes[version]] for version in versions
+        },
+        "changes": changes,
+    }
@@ -1,10 +1,18 @@
 """
 Kubernetes native resource schema source using Kubernetes OpenAPI spec.
+The upstream spec of each version (from the offline schema store when it has
+the version), or the group-version documents a cluster serves, are loaded
+once per process and shared by every kind generated from them.
 """
 
-import json
-import urllib.request
-from typing import Dict, List
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .cluster_openapi import load_cluster_definition_table
+from .openapi_cache import DefinitionTable, build_definition_index, definition_closure, load_definition_table
+from .schema_store import import_definitions, open_store_definitions
 
 # Map common kinds to their API versions and full schema names
 resource_map = {
@@ -32,47 +40,183 @@ resource_map = {
 }
 
 
-def list_available_k8s_kinds() -> List[str]:
-    """Lists the native Kubernetes kinds available for schema generation."""
-    return sorted(list(resource_map.keys()))
+# Upstream specs by version, cluster documents by (context, group/version)
+_specs: Dict[object, DefinitionTable] = {}
+_specs_lock = threading.Lock()
+
+
+def k8s_spec_url(k8s_version: str) -> str:
+    return f"https://raw.githubusercontent.com/kubernetes/kubernetes/v{k8s_version}/api/openapi-spec/swagger.json"
+
+
+def load_k8s_definitions(k8s_version: str = "1.35.0") -> DefinitionTable:
+    """
+    Definitions of the Kubernetes OpenAPI spec for a version, loaded once per process.
+
+    Versions imported into the offline schema store are read from it without
+    any network access. Otherwise the spec comes from the on-disk cache when
+    possible. Definitions are parsed on first access, so later kinds reuse
+    everything already loaded.
+    """
+    with _specs_lock:
+        definitions = _specs.get(k8s_version)
+        if definitions is None:
+            try:
+                definitions = open_store_definitions(k8s_version)
+                if definitions is None:
+                    definitions = load_definition_table(k8s_spec_url(k8s_version), k8s_version)
+            except Exception as e:
+                raise RuntimeError(f"Failed to load Kubernetes OpenAPI spec for version {k8s_version}: {e}")
+            _specs[k8s_version] = definitions
+        return definitions
+
+
+def import_k8s_schemas(k8s_version: str, spec_file: Optional[str] = None, store: Optional[Path] = None) -> int:
+    """
+    Import a Kubernetes version into the offline schema store.
+
+    The definitions come from a local swagger.json when spec_file is given,
+    otherwise from the upstream spec (downloaded, or the cached copy).
+    Returns the number of definitions imported.
+    """
+    if spec_file:
+        spec_path = Path(spec_file).expanduser()
+        definitions = DefinitionTable(spec_path, build_definition_index(spec_path))
+        source = str(spec_path)
+    else:
+        url = k8s_spec_url(k8s_version)
+        definitions = load_definition_table(url, k8s_version)
+        source = url
+    count = import_definitions(definitions, k8s_version, source, store)
+    with _specs_lock:
+        _specs.pop(k8s_version, None)
+    return count
+
+
+def load_cluster_k8s_definitions(api_version: str, context: Optional[str] = None) -> DefinitionTable:
+    """Definitions of one group/version as served by a cluster's /openapi/v3, loaded once per process"""
+    with _specs_lock:
+        definitions = _specs.get((context, api_version))
+        if definitions is None:
+            try:
+                definitions = load_cluster_definition_table(api_version, context)
+            except ValueError:
+                raise
+            except Exception as e:
+                raise RuntimeError(f"Failed to load the cluster OpenAPI document for {api_version}: {e}")
+            _specs[(context, api_version)] = definitions
+        return definitions
+
+
+def cluster_api_version(kind: str, api_version: Optional[str] = None) -> str:
+    """Group/version to read a kind from in a cluster: the given one, else the common kind's"""
+    if api_version:
+        return api_version
+    if kind in resource_map:
+        return resource_map[kind][0]
+    raise ValueError(f"Kind '{kind}' is not a common kind, pass its apiVersion to read it from the cluster")
+
+
+def find_cluster_definition_key(
+    kind: str, api_version: Optional[str] = None, context: Optional[str] = None
+) -> Tuple[DefinitionTable, str]:
+    """Definitions of the kind's group/version in the cluster and the kind's definition key"""
+    api_version = cluster_api_version(kind, api_version)
+    definitions = load_cluster_k8s_definitions(api_version, context)
+    group, _, version = api_version.rpartition("/")
+    key = definitions.gvk.get((group, version, kind))
+    if not key:
+        raise ValueError(f"Kind '{kind}' with apiVersion '{api_version}' is not served by the cluster")
+    return definitions, key
+
+
+def definition_api_version(definition: Dict, def_key: str, kind: str, api_version: Optional[str] = None) -> str:
+    """
+    apiVersion of a kind, from its definition's x-kubernetes-group-version-kind.
+
+    The entry for the requested apiVersion wins, then the one for the kind.
+    Definitions without one (e.g. ObjectMeta) fall back to the group and
+    version in their key: io.k8s.apimachinery.pkg.apis.meta.v1.X -> meta/v1.
+    """
+    entries = [
+        entry for entry in definition.get("x-kubernetes-group-version-kind") or []
+        if entry.get("kind") == kind
+    ]
+    for entry in entries:
+        entry_api_version = f"{entry['group']}/{entry['version']}" if entry.get("group") else entry["version"]
+        if not api_version or entry_api_version == api_version:
+            return entry_api_version
+    if api_version:
+        return api_version
+
+    package = def_key.split(".")[:-1]
+    if len(package) >= 2 and re.fullmatch(r"v\d+\w*", package[-1]):
+        group = package[-2]
+        return package[-1] if group == "core" else f"{group}/{package[-1]}"
+    return "v1"
+
+
+def find_k8s_definition_key(kind: str, k8s_version: str = "1.35.0", api_version: Optional[str] = None) -> str:
+    """Definition key of a kind, e.g. Deployment -> io.k8s.api.apps.v1.Deployment"""
+    definitions = load_k8s_definitions(k8s_version)
+
+    if api_version:
+        group, _, version = api_version.rpartition("/")
+        key = definitions.gvk.get((group, version, kind))
+        if key:
+            return key
+        raise ValueError(f"Kind '{kind}' with apiVersion '{api_version}' not found in Kubernetes v{k8s_version}")
+
+    if kind in resource_map:
+        return resource_map[kind][1]
+
+    # Kinds served by several groups resolve to the first one in the spec,
+    # pass an apiVersion to choose another
+    candidates = definitions.kinds.get(kind)
+    if candidates:
+        return candidates[0]
+
+    # Types without a group/version/kind (e.g. ObjectMeta)
+    for key in definitions:
+        if key.endswith(f".{kind}"):
+            return key
+
+    raise ValueError(f"Kind '{kind}' not found in Kubernetes v{k8s_version}")
+
+
+def list_available_k8s_kinds(k8s_version: Optional[str] = None) -> List[str]:
+    """
+    Lists the native Kubernetes kinds available for schema generation.
+
+    Without a version, the common kinds are returned without loading any
+    spec; with a version, every kind in that version's spec.
+    """
+    if not k8s_version:
+        return sorted(resource_map.keys())
+    return sorted(load_k8s_definitions(k8s_version).kinds)
+
+
+def list_k8s_resource_kinds(k8s_version: str = "1.35.0") -> List[str]:
+    """Every resource kind in a version's spec, without List kinds and apimachinery meta types"""
+    definitions = load_k8s_definitions(k8s_version)
+    return sorted(
+        kind for kind, keys in definitions.kinds.items()
+        if not kind.endswith("List") and not keys[0].startswith("io.k8s.apimachinery.")
+    )
 
 
 def get_k8s_native_schema(kind: str, k8s_version: str = "1.35.0") -> Dict:
     """
-    Get OpenAPI schema for a Kubernetes native resource from kubernetes-json-schema.
+    Get OpenAPI schema for a Kubernetes native resource from the Kubernetes OpenAPI spec.
 
     Args:
         kind: Resource kind (e.g., "Deployment", "Pod", "Service")
         k8s_version: Kubernetes version (default: "1.35.0")
 
     Returns:
-        OpenAPI v3 schema dict compatible with KCLSchemaGenerator
+        OpenAPI v3 schema dict compatible with KCLSchemaGenerator, carrying
+        only the definitions the kind references
     """
-    # Map common kinds to their API versions and full schema names
-    resource_map = {
-        "Pod": ("v1", "io.k8s.api.core.v1.Pod"),
-        "Service": ("v1", "io.k8s.api.core.v1.Service"),
-        "ConfigMap": ("v1", "io.k8s.api.core.v1.ConfigMap"),
-        "Secret": ("v1", "io.k8s.api.core.v1.Secret"),
-        "Namespace": ("v1", "io.k8s.api.core.v1.Namespace"),
-        "PersistentVolume": ("v1", "io.k8s.api.core.v1.PersistentVolume"),
-        "PersistentVolumeClaim": ("v1", "io.k8s.api.core.v1.PersistentVolumeClaim"),
-        "ServiceAccount": ("v1", "io.k8s.api.core.v1.ServiceAccount"),
-        "Deployment": ("apps/v1", "io.k8s.api.apps.v1.Deployment"),
-        "StatefulSet": ("apps/v1", "io.k8s.api.apps.v1.StatefulSet"),
-        "DaemonSet": ("apps/v1", "io.k8s.api.apps.v1.DaemonSet"),
-        "ReplicaSet": ("apps/v1", "io.k8s.api.apps.v1.ReplicaSet"),
-        "Ingress": ("networking.k8s.io/v1", "io.k8s.api.networking.v1.Ingress"),
-        "NetworkPolicy": ("networking.k8s.io/v1", "io.k8s.api.networking.v1.NetworkPolicy"),
-        "Job": ("batch/v1", "io.k8s.api.batch.v1.Job"),
-        "CronJob": ("batch/v1", "io.k8s.api.batch.v1.CronJob"),
-        "HorizontalPodAutoscaler": ("autoscaling/v2", "io.k8s.api.autoscaling.v2.HorizontalPodAutoscaler"),
-        "Role": ("rbac.authorization.k8s.io/v1", "io.k8s.api.rbac.v1.Role"),
-        "RoleBinding": ("rbac.authorization.k8s.io/v1", "io.k8s.api.rbac.v1.RoleBinding"),
-        "ClusterRole": ("rbac.authorization.k8s.io/v1", "io.k8s.api.rbac.v1.ClusterRole"),
-        "ClusterRoleBinding": ("rbac.authorization.k8s.io/v1", "io.k8s.api.rbac.v1.ClusterRoleBinding"),
-    }
-
     if kind not in resource_map:
         raise ValueError(
             f"Unknown Kubernetes resource kind: {kind}. "
@@ -80,24 +224,9 @@ def get_k8s_native_schema(kind: str, k8s_version: str = "1.35.0") -> Dict:
         )
 
     api_version, schema_name = resource_map[kind]
+    definitions = load_k8s_definitions(k8s_version)
 
-    # Fetch all definitions from kubernetes-json-schema
-    # This file contains ALL Kubernetes type definitions with $ref resolved
-    definitions_url = f"https://raw.githubusercontent.com/yannh/kubernetes-json-schema/master/v{k8s_version}/_definitions.json"
-
-    try:
-        with urllib.request.urlopen(definitions_url) as response:
-            all_definitions = json.loads(response.read())
-    except Exception as e:
-        raise RuntimeError(
-            f"Failed to fetch Kubernetes definitions for version {k8s_version}: {e}. "
-            f"Available versions: https://github.com/yannh/kubernetes-json-schema"
-        )
-
-    # Get all definitions
-    definitions = all_definitions.get("definitions", {})
-
-    # Get the specific schema for this resource
+    # Get the specific schema for this resource (parsed on demand)
     schema = definitions.get(schema_name)
     if not schema:
         raise ValueError(
@@ -105,12 +234,12 @@ def get_k8s_native_schema(kind: str, k8s_version: str = "1.35.0") -> Dict:
         )
 
     # Transform to CRD-like structure for compatibility with existing generator
-    # Include ALL definitions so nested types can be resolved
+    # Include the definitions it references so nested types can be resolved
     group, version = api_version.split("/") if "/" in api_version else ("", api_version)
 
-    schema_with_all_definitions = {
+    schema_with_definitions = {
         **schema,
-        "definitions": definitions  # Include all K8s definitions
+        "definitions": definition_closure(definitions, schema_name)
     }
 
     crd_like_schema = {
@@ -125,10 +254,10 @@ def get_k8s_native_schema(kind: str, k8s_version: str = "1.35.0") -> Dict:
                 "served": True,
                 "storage": True,
                 "schema": {
-                    "openAPIV3Schema": schema_with_all_definitions
+                    "openAPIV3Schema": schema_with_definitions
                 }
             }]
         }
     }
 
-    return crd_like_schema
\ No newline at end of file
+    return crd_like_schema
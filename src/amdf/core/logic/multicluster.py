@@ -0,0 +1,138 @@
+"""
+Multi-cluster CRD discovery
+Runs listing and fetching concurrently across kubeconfig contexts and
+deduplicates CRDs that are identical in several clusters
+"""
+
+import hashlib
+import json
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from ..config import config
+from ..exceptions import KubeconfigError
+from ..kube_client import list_contexts
+from ..models import CRDInfo
+from .generator import fetch_crds, list_crd_infos
+
+
+def resolve_contexts(contexts: Optional[List[str]] = None, all_contexts: bool = False) -> List[Optional[str]]:
+    """Return the contexts to query; None stands for the current context"""
+    if not all_contexts:
+        return list(dict.fromkeys(contexts)) if contexts else [None]
+
+    try:
+        return list_contexts()
+    except KubeconfigError:
+        pass
+    try:
+        result = subprocess.run(
+            ["kubectl", "config", "get-contexts", "-o", "name"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"Could not list kubeconfig contexts: {e}")
+    return sorted(line.strip() for line in result.stdout.splitlines() if line.strip())
+
+
+def crd_content_hash(crd: Dict) -> str:
+    """Hash of a CRD spec, identical for the same CRD installed in different clusters"""
+    canonical = json.dumps(crd["spec"], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def context_error(context: Optional[str], error: Exception) -> str:
+    """Error message naming the context it came from"""
+    return f"Context '{context or 'current'}': {error}"
+
+
+def _fan_out(
+    function, contexts: List[Optional[str]], workers: Optional[int] = None
+) -> Tuple[Dict, Dict[Optional[str], str]]:
+    """
+    Run function(context) for every context on a bounded thread pool.
+
+    Returns ({context: result}, {context: error message}): a failing cluster
+    does not stop the others, unless every context fails.
+    """
+    def run(context):
+        try:
+            return function(context), None
+        except Exception as e:
+            return None, context_error(context, e)
+
+    workers = max(1, min(workers or config.fanout_workers, len(contexts)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = list(executor.map(run, contexts))
+
+    results = {context: result for context, (result, error) in zip(contexts, outcomes) if error is None}
+    errors = {context: error for context, (_, error) in zip(contexts, outcomes) if error is not None}
+    if not results:
+        raise RuntimeError("; ".join(errors.values()))
+    return results, errors
+
+
+def list_crds_across(
+    contexts: List[Optional[str]],
+    filter_text: Optional[str] = None,
+    refresh: bool = False,
+    workers: Optional[int] = None,
+) -> Tuple[List[CRDInfo], Dict[str, Dict[Optional[str], bool]], Dict[Optional[str], str]]:
+    """
+    List CRDs in several clusters concurrently.
+
+    Returns the CRDInfo records (one per CRD name, from the first context
+    that has it), a presence matrix {crd_name: {context: present}} and the
+    errors of the contexts that could not be listed {context: message}.
+    """
+    per_context, errors = _fan_out(
+        lambda context: list_crd_infos(context, filter_text, refresh=refresh), contexts, workers
+    )
+
+    infos: Dict[str, CRDInfo] = {}
+    presence: Dict[str, Dict[Optional[str], bool]] = {}
+    for context in contexts:
+        for info in per_context.get(context, []):
+            infos.setdefault(info.name, info)
+            presence.setdefault(info.name, {c: False for c in contexts})[context] = True
+
+    return (
+        [infos[name] for name in sorted(infos)],
+        {name: presence[name] for name in sorted(presence)},
+        errors,
+    )
+
+
+def fetch_crds_across(
+    patterns: Optional[List[str]],
+    contexts: List[Optional[str]],
+    workers: Optional[int] = None,
+) -> Tuple[List[Dict], Dict[str, Dict[Optional[str], Optional[str]]], Dict[Optional[str], str]]:
+    """
+    Fetch matching CRDs from several clusters concurrently.
+
+    CRDs with identical specs are kept once, so each unique schema is rendered
+    a single time. When a CRD differs between clusters, the variant from the
+    earliest context in the list is returned. Also returns a presence matrix
+    {crd_name: {context: content hash or None}} that exposes such drift, and
+    the errors of the contexts that could not be reached {context: message}.
+    """
+    per_context, errors = _fan_out(lambda context: fetch_crds(patterns, context=context), contexts, workers)
+
+    unique: Dict[str, Dict] = {}
+    presence: Dict[str, Dict[Optional[str], Optional[str]]] = {}
+    for context in contexts:
+        for crd in per_context.get(context, []):
+            name = crd["metadata"]["name"]
+            content_hash = crd_content_hash(crd)
+            presence.setdefault(name, {c: None for c in contexts})[context] = content_hash
+            unique.setdefault(name, crd)
+
+    return (
+        [unique[name] for name in sorted(unique)],
+        {name: presence[name] for name in sorted(presence)},
+        errors,
+    )
@@ -0,0 +1,230 @@
+"""
+Kubernetes OpenAPI download cache
+Keeps downloaded specs under ~/.amdf/openapi/<k8s_version>, revalidates them
+with ETag / Last-Modified conditional requests and falls back to the cached
+copy when offline. Definitions are read from disk one at a time, so only the
+ones a kind actually needs are ever parsed
+"""
+
+import json
+import os
+import re
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..cache import cache_dir, cache_key, load_json, load_pickle, store_json, store_pickle, write_atomic_stream
+from ..config import config
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def _entry_paths(url: str, k8s_version: str):
+    directory = cache_dir("openapi", k8s_version)
+    key = cache_key(url)
+    return directory / f"{key}.json", directory / f"{key}.meta.json"
+
+
+def _index_path(url: str, k8s_version: str) -> Path:
+    return cache_dir("openapi", k8s_version) / f"{cache_key(url)}.index.pickle"
+
+
+def _conditional_get(url: str, meta: Dict[str, Any]) -> Optional[urllib.request.addinfourl]:
+    """GET url with the cached validators; returns None when the server answers 304"""
+    request = urllib.request.Request(url)
+    if meta.get("etag"):
+        request.add_header("If-None-Match", meta["etag"])
+    if meta.get("last_modified"):
+        request.add_header("If-Modified-Since", meta["last_modified"])
+    try:
+        return urllib.request.urlopen(request, timeout=config.openapi_timeout)
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+
+
+def fetch_openapi_spec(url: str, k8s_version: str, refresh: bool = False) -> Path:
+    """
+    Make sure an up to date copy of the spec at url is cached, and return its path.
+
+    A cached spec younger than AMDF_OPENAPI_TTL seconds is used without any
+    network access. Older entries are revalidated with a conditional
+    request, so unchanged specs are not downloaded again, and are still used
+    if the network is unavailable. Downloads are streamed straight to disk.
+    """
+    spec_path, meta_path = _entry_paths(url, k8s_version)
+    meta = load_json(meta_path) if spec_path.exists() else None
+    meta = meta or {}
+
+    if meta and not refresh and time.time() - meta.get("checked_at", 0) < config.openapi_ttl:
+        return spec_path
+
+    try:
+        response = _conditional_get(url, meta)
+    except (urllib.error.URLError, OSError) as e:
+        if meta:
+            if config.verbose:
+                print(f"💾 Offline, using cached OpenAPI spec for {k8s_version}: {e}")
+            return spec_path
+        raise
+
+    if response is None:
+        # 304 Not Modified
+        meta["checked_at"] = time.time()
+        store_json(meta_path, meta)
+        return spec_path
+
+    with response:
+        write_atomic_stream(spec_path, response)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        }
+    store_json(meta_path, meta)
+    # The definition index belongs to the previous download
+    try:
+        os.unlink(_index_path(url, k8s_version))
+    except OSError:
+        pass
+    return spec_path
+
+
+def _open_object(text: str, index: int) -> int:
+    """Position just inside the JSON object starting at index"""
+    index = _WHITESPACE.match(text, index).end()
+    if text[index] != "{":
+        raise ValueError(f"Expected an object at offset {index}")
+    return index + 1
+
+
+def _next_member(text: str, index: int, decoder: json.JSONDecoder) -> Optional[Tuple[str, int]]:
+    """Key and value offset of the next object member after index, or None at the end of the object"""
+    index = _WHITESPACE.match(text, index).end()
+    if text[index] == ",":
+        index = _WHITESPACE.match(text, index + 1).end()
+    if text[index] == "}":
+        return None
+    key, index = decoder.raw_decode(text, index)
+    index = _WHITESPACE.match(text, index).end()
+    if text[index] != ":":
+        raise ValueError(f"Expected ':' at offset {index}")
+    return key, _WHITESPACE.match(text, index + 1).end()
+
+
+def _index_definitions(items: Iterable[Tuple[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """Group/version/kind index of (definition key, definition) pairs, in spec order"""
+    gvk_index: Dict[Tuple[str, str, str], str] = {}
+    kinds: Dict[str, List[str]] = {}
+    for key, definition in items:
+        for gvk in definition.get("x-kubernetes-group-version-kind") or []:
+            gvk_index.setdefault((gvk.get("group", ""), gvk["version"], gvk["kind"]), key)
+            candidates = kinds.setdefault(gvk["kind"], [])
+            if key not in candidates:
+                candidates.append(key)
+    return {"gvk": gvk_index, "kinds": kinds}
+
+
+def build_definition_index(spec_path: Path) -> Dict[str, Any]:
+    """
+    Scan a spec once and record where each definition lives in the file.
+
+    Returns {"offsets": {definition_key: (start, end)}, "gvk": {(group,
+    version, kind): definition_key}, "kinds": {kind: [definition_key, ...]}}.
+    The file is decoded as latin-1 so character offsets are byte offsets,
+    and each definition is parsed, indexed and released before the next one.
+    """
+    with open(spec_path, "r", encoding="latin-1") as f:
+        text = f.read()
+    decoder = json.JSONDecoder()
+    offsets: Dict[str, Tuple[int, int]] = {}
+
+    def definitions() -> Iterator[Tuple[str, Dict[str, Any]]]:
+        index = _open_object(text, 0)
+        while (member := _next_member(text, index, decoder)):
+            key, start = member
+            if key == "definitions":
+                index = _open_object(text, start)
+                while (member := _next_member(text, index, decoder)):
+                    definition_key, start = member
+                    definition, index = decoder.raw_decode(text, start)
+                    offsets[definition_key] = (start, index)
+                    yield definition_key, definition
+                return
+            _, index = decoder.raw_decode(text, start)
+
+    index = _index_definitions(definitions())
+    index["offsets"] = offsets
+    return index
+
+
+class DefinitionTable(Mapping):
+    """Definitions of a cached spec, each parsed from disk on first access"""
+
+    def __init__(self, spec_path: Path, index: Dict[str, Any]):
+        self.spec_path = spec_path
+        self.gvk = index["gvk"]
+        self.kinds = index["kinds"]
+        self._offsets = index["offsets"]
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        definition = self._loaded.get(key)
+        if definition is None:
+            start, end = self._offsets[key]
+            with open(self.spec_path, "rb") as f:
+                f.seek(start)
+                definition = json.loads(f.read(end - start))
+            self._loaded[key] = definition
+        return definition
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+def open_definition_table(spec_path: Path, index_path: Path) -> DefinitionTable:
+    """Definitions of a cached spec file, using (or building and storing) its index"""
+    index = load_pickle(index_path)
+    if not isinstance(index, dict) or "offsets" not in index:
+        index = build_definition_index(spec_path)
+        store_pickle(index_path, index)
+    return DefinitionTable(spec_path, index)
+
+
+def load_definition_table(url: str, k8s_version: str, refresh: bool = False) -> DefinitionTable:
+    """Return the definitions of the spec at url, downloading and indexing it when needed"""
+    spec_path = fetch_openapi_spec(url, k8s_version, refresh=refresh)
+    return open_definition_table(spec_path, _index_path(url, k8s_version))
+
+
+def _iter_refs(node: Any) -> Iterator[str]:
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            yield ref
+        for value in node.values():
+            yield from _iter_refs(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _iter_refs(value)
+
+
+def definition_closure(definitions: Mapping, key: str) -> Dict[str, Dict[str, Any]]:
+    """The definition at key and every definition it references, transitively"""
+    closure: Dict[str, Dict[str, Any]] = {}
+    pending = [key]
+    while pending:
+        current = pending.pop()
+        if current in closure or current not in definitions:
+            continue
+        closure[current] = definitions[current]
+        pending.extend(ref.rsplit("/", 1)[-1] for ref in _iter_refs(closure[current]))
+    return closure
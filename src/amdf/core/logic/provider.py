@@ -0,0 +1,149 @@
+"""
+Provider-scale generation
+Generates every CRD of a provider, selected by API group suffix (e.g.
+aws.upbound.io), as one batched pipeline: the CRDs are fetched with a single
+list call, schemas and blueprints are rendered together in a process pool and
+the main process only writes files, initializing kcl.mod once
+"""
+
+import os
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import config
+from ..models import GenerationResult
+from .blueprint import generate_blueprint_from_schema
+from .crd_files import iter_crds_from_files
+from .generator import (
+    fetch_crds,
+    init_kcl_module_if_needed,
+    plan_common_modules,
+    render_crd,
+    render_crds,
+    write_common_modules,
+    write_schema,
+)
+
+
+def provider_patterns(group_suffix: str) -> List[str]:
+    """CRD name patterns of a provider: aws.upbound.io -> ['*.aws.upbound.io']"""
+    suffix = group_suffix.strip().strip(".")
+    if not suffix:
+        raise ValueError("A provider group suffix is required, e.g. aws.upbound.io")
+    return [f"*.{suffix}"]
+
+
+def render_provider_crd(
+    crd_json: Dict[str, Any],
+    dedupe: bool = False,
+    common_types: Optional[Dict[str, str]] = None,
+    max_depth: Optional[int] = None,
+    base_dir: str = "",
+    with_blueprint: bool = True,
+) -> Tuple[str, str, Optional[Tuple[str, str]]]:
+    """
+    Render one CRD's schema and blueprint without writing anything.
+
+    Returns (relative_path, content, (main_schema_name, blueprint_code)); the
+    blueprint is None when it is not requested or cannot be derived.
+    """
+    relative_path, content = render_crd(crd_json, dedupe, common_types, max_depth)
+    blueprint = None
+    if with_blueprint:
+        blueprint_code, blueprint_name, main_schema_name = generate_blueprint_from_schema(
+            content, Path(base_dir) / relative_path
+        )
+        if blueprint_name:
+            blueprint = (main_schema_name, blueprint_code)
+    return relative_path, content, blueprint
+
+
+def _write_blueprint(base_dir: str, main_schema_name: str, blueprint_code: str) -> Path:
+    blueprint_path = Path(base_dir) / "library" / "blueprints" / f"{main_schema_name}.k"
+    with open(blueprint_path, "w", encoding="utf-8") as f:
+        f.write(blueprint_code)
+    return blueprint_path
+
+
+def iter_generate_provider(
+    group_suffix: str,
+    base_dir: str = "",
+    context: Optional[str] = None,
+    from_files: Optional[Iterable[str]] = None,
+    workers: int = 0,
+    with_blueprint: bool = True,
+    dedupe: bool = False,
+    common_types: bool = False,
+    max_depth: Optional[int] = None,
+    report: Optional[Dict[str, Any]] = None,
+) -> Iterator[GenerationResult]:
+    """
+    Generate schemas and blueprints for every CRD of a provider.
+
+    CRDs are read from the cluster with one list call (reusing the CRD
+    cache) or streamed from files. Rendering of both schema and blueprint is
+    fanned out to a process pool (workers <= 0 uses every core) and results
+    are written in input order by the calling process. Schemas nested deeper
+    than max_depth (default: AMDF_MAX_SCHEMA_DEPTH) collapse to {str:any}. If report is given it
+    is filled with the counts and timings of the run: crds, blueprints,
+    fetch_seconds (the cluster list call; files are streamed while
+    rendering), total_seconds and crds_per_second.
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    if max_depth is None:
+        max_depth = config.max_schema_depth
+
+    started = time.perf_counter()
+    patterns = provider_patterns(group_suffix)
+    if from_files:
+        crds = iter_crds_from_files(from_files, patterns)
+    else:
+        crds = fetch_crds(patterns, context=context)
+    fetched = time.perf_counter()
+
+    common_names, common_blocks = None, {}
+    if common_types:
+        crds = list(crds)
+        common_names, common_blocks = plan_common_modules(crds, base_dir, max_depth=max_depth)
+
+    render = partial(render_provider_crd, base_dir=base_dir, with_blueprint=with_blueprint)
+    count = blueprints = 0
+    for relative_path, content, blueprint in render_crds(
+        crds, workers, dedupe, common_names, render=render, max_depth=max_depth
+    ):
+        if not count:
+            # Once per run, not once per CRD
+            init_kcl_module_if_needed(base_dir)
+            if with_blueprint:
+                (Path(base_dir) / "library" / "blueprints").mkdir(parents=True, exist_ok=True)
+        schema_path = write_schema(base_dir, relative_path, content)
+        blueprint_path = None
+        if blueprint:
+            blueprint_path = str(_write_blueprint(base_dir, *blueprint))
+            blueprints += 1
+        count += 1
+        yield GenerationResult(
+            schema_path=str(schema_path),
+            blueprint_path=blueprint_path,
+            content=content,
+            success=blueprint is not None or not with_blueprint,
+            error=None if blueprint or not with_blueprint else "Blueprint generation failed",
+        )
+
+    if common_blocks:
+        write_common_modules(base_dir, common_blocks)
+
+    if report is not None:
+        total = time.perf_counter() - started
+        report.update({
+            "group_suffix": patterns[0][2:],
+            "crds": count,
+            "blueprints": blueprints,
+            "workers": workers,
+            "fetch_seconds": fetched - started,
+            "total_seconds": total,
+            "crds_per_second": count / total if total > 0 else 0.0,
+        })
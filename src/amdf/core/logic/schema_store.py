@@ -0,0 +1,232 @@
+"""
+Offline Kubernetes schema store
+A SQLite file holding the definitions of several Kubernetes versions, one
+compressed row per definition plus a group/version/kind index, so native
+kinds can be generated without network access. Looking up a kind only
+decompresses the definitions it needs
+"""
+
+import json
+import os
+import sqlite3
+import time
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import config
+
+# Store shipped inside the package, used after the user's own store
+BUNDLED_STORE = Path(__file__).resolve().parent.parent.parent / "data" / "k8s-schemas.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    version TEXT PRIMARY KEY,
+    source TEXT,
+    imported_at REAL,
+    definitions INTEGER
+);
+CREATE TABLE IF NOT EXISTS definitions (
+    version TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    key TEXT NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (version, key)
+);
+CREATE TABLE IF NOT EXISTS kinds (
+    version TEXT NOT NULL,
+    grp TEXT NOT NULL,
+    ver TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS kinds_version ON kinds (version, position);
+"""
+
+
+def user_store_path() -> Path:
+    """The user's schema store: AMDF_SCHEMA_STORE, or schemas.sqlite in the AMDF cache"""
+    if config.schema_store:
+        return Path(config.schema_store).expanduser()
+    return Path(config.cache_dir).expanduser() / "schemas.sqlite"
+
+
+def store_paths() -> List[Path]:
+    """Stores to look versions up in, in order of preference"""
+    return [path for path in (user_store_path(), BUNDLED_STORE) if path.is_file()]
+
+
+def _connect(path: Path, writable: bool = False) -> sqlite3.Connection:
+    if writable:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path)
+        connection.executescript(_SCHEMA)
+        return connection
+    return sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+class StoreDefinitionTable(Mapping):
+    """
+    Definitions of one Kubernetes version in a schema store.
+
+    Exposes the same gvk / kinds indexes as the OpenAPI DefinitionTable;
+    each definition is decompressed and parsed on first access.
+    """
+
+    def __init__(self, path: Path, k8s_version: str):
+        self.path = path
+        self.k8s_version = k8s_version
+        self._connection = None
+        self._pid = None
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+
+        self.gvk: Dict[Tuple[str, str, str], str] = {}
+        self.kinds: Dict[str, List[str]] = {}
+        rows = self._execute(
+            "SELECT grp, ver, kind, key FROM kinds WHERE version = ? ORDER BY position, rowid",
+            (k8s_version,),
+        )
+        for group, version, kind, key in rows:
+            self.gvk.setdefault((group, version, kind), key)
+            candidates = self.kinds.setdefault(kind, [])
+            if key not in candidates:
+                candidates.append(key)
+
+    def _execute(self, query: str, parameters: Tuple = ()) -> sqlite3.Cursor:
+        # SQLite connections must not cross a fork, worker processes open their own
+        if self._pid != os.getpid():
+            self._connection = _connect(self.path)
+            self._pid = os.getpid()
+        return self._connection.execute(query, parameters)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        definition = self._loaded.get(key)
+        if definition is None:
+            row = self._execute(
+                "SELECT body FROM definitions WHERE version = ? AND key = ?", (self.k8s_version, key)
+            ).fetchone()
+            if row is None:
+                raise KeyError(key)
+            definition = json.loads(zlib.decompress(row[0]))
+            self._loaded[key] = definition
+        return definition
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._loaded:
+            return True
+        return self._execute(
+            "SELECT 1 FROM definitions WHERE version = ? AND key = ?", (self.k8s_version, key)
+        ).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._execute(
+            "SELECT key FROM definitions WHERE version = ? ORDER BY position", (self.k8s_version,)
+        ).fetchall()
+        return (key for key, in rows)
+
+    def __len__(self) -> int:
+        return self._execute(
+            "SELECT COUNT(*) FROM definitions WHERE version = ?", (self.k8s_version,)
+        ).fetchone()[0]
+
+
+def _has_version(path: Path, k8s_version: str) -> bool:
+    try:
+        connection = _connect(path)
+        try:
+            return connection.execute(
+                "SELECT 1 FROM versions WHERE version = ?", (k8s_version,)
+            ).fetchone() is not None
+        finally:
+            connection.close()
+    except sqlite3.Error:
+        return False
+
+
+def open_store_definitions(k8s_version: str) -> Optional[StoreDefinitionTable]:
+    """Definitions of a version from the first schema store that has it, or None"""
+    for path in store_paths():
+        if _has_version(path, k8s_version):
+            return StoreDefinitionTable(path, k8s_version)
+    return None
+
+
+def import_definitions(
+    definitions: Mapping, k8s_version: str, source: str, path: Optional[Path] = None
+) -> int:
+    """
+    Write the definitions of one Kubernetes version into a schema store,
+    replacing any previous copy of that version. Returns the number of definitions.
+    """
+    path = path or user_store_path()
+    connection = _connect(path, writable=True)
+    try:
+        with connection:
+            for table in ("versions", "definitions", "kinds"):
+                connection.execute(f"DELETE FROM {table} WHERE version = ?", (k8s_version,))
+            count = 0
+            for position, key in enumerate(definitions):
+                definition = definitions[key]
+                body = zlib.compress(json.dumps(definition, separators=(",", ":")).encode("utf-8"), 9)
+                connection.execute(
+                    "INSERT INTO definitions (version, position, key, body) VALUES (?, ?, ?, ?)",
+                    (k8s_version, position, key, body),
+                )
+                connection.executemany(
+                    "INSERT INTO kinds (version, grp, ver, kind, key, position) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (k8s_version, gvk.get("group", ""), gvk["version"], gvk["kind"], key, position)
+                        for gvk in definition.get("x-kubernetes-group-version-kind") or []
+                    ],
+                )
+                count += 1
+            connection.execute(
+                "INSERT INTO versions (version, source, imported_at, definitions) VALUES (?, ?, ?, ?)",
+                (k8s_version, source, time.time(), count),
+            )
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+    return count
+
+
+def import_store(source_path: Path, path: Optional[Path] = None) -> List[str]:
+    """Copy every version of another schema store into a store; returns the versions imported"""
+    path = path or user_store_path()
+    imported = []
+    for k8s_version, source in list_store_versions(source_path):
+        import_definitions(StoreDefinitionTable(source_path, k8s_version), k8s_version, source, path)
+        imported.append(k8s_version)
+    return imported
+
+
+def list_store_versions(path: Path) -> Iterable[Tuple[str, str]]:
+    """(version, source) pairs held by a store"""
+    connection = _connect(path)
+    try:
+        return connection.execute("SELECT version, source FROM versions ORDER BY version").fetchall()
+    finally:
+        connection.close()
+
+
+def store_summary() -> List[Dict[str, Any]]:
+    """Versions available offline, from every store, with where they live"""
+    summary = []
+    for path in store_paths():
+        connection = _connect(path)
+        try:
+            for version, source, imported_at, count in connection.execute(
+                "SELECT version, source, imported_at, definitions FROM versions ORDER BY version"
+            ):
+                summary.append({
+                    "version": version,
+                    "definitions": count,
+                    "source": source,
+                    "imported_at": imported_at,
+                    "store": str(path),
+                })
+        finally:
+            connection.close()
+    return summary
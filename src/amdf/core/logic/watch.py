@@ -0,0 +1,240 @@
+"""
+CRD watch mode
+Follows customresourcedefinitions over one long-lived watch connection and
+reports debounced batches of CRDs whose spec changed
+"""
+
+import fnmatch
+import json
+import queue
+import subprocess
+import threading
+import time
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from ..exceptions import KubeAPIError
+from ..kube_client import CRD_API_PATH, evict_kube_client, get_kube_client, trim_crd
+from .crd_cache import store_cached_crd
+
+# Reconnect delay after a watch failure
+_RETRY_SECONDS = 5
+
+
+def _matches(name: str, patterns: Optional[List[str]]) -> bool:
+    return not patterns or any(fnmatch.fnmatchcase(name, p) for p in patterns)
+
+
+def _kubectl_known_generations(context: Optional[str]) -> Dict[str, Any]:
+    command = ["kubectl"]
+    if context:
+        command.extend(["--context", context])
+    command.extend([
+        "get", "crd", "--no-headers",
+        "-o", "custom-columns=NAME:.metadata.name,GENERATION:.metadata.generation",
+    ])
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    known = {}
+    for line in result.stdout.splitlines():
+        columns = line.split()
+        if len(columns) == 2:
+            known[columns[0]] = int(columns[1]) if columns[1].isdigit() else columns[1]
+    return known
+
+
+def _kubectl_get_crd(context: Optional[str], name: str) -> Dict[str, Any]:
+    command = ["kubectl"]
+    if context:
+        command.extend(["--context", context])
+    command.extend(["get", "crd", name, "-o", "json"])
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def _resync(
+    known: Dict[str, Any],
+    current: Dict[str, Any],
+    listed: bool,
+    patterns: Optional[List[str]],
+    get_crd: Callable[[str], Dict[str, Any]],
+    events: "queue.Queue",
+) -> None:
+    """
+    Reconcile the known generations with a fresh listing. The first listing
+    seeds them; on later ones (after a reconnect) CRDs added, changed or
+    deleted while the watch was down are queued as events, and the consumer
+    updates known from those.
+    """
+    if not listed:
+        known.update(current)
+        return
+    for name, generation in current.items():
+        if known.get(name) != generation and _matches(name, patterns):
+            event_type = "MODIFIED" if name in known else "ADDED"
+            events.put(("event", {"type": event_type, "object": get_crd(name)}))
+    for name in set(known) - set(current):
+        if _matches(name, patterns):
+            events.put(("event", {"type": "DELETED", "object": {"metadata": {"name": name}}}))
+        else:
+            known.pop(name, None)
+
+
+def _kubectl_events(context: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """Watch with kubectl, which prints a stream of concatenated JSON events"""
+    command = ["kubectl"]
+    if context:
+        command.extend(["--context", context])
+    command.extend(["get", "crd", "--watch-only", "--output-watch-events", "-o", "json"])
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    decoder = json.JSONDecoder()
+    buffer = ""
+    try:
+        for line in process.stdout:
+            buffer += line
+            while buffer.strip():
+                try:
+                    event, end = decoder.raw_decode(buffer.lstrip())
+                except ValueError:
+                    break
+                buffer = buffer.lstrip()[end:]
+                yield event
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def _pump_events(
+    context: Optional[str],
+    patterns: Optional[List[str]],
+    events: "queue.Queue",
+    known: Dict[str, Any],
+) -> None:
+    """Feed watch events into a queue, reconnecting when the stream ends"""
+    client = get_kube_client(context)
+    resource_version = None
+    listed = False
+
+    while True:
+        try:
+            if client is None:
+                _resync(
+                    known, _kubectl_known_generations(context), listed, patterns,
+                    partial(_kubectl_get_crd, context), events,
+                )
+                listed = True
+                events.put(("ready", None))
+                for event in _kubectl_events(context):
+                    events.put(("event", event))
+                time.sleep(_RETRY_SECONDS)
+                continue
+
+            if resource_version is None:
+                # (Re)list metadata only: current generations and where to start watching
+                resource_version = client.list_resource_version(CRD_API_PATH)
+                current = {
+                    metadata["name"]: metadata.get("generation")
+                    for page in client.iter_crd_metadata()
+                    for metadata in page
+                }
+                _resync(known, current, listed, patterns, client.get_crd, events)
+                listed = True
+                events.put(("ready", None))
+
+            for event in client.watch(CRD_API_PATH, resource_version):
+                metadata = (event.get("object") or {}).get("metadata") or {}
+                if event.get("type") == "ERROR":
+                    # 410 Gone: our resourceVersion is too old, start over
+                    resource_version = None
+                    break
+                if metadata.get("resourceVersion"):
+                    resource_version = metadata["resourceVersion"]
+                if event.get("type") != "BOOKMARK":
+                    events.put(("event", event))
+        except KubeAPIError as e:
+            if e.status == 410:
+                # 410 Gone: our resourceVersion is too old to watch from, relist
+                resource_version = None
+                continue
+            if e.status == 401:
+                # Expired credentials (e.g. an exec plugin token): build a new client
+                evict_kube_client(context)
+                client = get_kube_client(context)
+            events.put(("error", e))
+            time.sleep(_RETRY_SECONDS)
+        except (subprocess.CalledProcessError, OSError) as e:
+            events.put(("error", e))
+            time.sleep(_RETRY_SECONDS)
+
+
+def iter_crd_changes(
+    patterns: Optional[List[str]] = None,
+    context: Optional[str] = None,
+    debounce: float = 2.0,
+    max_delay: float = 30.0,
+    on_error=None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Watch CRDs and yield batches of CRDs that were added or whose generation changed.
+
+    Bursts of events are debounced: a batch is emitted once no event arrived
+    for `debounce` seconds (or after `max_delay` seconds of continuous
+    activity), and several events for the same CRD are coalesced into its
+    latest state. Status-only updates do not bump metadata.generation and
+    are ignored. Runs until interrupted; on_error receives connection errors.
+    """
+    known: Dict[str, Any] = {}
+    events: "queue.Queue" = queue.Queue()
+    threading.Thread(
+        target=_pump_events, args=(context, patterns, events, known), daemon=True
+    ).start()
+
+    pending: Dict[str, Dict[str, Any]] = {}
+    first_pending = None
+    ready = False
+
+    while True:
+        timeout = None
+        if pending:
+            timeout = max(0.0, min(debounce, first_pending + max_delay - time.monotonic()))
+        try:
+            kind, payload = events.get(timeout=timeout)
+        except queue.Empty:
+            batch = [pending[name] for name in sorted(pending)]
+            pending.clear()
+            yield batch
+            continue
+
+        if kind == "error":
+            if on_error:
+                on_error(payload)
+            continue
+        if kind == "ready":
+            ready = True
+            continue
+        if not ready:
+            continue
+
+        event_type = payload.get("type")
+        crd = payload.get("object") or {}
+        name = crd.get("metadata", {}).get("name")
+        if not name or not _matches(name, patterns):
+            continue
+
+        if event_type == "DELETED":
+            known.pop(name, None)
+            pending.pop(name, None)
+            continue
+
+        generation = crd["metadata"].get("generation")
+        if name in known and known[name] == generation:
+            continue
+        known[name] = generation
+
+        crd = trim_crd(crd)
+        store_cached_crd(crd)
+        if not pending:
+            first_pending = time.monotonic()
+        pending[name] = crd
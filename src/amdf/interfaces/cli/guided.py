@@ -8,7 +8,7 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt
 
-from ...core.logic.generator import list_available_crds, KCLSchemaGenerator
+from ...core.logic.generator import iter_crd_pages, KCLSchemaGenerator
 from ...core.logic.blueprint import generate_blueprint_from_schema
 from pathlib import Path
 
@@ -34,9 +34,7 @@ async def _guided_workflow(ai_model: str = None):
         console.print(f"[dim]🔍 Searching CRDs{f' with: {crd_filter}' if crd_filter else ''}...[/dim]")
 
         # List CRDs
-        crds = list_available_crds(None)
-        if crd_filter:
-            crds = [crd for crd in crds if crd_filter.lower() in crd.lower()]
+        crds = [crd.name for page in iter_crd_pages(None, crd_filter or None) for crd in page]
         
         if not crds:
             console.print("[yellow]No CRDs found[/yellow]")
@@ -2,12 +2,21 @@
 AMDF CLI Main Entry Point
 """
 
+from typing import List
+
 import typer
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 
-from ...core.logic.generator import list_available_crds, KCLSchemaGenerator
+from ...core.config import config
+from ...core.logic.crd_cache import stats as crd_cache_stats
+from ...core.logic.crd_files import iter_crds_from_files
+from ...core.logic.generator import iter_crd_pages, fetch_crds, iter_generate_crds
 from ...core.logic.k8s_source import list_available_k8s_kinds
+from ...core.logic.multicluster import fetch_crds_across, list_crds_across, resolve_contexts
+from ...core.logic.provider import iter_generate_provider
+from ...core.logic.watch import iter_crd_changes
 from ...core.logic.blueprint import generate_blueprint_from_schema
 from pathlib import Path
 
@@ -16,33 +25,103 @@ app = typer.Typer(
     help="Agnostic Multi-cloud Delivery Framework",
     rich_markup_mode="rich"
 )
+schemas_app = typer.Typer(help="Offline store of native Kubernetes schemas")
+app.add_typer(schemas_app, name="schemas")
 console = Console()
 
 
+def _context_label(context):
+    return context or "current"
+
+
+def _print_context_errors(errors):
+    """Report the contexts that could not be queried"""
+    for message in errors.values():
+        console.print(f"[yellow]⚠️ Skipped: {message}[/yellow]")
+
+
+def _print_presence_matrix(presence, contexts, title="Cluster presence", errors=None):
+    """
+    Print a CRD x context table; cells show a short content hash when
+    available, and contexts that could not be queried are marked as failed
+    """
+    errors = errors or {}
+    table = Table(title=title)
+    table.add_column("CRD Name", style="cyan")
+    for context in contexts:
+        label = _context_label(context)
+        table.add_column(f"[red]{label} (failed)[/red]" if context in errors else label, justify="center")
+
+    drifted = 0
+    for name, cells in presence.items():
+        hashes = {value for value in cells.values() if isinstance(value, str)}
+        if len(hashes) > 1:
+            drifted += 1
+        row_style = "yellow" if len(hashes) > 1 else None
+        row = []
+        for context in contexts:
+            value = cells[context]
+            if context in errors:
+                row.append("[red]✗[/red]")
+            elif not value:
+                row.append("[dim]-[/dim]")
+            elif isinstance(value, str):
+                row.append(f"✓ {value[:8]}")
+            else:
+                row.append("✓")
+        table.add_row(name, *row, style=row_style)
+
+    console.print(table)
+    if drifted:
+        console.print(f"[yellow]⚠️ {drifted} CRD(s) differ between clusters (highlighted)[/yellow]")
+    _print_context_errors(errors)
+
+
 @app.command()
 def list_crds(
     filter_text: str = typer.Option(None, "--filter", "-f", help="Filter CRDs by text"),
-    context: str = typer.Option(None, "--context", "-c", help="Kubernetes context")
+    context: List[str] = typer.Option(
+        None, "--context", "-c", help="Kubernetes context (repeat for several clusters)"
+    ),
+    all_contexts: bool = typer.Option(False, "--all-contexts", help="Query every context in kubeconfig"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore the cached CRD listing")
 ):
     """List available CRDs in the cluster"""
     try:
-        crds = list_available_crds(context)
-        
-        if filter_text:
-            crds = [crd for crd in crds if filter_text.lower() in crd.lower()]
-        
-        if not crds:
-            console.print("[yellow]No CRDs found[/yellow]")
+        contexts = resolve_contexts(context, all_contexts)
+        if len(contexts) > 1:
+            console.print(f"[blue]Listing CRDs in {len(contexts)} clusters[/blue]")
+            crds, presence, errors = list_crds_across(contexts, filter_text, refresh=refresh)
+            if not crds:
+                _print_context_errors(errors)
+                console.print("[yellow]No CRDs found[/yellow]")
+                return
+            _print_presence_matrix(presence, contexts, title="Available CRDs", errors=errors)
+            reached = len(contexts) - len(errors)
+            console.print(f"\n[green]Found {len(crds)} CRDs in {reached} clusters[/green]")
             return
-        
+
         table = Table(title="Available CRDs")
         table.add_column("CRD Name", style="cyan")
-        
-        for crd in crds:
-            table.add_row(crd)
-        
-        console.print(table)
-        console.print(f"\n[green]Found {len(crds)} CRDs[/green]")
+        table.add_column("Kind", style="white")
+        table.add_column("Group", style="white")
+        table.add_column("Version", style="white")
+        table.add_column("Plural", style="dim")
+        table.add_column("Scope", style="dim")
+        count = 0
+
+        # Rows are added as each page arrives from the cluster
+        with Live(table, console=console, refresh_per_second=8):
+            for crds in iter_crd_pages(contexts[0], filter_text, refresh=refresh):
+                for crd in crds:
+                    table.add_row(crd.name, crd.kind, crd.group, crd.version, crd.plural, crd.scope)
+                count += len(crds)
+
+        if not count:
+            console.print("[yellow]No CRDs found[/yellow]")
+            return
+
+        console.print(f"\n[green]Found {count} CRDs[/green]")
         
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -51,11 +130,14 @@ def list_crds(
 
 @app.command()
 def list_k8s(
-    filter_text: str = typer.Option(None, "--filter", "-f", help="Filter Kubernetes kinds by text")
+    filter_text: str = typer.Option(None, "--filter", "-f", help="Filter Kubernetes kinds by text"),
+    k8s_version: str = typer.Option(
+        None, "--version", "-v", help="List every kind in this Kubernetes version's spec"
+    )
 ):
     """List available native Kubernetes kinds"""
     try:
-        kinds = list_available_k8s_kinds()
+        kinds = list_available_k8s_kinds(k8s_version)
         
         if filter_text:
             kinds = [kind for kind in kinds if filter_text.lower() in kind.lower()]
@@ -78,46 +160,251 @@ def list_k8s(
         raise typer.Exit(1)
 
 
+def _write_blueprint(schema_content: str, schema_path: str, output_dir: str, subdir: str = None):
+    """Generate and save the blueprint for a schema, returning its path or None"""
+    blueprint_code, bp_name, main_schema_name = generate_blueprint_from_schema(
+        schema_content, Path(schema_path)
+    )
+
+    if not bp_name:
+        return None
+
+    blueprint_dir = Path(output_dir) / "library" / "blueprints"
+    if subdir:
+        blueprint_dir = blueprint_dir / subdir
+    blueprint_dir.mkdir(parents=True, exist_ok=True)
+    blueprint_path = blueprint_dir / f"{main_schema_name}.k"
+
+    with open(blueprint_path, "w", encoding='utf-8') as f:
+        f.write(blueprint_code)
+
+    return blueprint_path
+
+
 @app.command()
 def generate(
-    crd_name: str = typer.Argument(..., help="Name of the CRD to generate schema for"),
+    crd_names: List[str] = typer.Argument(
+        None, help="CRD names or glob patterns (e.g. '*.ec2.aws.upbound.io')"
+    ),
+    all_crds: bool = typer.Option(False, "--all", help="Generate schemas for every CRD in the cluster"),
     output_dir: str = typer.Option(".", "--output", "-o", help="Output directory"),
-    context: str = typer.Option(None, "--context", "-c", help="Kubernetes context"),
-    with_blueprint: bool = typer.Option(True, "--blueprint/--no-blueprint", help="Generate blueprint")
+    context: List[str] = typer.Option(
+        None, "--context", "-c", help="Kubernetes context (repeat for several clusters)"
+    ),
+    all_contexts: bool = typer.Option(False, "--all-contexts", help="Fetch from every context in kubeconfig"),
+    with_blueprint: bool = typer.Option(True, "--blueprint/--no-blueprint", help="Generate blueprint"),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Render CRDs in parallel with N processes (0 = all cores)"
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-V", help="Show CRD cache hits and misses"),
+    from_file: List[str] = typer.Option(
+        None, "--from-file", "-F", help="Read CRDs/XRDs from YAML or JSON files or directories instead of a cluster"
+    ),
+    dedupe: bool = typer.Option(
+        False, "--dedupe", help="Emit structurally identical nested schemas once and reference them everywhere"
+    ),
+    common_types: bool = typer.Option(
+        False, "--common-types", help="Move schemas shared by several CRDs of a group into its common module"
+    ),
+    max_depth: int = typer.Option(
+        None, "--max-depth", help="Nesting levels rendered as schemas, deeper objects become {str:any} (0 = no limit)"
+    ),
 ):
-    """Generate KCL schema from CRD"""
+    """Generate KCL schemas from one or more CRDs"""
     try:
-        console.print(f"[blue]Generating schema for CRD: {crd_name}[/blue]")
-        
-        # Generate schema
-        generator = KCLSchemaGenerator(crd_name=crd_name, context=context)
-        schema_path, schema_content = generator.generate(base_dir=output_dir)
-        
-        console.print(f"[green]✅ Schema generated: {schema_path}[/green]")
-        
-        # Generate blueprint if requested
-        if with_blueprint:
-            console.print("[blue]Generating blueprint...[/blue]")
-            
-            blueprint_code, bp_name, main_schema_name = generate_blueprint_from_schema(
-                schema_content, Path(schema_path)
-            )
-            
-            if bp_name:
-                # Save blueprint
-                blueprint_dir = Path(output_dir) / "library" / "blueprints"
-                blueprint_dir.mkdir(parents=True, exist_ok=True)
-                blueprint_path = blueprint_dir / f"{main_schema_name}.k"
-                
-                with open(blueprint_path, "w", encoding='utf-8') as f:
-                    f.write(blueprint_code)
-                
-                console.print(f"[green]✅ Blueprint generated: {blueprint_path}[/green]")
+        if verbose:
+            config.verbose = True
+
+        if not crd_names and not all_crds and not from_file:
+            console.print("[red]Error: provide at least one CRD name or pattern, --all or --from-file[/red]")
+            raise typer.Exit(1)
+
+        patterns = None if all_crds else crd_names
+        if from_file:
+            # Offline: stream CRDs from local files, no cluster needed
+            console.print(f"[blue]Reading CRDs from {', '.join(from_file)}[/blue]")
+            crds = iter_crds_from_files(from_file, patterns)
+        else:
+            contexts = resolve_contexts(context, all_contexts)
+            if len(contexts) > 1:
+                # Fetch from every cluster concurrently, identical CRDs are kept once
+                console.print(f"[blue]Fetching CRDs from {len(contexts)} clusters[/blue]")
+                crds, presence, errors = fetch_crds_across(patterns, contexts)
+                if crds:
+                    _print_presence_matrix(presence, contexts, errors=errors)
+                else:
+                    _print_context_errors(errors)
             else:
-                console.print("[yellow]⚠️ Blueprint generation failed[/yellow]")
-        
+                # Fetch every matching CRD with a single list call
+                crds = fetch_crds(patterns, context=contexts[0])
+            console.print(f"[blue]Generating schemas for {len(crds)} CRD(s)[/blue]")
+
+        count = 0
+        for schema_path, schema_content in iter_generate_crds(
+            crds, base_dir=output_dir, workers=workers, dedupe=dedupe, common_types=common_types,
+            max_depth=max_depth,
+        ):
+            count += 1
+            console.print(f"[green]✅ Schema generated: {schema_path}[/green]")
+
+            # Generate blueprint if requested
+            if with_blueprint:
+                blueprint_path = _write_blueprint(schema_content, schema_path, output_dir)
+                if blueprint_path:
+                    console.print(f"[green]✅ Blueprint generated: {blueprint_path}[/green]")
+                else:
+                    console.print("[yellow]⚠️ Blueprint generation failed[/yellow]")
+
+        if not count:
+            console.print("[yellow]No CRDs found[/yellow]")
+            return
+
+        if config.verbose:
+            console.print(
+                f"[dim]CRD cache: {crd_cache_stats['hits']} hits, {crd_cache_stats['misses']} misses[/dim]"
+            )
+        if count > 1:
+            console.print(f"\n[green]Generated {count} CRDs[/green]")
         console.print("\n[green]🎉 Generation completed successfully![/green]")
-        
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@app.command()
+def watch(
+    crd_names: List[str] = typer.Argument(
+        None, help="CRD names or glob patterns to watch (default: every CRD)"
+    ),
+    output_dir: str = typer.Option(".", "--output", "-o", help="Output directory"),
+    context: str = typer.Option(None, "--context", "-c", help="Kubernetes context"),
+    with_blueprint: bool = typer.Option(True, "--blueprint/--no-blueprint", help="Generate blueprint"),
+    initial: bool = typer.Option(False, "--initial", help="Generate every matching CRD once before watching"),
+    debounce: float = typer.Option(2.0, "--debounce", help="Seconds of quiet before regenerating a burst of changes"),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Render CRDs in parallel with N processes (0 = all cores)"
+    ),
+    dedupe: bool = typer.Option(
+        False, "--dedupe", help="Emit structurally identical nested schemas once and reference them everywhere"
+    ),
+):
+    """Watch CRDs and regenerate schemas when they are added or changed"""
+
+    def _generate(crds):
+        for schema_path, schema_content in iter_generate_crds(
+            crds, base_dir=output_dir, workers=workers, dedupe=dedupe
+        ):
+            console.print(f"[green]✅ Schema generated: {schema_path}[/green]")
+            if with_blueprint:
+                blueprint_path = _write_blueprint(schema_content, schema_path, output_dir)
+                if blueprint_path:
+                    console.print(f"[green]✅ Blueprint generated: {blueprint_path}[/green]")
+
+    def _on_error(error):
+        console.print(f"[yellow]⚠️ Watch interrupted, reconnecting: {error}[/yellow]")
+
+    try:
+        if initial:
+            crds = fetch_crds(crd_names or None, context=context)
+            console.print(f"[blue]Generating schemas for {len(crds)} CRD(s)[/blue]")
+            _generate(crds)
+
+        console.print("[blue]Watching CRDs for changes (Ctrl+C to stop)[/blue]")
+        for batch in iter_crd_changes(crd_names or None, context, debounce=debounce, on_error=_on_error):
+            console.print(f"[blue]{len(batch)} CRD(s) changed: {', '.join(c['metadata']['name'] for c in batch)}[/blue]")
+            _generate(batch)
+
+    except KeyboardInterrupt:
+        console.print("\n[blue]Stopped watching[/blue]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@app.command()
+def generate_provider(
+    group_suffix: str = typer.Argument(..., help="API group suffix of the provider (e.g. 'aws.upbound.io')"),
+    output_dir: str = typer.Option(".", "--output", "-o", help="Output directory"),
+    context: str = typer.Option(None, "--context", "-c", help="Kubernetes context"),
+    from_file: List[str] = typer.Option(
+        None, "--from-file", "-F", help="Read CRDs from YAML or JSON files, directories or packages instead of a cluster"
+    ),
+    with_blueprint: bool = typer.Option(True, "--blueprint/--no-blueprint", help="Generate blueprints"),
+    workers: int = typer.Option(
+        0, "--workers", "-w", help="Render CRDs in parallel with N processes (0 = all cores)"
+    ),
+    dedupe: bool = typer.Option(
+        False, "--dedupe", help="Emit structurally identical nested schemas once and reference them everywhere"
+    ),
+    common_types: bool = typer.Option(
+        False, "--common-types", help="Move schemas shared by several CRDs of a group into its common module"
+    ),
+    max_depth: int = typer.Option(
+        None, "--max-depth", help="Nesting levels rendered as schemas, deeper objects become {str:any} (0 = no limit)"
+    ),
+    verbose: bool = typer.Option(False, "--verbose", "-V", help="List every generated file"),
+):
+    """Generate schemas and blueprints for every CRD of a provider in one batch"""
+    try:
+        if verbose:
+            config.verbose = True
+
+        source = ", ".join(from_file) if from_file else f"context {_context_label(context)}"
+        console.print(f"[blue]Generating provider {group_suffix} from {source}[/blue]")
+
+        report = {}
+        failed = []
+        count = 0
+        with console.status("[blue]Rendering...[/blue]") as status:
+            for result in iter_generate_provider(
+                group_suffix,
+                base_dir=output_dir,
+                context=context,
+                from_files=from_file,
+                workers=workers,
+                with_blueprint=with_blueprint,
+                dedupe=dedupe,
+                common_types=common_types,
+                max_depth=max_depth,
+                report=report,
+            ):
+                if not result.success:
+                    failed.append(result.schema_path)
+                if verbose:
+                    console.print(f"[green]✅ {result.schema_path}[/green]")
+                    if result.blueprint_path:
+                        console.print(f"[green]✅ {result.blueprint_path}[/green]")
+                count += 1
+                status.update(f"[blue]Rendering... {count} CRD(s) written[/blue]")
+
+        if not report.get("crds"):
+            console.print(f"[yellow]No CRDs found for *.{report.get('group_suffix', group_suffix)}[/yellow]")
+            return
+
+        for schema_path in failed:
+            console.print(f"[yellow]⚠️ Blueprint generation failed: {schema_path}[/yellow]")
+
+        table = Table(title=f"Provider {report['group_suffix']}")
+        table.add_column("CRDs", justify="right")
+        table.add_column("Blueprints", justify="right")
+        table.add_column("Workers", justify="right")
+        table.add_column("Fetch", justify="right")
+        table.add_column("Total", justify="right")
+        table.add_column("CRDs/s", justify="right", style="green")
+        table.add_row(
+            str(report["crds"]),
+            str(report["blueprints"]),
+            str(report["workers"]),
+            f"{report['fetch_seconds']:.2f}s",
+            f"{report['total_seconds']:.2f}s",
+            f"{report['crds_per_second']:.1f}",
+        )
+        console.print(table)
+        console.print("\n[green]🎉 Generation completed successfully![/green]")
+
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
@@ -126,10 +413,13 @@ def generate(
 @app.command()
 def list_k8s(
     filter_text: str = typer.Option(None, "--filter", "-f", help="Filter kinds by text"),
+    k8s_version: str = typer.Option(
+        None, "--version", "-v", help="List every kind in this Kubernetes version's spec"
+    ),
 ):
     """List available native Kubernetes kinds for schema generation"""
     try:
-        kinds = list_available_k8s_kinds()
+        kinds = list_available_k8s_kinds(k8s_version)
         
         if filter_text:
             kinds = [kind for kind in kinds if filter_text.lower() in kind.lower()]
@@ -152,48 +442,136 @@ def list_k8s(
         raise typer.Exit(1)
 
 
+def _generate_k8s_matrix(kinds, versions, output_dir, api_version, with_blueprint, workers, max_depth=None):
+    """Generate kinds for several Kubernetes versions and print what changed between them"""
+    from ...core.logic.k8s_matrix import iter_generate_k8s_matrix, version_dir
+    
+    console.print(
+        f"[blue]Generating {len(kinds)} Kubernetes kind(s) for versions {', '.join(versions)}[/blue]"
+    )
+    report = {}
+    count = reused = 0
+    for k8s_version, kind, schema_path, schema_content, was_reused in iter_generate_k8s_matrix(
+        kinds, versions, base_dir=output_dir, api_version=api_version, workers=workers, report=report,
+        max_depth=max_depth,
+    ):
+        count += 1
+        reused += was_reused
+        suffix = " (unchanged, reused)" if was_reused else ""
+        console.print(f"[green]✅ Schema generated: {schema_path}{suffix}[/green]")
+        if with_blueprint:
+            _write_blueprint(schema_content, schema_path, output_dir, subdir=version_dir(k8s_version))
+    
+    for k8s_version, missing in report["missing"].items():
+        if missing:
+            console.print(f"[yellow]⚠️ Not in Kubernetes {k8s_version}: {', '.join(missing)}[/yellow]")
+    
+    table = Table(title="Type changes between versions")
+    table.add_column("Versions", style="cyan")
+    table.add_column("Changed", justify="right")
+    table.add_column("Added", justify="right")
+    table.add_column("Removed", justify="right")
+    table.add_column("Changed types")
+    for change in report["changes"]:
+        table.add_row(
+            f"{change['from']} → {change['to']}",
+            str(len(change["changed"])),
+            str(len(change["added"])),
+            str(len(change["removed"])),
+            ", ".join(key.rsplit(".", 1)[-1] for key in change["changed"]),
+        )
+    console.print(table)
+    console.print(f"\n[green]Generated {count} schemas, {count - reused} rendered, {reused} reused[/green]")
+    console.print("\n[green]🎉 Generation completed successfully![/green]")
+
+
 @app.command()
 def generate_k8s(
-    kind: str = typer.Argument(..., help="Kubernetes native kind (e.g., Pod, Service, Deployment)"),
+    kinds: List[str] = typer.Argument(None, help="Kubernetes native kinds (e.g., Pod, Service, Deployment)"),
+    all_kinds: bool = typer.Option(False, "--all", help="Generate every resource kind in the Kubernetes spec"),
     k8s_version: str = typer.Option("1.35.0", "--version", "-v", help="Kubernetes version"),
     output_dir: str = typer.Option(".", "--output", "-o", help="Output directory"),
-    with_blueprint: bool = typer.Option(True, "--blueprint/--no-blueprint", help="Generate blueprint")
+    with_blueprint: bool = typer.Option(True, "--blueprint/--no-blueprint", help="Generate blueprint"),
+    api_version: str = typer.Option(
+        None, "--api-version", "-a", help="Group/version of the kind when several groups serve it (e.g. events.k8s.io/v1)"
+    ),
+    shared_types: bool = typer.Option(
+        False, "--shared-types", help="Put referenced types in shared library/models/k8s/types modules"
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Render kinds in parallel with N processes (0 = all cores)"
+    ),
+    versions: str = typer.Option(
+        None, "--versions", help="Comma-separated Kubernetes versions to generate side by side (e.g. 1.31.0,1.35.0)"
+    ),
+    from_cluster: bool = typer.Option(
+        False, "--from-cluster", help="Read schemas from the cluster's /openapi/v3 instead of the upstream spec"
+    ),
+    context: str = typer.Option(None, "--context", "-c", help="Kubernetes context (with --from-cluster)"),
+    max_depth: int = typer.Option(
+        None, "--max-depth", help="Nesting levels rendered as schemas, deeper objects become {str:any} (0 = no limit)"
+    ),
 ):
-    """Generate KCL schema from native Kubernetes objects"""
+    """Generate KCL schemas from native Kubernetes objects"""
     try:
-        console.print(f"[blue]Generating schema for Kubernetes {kind} (v{k8s_version})[/blue]")
+        from ...core.logic.k8s_generator import iter_generate_k8s_kinds
+        from ...core.logic.k8s_source import list_k8s_resource_kinds
         
-        from ...core.logic.k8s_generator import K8SNativeGenerator
+        if not kinds and not all_kinds:
+            console.print("[red]Error: provide at least one kind or --all[/red]")
+            raise typer.Exit(1)
         
-        # Generate schema
-        generator = K8SNativeGenerator(kind=kind, k8s_version=k8s_version)
-        schema_path, schema_content = generator.generate(base_dir=output_dir)
+        if from_cluster and (versions or all_kinds):
+            console.print("[red]Error: --from-cluster cannot be combined with --versions or --all[/red]")
+            raise typer.Exit(1)
         
-        console.print(f"[green]✅ Schema generated: {schema_path}[/green]")
+        if versions:
+            version_list = [v.strip() for v in versions.split(",") if v.strip()]
+            if shared_types:
+                console.print("[red]Error: --versions cannot be combined with --shared-types[/red]")
+                raise typer.Exit(1)
+            if all_kinds:
+                kinds = sorted({kind for v in version_list for kind in list_k8s_resource_kinds(v)})
+            _generate_k8s_matrix(kinds, version_list, output_dir, api_version, with_blueprint, workers, max_depth)
+            return
         
-        # Generate blueprint if requested
-        if with_blueprint:
-            console.print("[blue]Generating blueprint...[/blue]")
-            
-            blueprint_code, bp_name, main_schema_name = generate_blueprint_from_schema(
-                schema_content, Path(schema_path)
-            )
-            
-            if bp_name:
-                # Save blueprint
-                blueprint_dir = Path(output_dir) / "library" / "blueprints"
-                blueprint_dir.mkdir(parents=True, exist_ok=True)
-                blueprint_path = blueprint_dir / f"{main_schema_name}.k"
-                
-                with open(blueprint_path, "w", encoding='utf-8') as f:
-                    f.write(blueprint_code)
-                
-                console.print(f"[green]✅ Blueprint generated: {blueprint_path}[/green]")
-            else:
-                console.print("[yellow]⚠️ Blueprint generation failed[/yellow]")
+        if all_kinds:
+            kinds = list_k8s_resource_kinds(k8s_version)
         
+        source = f"v{k8s_version}"
+        if from_cluster:
+            source = f"cluster {context}" if context else "cluster"
+        if len(kinds) == 1:
+            console.print(f"[blue]Generating schema for Kubernetes {kinds[0]} ({source})[/blue]")
+        else:
+            console.print(f"[blue]Generating schemas for {len(kinds)} Kubernetes kinds ({source})[/blue]")
+        
+        count = 0
+        for schema_path, schema_content in iter_generate_k8s_kinds(
+            kinds, k8s_version, base_dir=output_dir, api_version=api_version,
+            shared_types=shared_types, workers=workers, from_cluster=from_cluster, context=context,
+            max_depth=max_depth,
+        ):
+            count += 1
+            console.print(f"[green]✅ Schema generated: {schema_path}[/green]")
+            
+            # Generate blueprint if requested
+            if with_blueprint:
+                blueprint_path = _write_blueprint(schema_content, schema_path, output_dir)
+                if blueprint_path:
+                    console.print(f"[green]✅ Blueprint generated: {blueprint_path}[/green]")
+                else:
+                    console.print("[yellow]⚠️ Blueprint generation failed[/yellow]")
+        
+        if shared_types:
+            types_dir = Path(output_dir) / "library" / "models" / "k8s" / "types"
+            console.print(f"[green]✅ Shared types updated: {types_dir}[/green]")
+        if count > 1:
+            console.print(f"\n[green]Generated {count} kinds[/green]")
         console.print("\n[green]🎉 Generation completed successfully![/green]")
         
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
@@ -276,6 +654,70 @@ def validate(
         raise typer.Exit(1)
 
 
+@schemas_app.command("import")
+def schemas_import(
+    versions: List[str] = typer.Argument(None, help="Kubernetes versions to import (e.g. 1.34.0 1.35.0)"),
+    spec_file: str = typer.Option(
+        None, "--file", "-f", help="Import one version from a local swagger.json instead of downloading it"
+    ),
+    from_store: str = typer.Option(None, "--from-store", help="Import every version of another schema store file"),
+    store: str = typer.Option(None, "--store", help="Store file to write (default: ~/.amdf/schemas.sqlite)"),
+):
+    """Import Kubernetes versions into the offline schema store"""
+    try:
+        from ...core.logic.k8s_source import import_k8s_schemas
+        from ...core.logic.schema_store import import_store, user_store_path
+        
+        target = Path(store).expanduser() if store else user_store_path()
+        if not versions and not from_store:
+            console.print("[red]Error: provide at least one version or --from-store[/red]")
+            raise typer.Exit(1)
+        if spec_file and len(versions or []) != 1:
+            console.print("[red]Error: --file imports exactly one version[/red]")
+            raise typer.Exit(1)
+        
+        if from_store:
+            for k8s_version in import_store(Path(from_store).expanduser(), target):
+                console.print(f"[green]✅ Imported Kubernetes v{k8s_version} from {from_store}[/green]")
+        for k8s_version in versions or []:
+            console.print(f"[blue]Importing Kubernetes v{k8s_version}...[/blue]")
+            count = import_k8s_schemas(k8s_version, spec_file, target)
+            console.print(f"[green]✅ Imported {count} definitions for v{k8s_version}[/green]")
+        
+        console.print(f"\n[green]Schema store: {target}[/green]")
+    
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@schemas_app.command("list")
+def schemas_list():
+    """List the Kubernetes versions available offline"""
+    try:
+        from ...core.logic.schema_store import store_summary
+        
+        summary = store_summary()
+        if not summary:
+            console.print("[yellow]No Kubernetes versions in the schema store, use 'amdf schemas import'[/yellow]")
+            return
+        
+        table = Table(title="Offline Kubernetes Schemas")
+        table.add_column("Version", style="cyan")
+        table.add_column("Definitions", justify="right")
+        table.add_column("Source")
+        table.add_column("Store", style="dim")
+        for entry in summary:
+            table.add_row(entry["version"], str(entry["definitions"]), entry["source"] or "", entry["store"])
+        console.print(table)
+    
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
 @app.command()
 def version():
     """Show AMDF version"""
@@ -1,6 +1,6 @@
 from mcp.server.fastmcp import FastMCP
 from pathlib import Path
-from ...core.logic.generator import KCLSchemaGenerator, list_available_crds, init_kcl_module_if_needed
+from ...core.logic.generator import KCLSchemaGenerator, iter_crd_pages, init_kcl_module_if_needed
 from ...core.logic.k8s_generator import K8SNativeGenerator
 from ...core.logic.blueprint import generate_blueprint_from_schema
 from ...core.logic.k8s_source import list_available_k8s_kinds
@@ -9,27 +9,30 @@ from ...core.logic.k8s_source import list_available_k8s_kinds
 server = FastMCP("kcl-schema-generator")
 
 @server.tool()
-def list_k8s_crds(filter_text: str = None, context: str = None) -> list[str]:
+def list_k8s_crds(filter_text: str = None, context: str = None) -> list[dict]:
     """
-    Lists the Custom Resource Definitions (CRDs) available in the Kubernetes cluster.
+    Lists the Custom Resource Definitions (CRDs) available in the Kubernetes cluster,
+    with their name, group, version, kind, plural and scope.
     Optionally filters by text.
     """
     try:
-        crds = list_available_crds(context)
-        if filter_text:
-            return [c for c in crds if filter_text.lower() in c.lower()]
+        # Filter each page as it arrives instead of holding the full list
+        crds = []
+        for page in iter_crd_pages(context, filter_text):
+            crds.extend(crd.model_dump() for crd in page)
         return crds
     except Exception as e:
-        return [f"Error listing CRDs: {str(e)}"]
+        return [{"error": f"Error listing CRDs: {str(e)}"}]
 
 @server.tool()
-def list_k8s_kinds(filter_text: str = None) -> list[str]:
+def list_k8s_kinds(filter_text: str = None, k8s_version: str = None) -> list[str]:
     """
     Lists the native Kubernetes resource kinds available for schema generation.
+    With k8s_version, lists every kind in that version's OpenAPI spec.
     Optionally filters by text.
     """
     try:
-        kinds = list_available_k8s_kinds()
+        kinds = list_available_k8s_kinds(k8s_version)
         if filter_text:
             return [k for k in kinds if filter_text.lower() in k.lower()]
         return kinds
@@ -96,7 +99,14 @@ import library.blueprints.{main_schema_name}
         return f"❌ Critical error during process: {str(e)}"
 
 @server.tool()
-def process_k8s_to_kcl(kind: str, k8s_version: str = "1.35.0") -> str:
+def process_k8s_to_kcl(
+    kind: str,
+    k8s_version: str = "1.35.0",
+    api_version: str = None,
+    shared_types: bool = False,
+    from_cluster: bool = False,
+    context: str = None,
+) -> str:
     """
     Complete workflow for native Kubernetes objects:
     1. Downloads the Kubernetes OpenAPI spec.
@@ -104,13 +114,22 @@ def process_k8s_to_kcl(kind: str, k8s_version: str = "1.35.0") -> str:
     3. Generates detailed KCL Schema in 'library/models'.
     4. Generates simplified KCL Blueprint in 'library/blueprints'.
 
+    api_version selects the group/version when several groups serve the kind
+    (e.g. "events.k8s.io/v1" for Event). With shared_types, referenced types
+    are written once to shared modules in 'library/models/k8s/types'.
+    With from_cluster, the schema is read from the /openapi/v3 document the
+    cluster (optionally a kubeconfig context) serves for the kind's group/version.
+
     Returns the location of the generated files.
     """
     try:
         base_dir = str(Path.cwd())
         
         # Generate schema from native K8s object
-        generator = K8SNativeGenerator(kind=kind, k8s_version=k8s_version)
+        generator = K8SNativeGenerator(
+            kind=kind, k8s_version=k8s_version, api_version=api_version, shared_types=shared_types,
+            from_cluster=from_cluster, context=context,
+        )
         schema_path, schema_content = generator.generate(base_dir=base_dir)
         
         # Generate blueprint
@@ -127,7 +146,8 @@ def process_k8s_to_kcl(kind: str, k8s_version: str = "1.35.0") -> str:
         output_bp_path = blueprint_dir / f"{main_schema_name}.k"
         output_bp_path.write_text(blueprint_code, encoding='utf-8')
         
-        return f"""✅ Kubernetes {kind} schema generated successfully (v{k8s_version}).
+        source = ("cluster " + (context or "")).strip() if from_cluster else f"v{k8s_version}"
+        return f"""✅ Kubernetes {kind} schema generated successfully ({source}).
 
 1. Detailed Schema (Backend):
    {schema_path}
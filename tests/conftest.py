@@ -0,0 +1,266 @@
+"""
+Shared fixtures: small CRD documents and a trimmed Kubernetes spec built in memory
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+def make_crd(group, kind, schema, version="v1"):
+    """A CustomResourceDefinition document serving one version with the given openAPIV3Schema"""
+    plural = kind.lower() + "s"
+    return {
+        "apiVersion": "apiextensions.k8s.io/v1",
+        "kind": "CustomResourceDefinition",
+        "metadata": {"name": f"{plural}.{group}"},
+        "spec": {
+            "group": group,
+            "names": {"kind": kind, "plural": plural},
+            "scope": "Namespaced",
+            "versions": [{"name": version, "served": True, "schema": {"openAPIV3Schema": schema}}],
+        },
+    }
+
+
+def nested_object(levels):
+    """An object schema nested levels deep, with an array of objects at every level"""
+    node = {"type": "object", "properties": {"leaf": {"type": "string"}}}
+    for i in range(levels):
+        node = {
+            "type": "object",
+            "properties": {
+                f"level{i}": node,
+                "entries": {"type": "array", "items": {"type": "object", "properties": {"id": {"type": "integer"}}}},
+            },
+        }
+    return node
+
+
+def root_schema(spec):
+    return {
+        "type": "object",
+        "properties": {
+            "apiVersion": {"type": "string"},
+            "kind": {"type": "string"},
+            "metadata": {"type": "object"},
+            "spec": spec,
+        },
+    }
+
+
+@pytest.fixture
+def deep_crds():
+    """CRDs deeper than the default depth limit, in two groups"""
+    return [
+        make_crd("deep.example.io", "Deep", root_schema(nested_object(40))),
+        make_crd("deep.example.io", "Shallow", root_schema(nested_object(4))),
+        make_crd("other.example.io", "Other", root_schema(nested_object(12))),
+    ]
+
+
+def _gvk(group, version, kind):
+    return {"x-kubernetes-group-version-kind": [{"group": group, "version": version, "kind": kind}]}
+
+
+def _ref(key):
+    return {"$ref": f"#/definitions/{key}"}
+
+
+META = "io.k8s.apimachinery.pkg.apis.meta.v1"
+CORE = "io.k8s.api.core.v1"
+
+# A trimmed swagger spec laid out like upstream: kinds reference their spec by $ref
+K8S_SPEC = {
+    "definitions": {
+        f"{META}.ObjectMeta": {
+            "type": "object",
+            "properties": {"name": {"type": "string"}, "labels": {"type": "object", "additionalProperties": {"type": "string"}}},
+        },
+        f"{META}.LabelSelector": {
+            "type": "object",
+            "properties": {"matchLabels": {"type": "object", "additionalProperties": {"type": "string"}}},
+        },
+        f"{CORE}.Container": {
+            "type": "object",
+            "required": ["name"],
+            "properties": {"name": {"type": "string"}, "image": {"type": "string"}},
+        },
+        f"{CORE}.PodSpec": {
+            "type": "object",
+            "required": ["containers"],
+            "properties": {
+                "containers": {"type": "array", "items": _ref(f"{CORE}.Container")},
+                "initContainers": {"type": "array", "items": _ref(f"{CORE}.Container")},
+                "nodeName": {"type": "string"},
+            },
+        },
+        f"{CORE}.PodTemplateSpec": {
+            "type": "object",
+            "properties": {"metadata": _ref(f"{META}.ObjectMeta"), "spec": _ref(f"{CORE}.PodSpec")},
+        },
+        f"{CORE}.Pod": {
+            "type": "object",
+            "properties": {
+                "apiVersion": {"type": "string"},
+                "kind": {"type": "string"},
+                "metadata": _ref(f"{META}.ObjectMeta"),
+                "spec": _ref(f"{CORE}.PodSpec"),
+            },
+            **_gvk("", "v1", "Pod"),
+        },
+        f"{CORE}.Event": {
+            "type": "object",
+            "properties": {"apiVersion": {"type": "string"}, "kind": {"type": "string"}, "message": {"type": "string"}},
+            **_gvk("", "v1", "Event"),
+        },
+        "io.k8s.api.events.v1.Event": {
+            "type": "object",
+            "properties": {"apiVersion": {"type": "string"}, "kind": {"type": "string"}, "note": {"type": "string"}},
+            **_gvk("events.k8s.io", "v1", "Event"),
+        },
+        "io.k8s.api.apps.v1.DeploymentSpec": {
+            "type": "object",
+            "required": ["selector", "template"],
+            "properties": {
+                "replicas": {"type": "integer"},
+                "selector": _ref(f"{META}.LabelSelector"),
+                "template": _ref(f"{CORE}.PodTemplateSpec"),
+            },
+        },
+        "io.k8s.api.apps.v1.Deployment": {
+            "type": "object",
+            "properties": {
+                "apiVersion": {"type": "string"},
+                "kind": {"type": "string"},
+                "metadata": _ref(f"{META}.ObjectMeta"),
+                "spec": _ref("io.k8s.api.apps.v1.DeploymentSpec"),
+            },
+            **_gvk("apps", "v1", "Deployment"),
+        },
+        "io.k8s.api.networking.v1.Ingress": {
+            "type": "object",
+            "properties": {"apiVersion": {"type": "string"}, "kind": {"type": "string"}, "metadata": _ref(f"{META}.ObjectMeta")},
+            **_gvk("networking.k8s.io", "v1", "Ingress"),
+        },
+        "io.k8s.apiextensions-apiserver.pkg.apis.apiextensions.v1.CustomResourceDefinition": {
+            "type": "object",
+            "properties": {"apiVersion": {"type": "string"}, "kind": {"type": "string"}, "metadata": _ref(f"{META}.ObjectMeta")},
+            **_gvk("apiextensions.k8s.io", "v1", "CustomResourceDefinition"),
+        },
+    }
+}
+
+K8S_TEST_VERSION = "0.0.1-test"
+
+
+# Two kinds whose specs reference each other through a $ref cycle: A -> B -> A
+CYCLIC_SPEC = {
+    "definitions": {
+        "io.example.v1.A": {"type": "object", "properties": {"name": {"type": "string"}, "b": _ref("io.example.v1.B")}},
+        "io.example.v1.B": {"type": "object", "properties": {"size": {"type": "integer"}, "a": _ref("io.example.v1.A")}},
+        **{
+            f"io.example.v1.{kind}": {
+                "type": "object",
+                "properties": {
+                    "apiVersion": {"type": "string"},
+                    "kind": {"type": "string"},
+                    "spec": _ref(f"io.example.v1.{spec}"),
+                },
+                **_gvk("example.io", "v1", kind),
+            }
+            for kind, spec in (("KA", "A"), ("KB", "B"), ("KC", "A"))
+        },
+    }
+}
+
+
+@pytest.fixture
+def import_k8s_spec(tmp_path, monkeypatch):
+    """Import a swagger spec into a private schema store as K8S_TEST_VERSION"""
+    from amdf.core.config import config
+    from amdf.core.logic import k8s_generator
+    from amdf.core.logic.k8s_source import import_k8s_schemas
+
+    monkeypatch.setattr(config, "schema_store", str(tmp_path / "schemas.sqlite"))
+    monkeypatch.setattr(k8s_generator, "_resolution_memos", {})
+    monkeypatch.setattr(k8s_generator, "_shared_type_renders", {})
+
+    def import_spec(spec):
+        spec_file = tmp_path / "swagger.json"
+        spec_file.write_text(json.dumps(spec))
+        import_k8s_schemas(K8S_TEST_VERSION, str(spec_file))
+        return K8S_TEST_VERSION
+
+    return import_spec
+
+
+@pytest.fixture
+def k8s_store(import_k8s_spec):
+    """K8S_SPEC imported into a private schema store as K8S_TEST_VERSION"""
+    return import_k8s_spec(K8S_SPEC)
+
+
+@pytest.fixture
+def cyclic_k8s_store(import_k8s_spec):
+    """CYCLIC_SPEC imported into a private schema store as K8S_TEST_VERSION"""
+    return import_k8s_spec(CYCLIC_SPEC)
+
+
+class _APIHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.server.requests.append((url.path, query, dict(self.headers)))
+        route = self.server.routes.get(url.path)
+        status, headers, body = route(query, self.headers) if route else (404, {}, {"message": "not found"})
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api_server(tmp_path, monkeypatch):
+    """
+    A local stand-in for the Kubernetes API server, reached through a
+    kubeconfig context named "fake". Tests register handlers in
+    server.routes ({path: handler(query, headers) -> (status, headers, body)})
+    and read what was asked in server.requests ([(path, query, headers)]).
+    """
+    from amdf.core import kube_client
+    from amdf.core.config import config
+    from amdf.core.logic import cluster_openapi
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _APIHandler)
+    server.routes, server.requests = {}, []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    kubeconfig = tmp_path / "kubeconfig"
+    kubeconfig.write_text(json.dumps({
+        "clusters": [{"name": "fake", "cluster": {"server": f"http://127.0.0.1:{server.server_port}"}}],
+        "users": [{"name": "fake", "user": {"token": "secret"}}],
+        "contexts": [{"name": "fake", "context": {"cluster": "fake", "user": "fake"}}],
+        "current-context": "fake",
+    }))
+    monkeypatch.setenv("KUBECONFIG", str(kubeconfig))
+    monkeypatch.setattr(config, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "use_kube_client", True)
+    monkeypatch.setattr(kube_client, "_clients", {})
+    monkeypatch.setattr(kube_client, "_build_locks", {})
+    for name in ("http_proxy", "HTTP_PROXY", "https_proxy", "HTTPS_PROXY"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(cluster_openapi, "_discoveries", {})
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,27 @@
+"""
+Blueprint generation
+"""
+
+from pathlib import Path
+
+from amdf.core.logic.blueprint import generate_blueprint_from_schema
+from amdf.core.logic.k8s_generator import iter_generate_k8s_kinds
+
+
+def _blueprint(schema_path, content):
+    code, name, _ = generate_blueprint_from_schema(content, Path(schema_path))
+    assert name
+    return code
+
+
+def test_shared_types_blueprint_keeps_spec_parameters(k8s_store, tmp_path):
+    generated = dict(iter_generate_k8s_kinds(
+        ["Deployment", "Pod"], k8s_store, base_dir=str(tmp_path), shared_types=True
+    ))
+    deployment, pod = (_blueprint(path, content) for path, content in generated.items())
+
+    assert "_replicas? : int" in deployment
+    assert "_template : core_v1.PodTemplateSpec" in deployment
+    assert "    spec = {\n        replicas = _replicas" in deployment
+    assert "_containers : [core_v1.Container]" in pod
+    assert "_initContainers? : [core_v1.Container]" in pod
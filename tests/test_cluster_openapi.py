@@ -0,0 +1,69 @@
+"""
+Cluster OpenAPI v3 source, against a local stand-in API server
+"""
+
+from amdf.core.logic import cluster_openapi
+from amdf.core.logic.cluster_openapi import load_cluster_definition_table, load_openapi_v3_paths
+
+APPS_V1 = "/openapi/v3/apis/apps/v1"
+APPS_V1_URL = f"{APPS_V1}?hash=ABC123"
+
+APPS_V1_DOCUMENT = {
+    "components": {
+        "schemas": {
+            "io.k8s.api.apps.v1.Deployment": {
+                "type": "object",
+                "properties": {
+                    "spec": {"allOf": [{"$ref": "#/components/schemas/io.k8s.api.apps.v1.DeploymentSpec"}]},
+                },
+                "x-kubernetes-group-version-kind": [{"group": "apps", "version": "v1", "kind": "Deployment"}],
+            },
+            "io.k8s.api.apps.v1.DeploymentSpec": {"type": "object", "properties": {"replicas": {"type": "integer"}}},
+        }
+    }
+}
+
+
+def _serve(server, discovery_etag="v1"):
+    def discovery(query, headers):
+        if headers.get("If-None-Match") == discovery_etag:
+            return 304, {"ETag": discovery_etag}, b""
+        return 200, {"ETag": discovery_etag}, {"paths": {"apis/apps/v1": {"serverRelativeURL": APPS_V1_URL}}}
+
+    server.routes["/openapi/v3"] = discovery
+    server.routes[APPS_V1] = lambda query, headers: (200, {}, APPS_V1_DOCUMENT)
+
+
+def _fetched(server, path):
+    return [request for request in server.requests if request[0] == path]
+
+
+def test_discovery_lists_group_versions(api_server):
+    _serve(api_server)
+    assert load_openapi_v3_paths("fake") == {"apis/apps/v1": APPS_V1_URL}
+
+
+def test_group_version_document_is_converted_and_fetched_once(api_server, monkeypatch):
+    _serve(api_server)
+    definitions = load_cluster_definition_table("apps/v1", "fake")
+    deployment = definitions["io.k8s.api.apps.v1.Deployment"]
+    assert deployment["properties"]["spec"] == {"$ref": "#/definitions/io.k8s.api.apps.v1.DeploymentSpec"}
+    assert _fetched(api_server, APPS_V1)[0][1] == {"hash": "ABC123"}
+
+    # A new process: the discovery document is revalidated, the hashed document is immutable
+    monkeypatch.setattr(cluster_openapi, "_discoveries", {})
+    load_cluster_definition_table("apps/v1", "fake")
+    assert len(_fetched(api_server, APPS_V1)) == 1
+
+
+def test_unchanged_discovery_is_revalidated_with_its_etag(api_server, monkeypatch):
+    _serve(api_server)
+    load_openapi_v3_paths("fake")
+
+    monkeypatch.setattr(cluster_openapi, "_discoveries", {})
+    # The 304 carries no body, so these paths can only come from the cached document
+    assert load_openapi_v3_paths("fake") == {"apis/apps/v1": APPS_V1_URL}
+
+    revalidation = _fetched(api_server, "/openapi/v3")
+    assert len(revalidation) == 2
+    assert revalidation[-1][2].get("If-None-Match") == "v1"
@@ -0,0 +1,66 @@
+"""
+Local CRD file source
+"""
+
+import gzip
+import io
+import tarfile
+
+import yaml
+
+from amdf.core.logic.crd_files import iter_crds_from_files
+from conftest import make_crd, nested_object, root_schema
+
+HELM_TEMPLATE = """apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: {{ include "chart.fullname" . }}
+  labels:
+    {{- include "chart.labels" . | nindent 4 }}
+"""
+
+
+def _crd_yaml(kind):
+    return yaml.safe_dump(make_crd("example.io", kind, root_schema(nested_object(1))))
+
+
+def _add(archive, name, data):
+    data = data.encode() if isinstance(data, str) else data
+    member = tarfile.TarInfo(name)
+    member.size = len(data)
+    archive.addfile(member, io.BytesIO(data))
+
+
+def _names(crds):
+    return [crd["metadata"]["name"] for crd in crds]
+
+
+def test_unparsable_files_are_skipped(tmp_path, capsys):
+    (tmp_path / "a-widget.yaml").write_text(_crd_yaml("Widget"))
+    (tmp_path / "b-deployment.yaml").write_text(HELM_TEMPLATE)
+    (tmp_path / "c-gadget.yaml").write_text(_crd_yaml("Gadget"))
+
+    assert _names(iter_crds_from_files([str(tmp_path)])) == ["widgets.example.io", "gadgets.example.io"]
+    assert "Skipping" in capsys.readouterr().out
+
+
+def test_unparsable_chart_members_are_skipped(tmp_path, capsys):
+    chart = tmp_path / "chart.tgz"
+    with tarfile.open(chart, "w:gz") as archive:
+        _add(archive, "chart/crds/a-template.yaml", HELM_TEMPLATE)
+        _add(archive, "chart/crds/b-widget.yaml", _crd_yaml("Widget"))
+
+    assert _names(iter_crds_from_files([str(chart)])) == ["widgets.example.io"]
+    assert "chart/crds/a-template.yaml" in capsys.readouterr().out
+
+
+def test_compressed_members_that_are_not_tarballs(tmp_path, capsys):
+    package = tmp_path / "package.xpkg"
+    with tarfile.open(package, "w") as archive:
+        _add(archive, "crds/widgets.yaml.gz", gzip.compress(_crd_yaml("Widget").encode()))
+        _add(archive, "docs/notes.txt.gz", gzip.compress(b"not a tarball"))
+        _add(archive, "broken.tar.gz", b"\x1f\x8b" + b"\x00" * 64)
+        _add(archive, "package.yaml", _crd_yaml("Gadget"))
+
+    assert _names(iter_crds_from_files([str(package)])) == ["widgets.example.io", "gadgets.example.io"]
+    assert "broken.tar.gz" in capsys.readouterr().out
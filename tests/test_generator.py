@@ -0,0 +1,115 @@
+"""
+CRD schema generation
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import pytest
+
+from amdf.core.config import config
+from amdf.core.kube_client import CRD_API_PATH
+from amdf.core.logic import generator
+from amdf.core.logic.generator import (
+    KCLSchemaGenerator,
+    fetch_crds,
+    find_common_shapes,
+    iter_generate_crds,
+    plan_common_modules,
+    render_crd,
+    render_crds,
+)
+from conftest import make_crd, nested_object, root_schema
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("dedupe, common_types", [(False, False), (True, False), (False, True), (True, True)])
+def test_pathological_depth_is_bounded(tmp_path, workers, dedupe, common_types):
+    crds = [make_crd("deep.example.io", kind, root_schema(nested_object(3000))) for kind in ("Deep", "Deeper")]
+
+    generated = list(iter_generate_crds(
+        crds, base_dir=str(tmp_path), workers=workers, dedupe=dedupe, common_types=common_types
+    ))
+
+    assert len(generated) == 2
+    schemas = "".join(content for _, content in generated)
+    if common_types:
+        schemas += (tmp_path / "library" / "models" / "deep_example_io" / "common.k").read_text()
+    assert "{str:any}" in schemas
+    # Two CRDs, at most an object and an array item schema per rendered level
+    assert schemas.count("\nschema ") <= 2 * 2 * (config.max_schema_depth + 2)
+
+
+def test_depth_limit_collapses_deeper_objects(deep_crds):
+    _, content = render_crd(deep_crds[0], max_depth=4)
+    assert "{str:any}" in content
+    assert content.count("\nschema ") < render_crd(deep_crds[0], max_depth=0)[1].count("\nschema ")
+
+
+def test_spawn_workers_render_like_serial(deep_crds, monkeypatch):
+    # A non-default limit set only in this process must still reach spawned workers
+    monkeypatch.setattr(config, "max_schema_depth", 3)
+    serial = list(render_crds(deep_crds, workers=1))
+
+    spawn = multiprocessing.get_context("spawn")
+    monkeypatch.setattr(generator, "ProcessPoolExecutor", partial(ProcessPoolExecutor, mp_context=spawn))
+    parallel = list(render_crds(deep_crds, workers=2))
+
+    assert parallel == serial
+    assert "{str:any}" in serial[0][1]
+
+
+def test_shape_key_ignores_own_description_and_survives_deep_nesting():
+    generator = KCLSchemaGenerator()
+    shallow = nested_object(2)
+    described = {**nested_object(2), "description": "Documented at the parent"}
+    assert generator._shape_key(shallow) == generator._shape_key(described)
+    assert generator._shape_key(shallow) != generator._shape_key(nested_object(3))
+
+    deep = nested_object(3000)
+    assert generator._shape_key(deep) == KCLSchemaGenerator()._shape_key(nested_object(3000))
+
+
+def test_common_shapes_stop_at_the_depth_limit():
+    crds = [make_crd("deep.example.io", kind, root_schema(nested_object(3000))) for kind in ("Deep", "Deeper")]
+
+    shapes = find_common_shapes(crds, max_depth=6)["deep.example.io"]
+    names, blocks = plan_common_modules(crds, max_depth=6)
+
+    # spec and its nested levels up to depth 6: level2999..level2996 and the shared entries item
+    assert sorted(name for name, _ in shapes.values()) == ["entriesItem"] + [f"level{i}" for i in range(2996, 3000)]
+    deepest = blocks["deep.example.io"][next(k for k, n in names["deep.example.io"].items() if n == "Level2996")]
+    assert "level2995? : {str:any}" in deepest
+
+
+def test_many_exact_names_are_resolved_with_one_list(api_server):
+    crds = {}
+    for i in range(5):
+        crd = make_crd("example.io", f"Kind{i}", root_schema(nested_object(1)))
+        crd["metadata"].update(uid=f"uid-{i}", generation=1)
+        crds[crd["metadata"]["name"]] = crd
+    api_server.routes[CRD_API_PATH] = lambda query, headers: (
+        200, {}, {"metadata": {}, "items": [{"metadata": crd["metadata"]} for crd in crds.values()]}
+    )
+    for name, crd in crds.items():
+        api_server.routes[f"{CRD_API_PATH}/{name}"] = lambda query, headers, crd=crd: (200, {}, crd)
+    names = sorted(crds)[:4]
+
+    cold = fetch_crds(names)
+    cold_requests = [path for path, _, _ in api_server.requests]
+    api_server.requests.clear()
+    warm = fetch_crds(names)
+
+    assert [crd["metadata"]["name"] for crd in cold] == names
+    assert warm == cold
+    assert cold_requests == [CRD_API_PATH] + [f"{CRD_API_PATH}/{name}" for name in names]
+    # Cached documents are reused, nothing but the metadata list goes out
+    assert [path for path, _, _ in api_server.requests] == [CRD_API_PATH]
+
+
+def test_missing_exact_name_fails_like_kubectl(api_server):
+    api_server.routes[CRD_API_PATH] = lambda query, headers: (200, {}, {"metadata": {}, "items": []})
+
+    with pytest.raises(RuntimeError, match="Not found: a.example.io, b.example.io, c.example.io, d.example.io"):
+        fetch_crds([f"{name}.example.io" for name in "abcd"])
@@ -0,0 +1,53 @@
+"""
+Native Kubernetes kind generation
+"""
+
+import json
+
+import pytest
+
+from amdf.core.logic import k8s_generator
+from amdf.core.logic.k8s_generator import K8SNativeGenerator, render_k8s_kinds
+from amdf.core.logic.k8s_matrix import iter_generate_k8s_matrix
+
+
+@pytest.mark.parametrize("kind, api_version, expected_api_version, expected_dir", [
+    ("Pod", None, "v1", "v1"),
+    ("Deployment", None, "apps/v1", "apps_v1"),
+    ("Event", "events.k8s.io/v1", "events.k8s.io/v1", "events_k8s_io_v1"),
+    ("Ingress", None, "networking.k8s.io/v1", "networking_k8s_io_v1"),
+    ("CustomResourceDefinition", None, "apiextensions.k8s.io/v1", "apiextensions_k8s_io_v1"),
+])
+def test_api_version_comes_from_group_version_kind(k8s_store, kind, api_version, expected_api_version, expected_dir):
+    relative_path, content = K8SNativeGenerator(kind, k8s_store, api_version=api_version).render()
+
+    assert f'apiVersion : str = "{expected_api_version}"' in content
+    assert relative_path == f"library/models/k8s/{expected_dir}/k8s_{expected_dir}_{kind}.k"
+
+
+def test_kind_output_does_not_depend_on_kinds_generated_before(cyclic_k8s_store, monkeypatch):
+    _, alone = K8SNativeGenerator("KB", cyclic_k8s_store).render()
+
+    monkeypatch.setattr(k8s_generator, "_resolution_memos", {})
+    K8SNativeGenerator("KA", cyclic_k8s_store).render()
+    _, after_ka = K8SNativeGenerator("KB", cyclic_k8s_store).render()
+
+    assert "a? : KbspecA" in alone
+    assert after_ka == alone
+
+
+def test_parallel_kinds_render_like_serial(cyclic_k8s_store):
+    tasks = [(kind, cyclic_k8s_store, None, False, False, None, 32) for kind in ("KA", "KB", "KC")]
+
+    parallel = list(render_k8s_kinds(tasks, workers=3))
+    serial = list(render_k8s_kinds(tasks, workers=1))
+
+    assert parallel == serial
+
+
+def test_matrix_report_is_written_when_no_kind_exists(k8s_store, tmp_path):
+    generated = list(iter_generate_k8s_matrix(["Nope"], [k8s_store], base_dir=str(tmp_path)))
+
+    report = json.loads((tmp_path / "library" / "models" / "k8s" / "version-changes.json").read_text())
+    assert generated == []
+    assert report["missing"] == {k8s_store: ["Nope"]}
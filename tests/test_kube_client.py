@@ -0,0 +1,150 @@
+"""
+Shared Kubernetes API clients
+"""
+
+import gzip
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from amdf.core import kube_client
+from amdf.core.kube_client import (
+    CRD_API_PATH,
+    PARTIAL_METADATA_LIST,
+    KubeClient,
+    evict_kube_client,
+    get_kube_client,
+)
+
+
+@pytest.fixture
+def fresh_clients(monkeypatch):
+    """Count the clients built from kubeconfig"""
+    built = []
+
+    def from_kubeconfig(context=None, kubeconfig=None):
+        built.append(KubeClient("http://127.0.0.1:1"))
+        return built[-1]
+
+    monkeypatch.setattr(kube_client, "_clients", {})
+    monkeypatch.setattr(kube_client, "_build_locks", {})
+    monkeypatch.setattr(kube_client.config, "use_kube_client", True)
+    monkeypatch.setattr(KubeClient, "from_kubeconfig", staticmethod(from_kubeconfig))
+    return built
+
+
+def test_evicted_client_is_rebuilt(fresh_clients):
+    first = get_kube_client("ctx")
+    assert get_kube_client("ctx") is first
+
+    evict_kube_client("ctx")
+    assert get_kube_client("ctx") is not first
+    assert len(fresh_clients) == 2
+
+
+def test_expired_exec_credentials_are_renewed(fresh_clients):
+    first = get_kube_client("ctx")
+    first.expires_at = time.time() + 3600
+    assert get_kube_client("ctx") is first
+
+    first.expires_at = time.time() + 10
+    assert get_kube_client("ctx") is not first
+
+
+def test_expiration_timestamp():
+    assert kube_client._expiration({"expirationTimestamp": "2030-01-01T00:00:00Z"}) == 1893456000
+    assert kube_client._expiration({}) is None
+
+
+def test_contexts_are_built_in_parallel(fresh_clients, monkeypatch):
+    # Both builds must be under way at once: a slow exec plugin of one
+    # context does not hold up the others
+    both_building = threading.Barrier(2, timeout=5)
+
+    def from_kubeconfig(context=None, kubeconfig=None):
+        both_building.wait()
+        return KubeClient("http://127.0.0.1:1")
+
+    monkeypatch.setattr(KubeClient, "from_kubeconfig", staticmethod(from_kubeconfig))
+    clients = {}
+    threads = [
+        threading.Thread(target=lambda name=name: clients.update({name: get_kube_client(name)}))
+        for name in ("one", "two")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert clients["one"] is not None and clients["two"] is not None
+    assert get_kube_client("one") is clients["one"]
+
+
+def _crd(name):
+    return {"metadata": {"name": name, "resourceVersion": "1"}, "spec": {"group": name.split(".", 1)[1]}}
+
+
+def test_list_follows_continue_tokens(api_server):
+    def crds(query, headers):
+        if query.get("continue") == "page2":
+            return 200, {}, {"metadata": {}, "items": [_crd("c.example.io")]}
+        return 200, {}, {"metadata": {"continue": "page2"}, "items": [_crd("a.example.io"), _crd("b.example.io")]}
+
+    api_server.routes[CRD_API_PATH] = crds
+    pages = list(get_kube_client().iter_pages(CRD_API_PATH, limit=2))
+
+    assert [[item["metadata"]["name"] for item in page] for page in pages] == [
+        ["a.example.io", "b.example.io"],
+        ["c.example.io"],
+    ]
+    assert [query for _, query, _ in api_server.requests] == [
+        {"limit": "2"},
+        {"limit": "2", "continue": "page2"},
+    ]
+
+
+def test_gzip_responses_are_decompressed(api_server):
+    body = gzip.compress(json.dumps({"metadata": {}, "items": [_crd("a.example.io")]}).encode())
+    api_server.routes[CRD_API_PATH] = lambda query, headers: (200, {"Content-Encoding": "gzip"}, body)
+
+    assert [crd["metadata"]["name"] for crd in get_kube_client().list_crds()] == ["a.example.io"]
+    assert api_server.requests[0][2]["Accept-Encoding"] == "gzip"
+
+
+def test_crd_metadata_is_listed_without_specs(api_server):
+    def crds(query, headers):
+        if "PartialObjectMetadataList" not in headers["Accept"]:
+            return 200, {}, {"metadata": {}, "items": [_crd("a.example.io")]}
+        return 200, {}, {"metadata": {}, "items": [{"metadata": _crd("a.example.io")["metadata"]}]}
+
+    api_server.routes[CRD_API_PATH] = crds
+    pages = list(get_kube_client().iter_crd_metadata())
+
+    assert pages == [[{"name": "a.example.io", "resourceVersion": "1"}]]
+    assert api_server.requests[0][2]["Accept"] == PARTIAL_METADATA_LIST
+    assert api_server.requests[0][2]["Authorization"] == "Bearer secret"
+
+
+@pytest.mark.parametrize("section, setting", [
+    ("cluster", {"proxy-url": "http://proxy:3128"}),
+    ("cluster", {"tls-server-name": "api.internal"}),
+    ("user", {"as": "admin"}),
+])
+def test_unsupported_kubeconfig_falls_back_to_kubectl(api_server, section, setting):
+    with open(os.environ["KUBECONFIG"]) as f:
+        kubeconfig = json.load(f)
+    kubeconfig[f"{section}s"][0][section].update(setting)
+    with open(os.environ["KUBECONFIG"], "w") as f:
+        json.dump(kubeconfig, f)
+
+    assert get_kube_client() is None
+
+
+def test_proxied_server_falls_back_to_kubectl(api_server, monkeypatch):
+    monkeypatch.setenv("http_proxy", "http://proxy:3128")
+    monkeypatch.setenv("no_proxy", "")
+
+    assert get_kube_client() is None
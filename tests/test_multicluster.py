@@ -0,0 +1,35 @@
+"""
+Multi-cluster CRD discovery
+"""
+
+import pytest
+
+from amdf.core.logic import multicluster
+from conftest import make_crd, nested_object, root_schema
+
+
+def _fetch(crds_by_context):
+    def fetch_crds(patterns, context=None):
+        if context not in crds_by_context:
+            raise FileNotFoundError(2, "No such file or directory", "kubectl")
+        return crds_by_context[context]
+    return fetch_crds
+
+
+def test_failing_context_does_not_stop_the_others(monkeypatch):
+    crd = make_crd("example.io", "Widget", root_schema(nested_object(1)))
+    monkeypatch.setattr(multicluster, "fetch_crds", _fetch({"ctx1": [crd]}))
+
+    crds, presence, errors = multicluster.fetch_crds_across(None, ["ctx1", "nope"])
+
+    assert crds == [crd]
+    assert presence["widgets.example.io"]["nope"] is None
+    assert list(errors) == ["nope"]
+    assert errors["nope"].startswith("Context 'nope': ") and "kubectl" in errors["nope"]
+
+
+def test_every_context_failing_raises(monkeypatch):
+    monkeypatch.setattr(multicluster, "fetch_crds", _fetch({}))
+
+    with pytest.raises(RuntimeError, match="Context 'a': .*; Context 'b': "):
+        multicluster.fetch_crds_across(None, ["a", "b"])
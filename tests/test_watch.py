@@ -0,0 +1,92 @@
+"""
+CRD watch mode
+"""
+
+import queue
+import threading
+
+from amdf.core.exceptions import KubeAPIError
+from amdf.core.logic import watch
+
+
+def _drain(events):
+    drained = []
+    while not events.empty():
+        drained.append(events.get_nowait())
+    return drained
+
+
+def test_resync_reports_changes_made_while_disconnected():
+    known = {"a.example.io": 1, "b.example.io": 1, "c.example.io": 1, "x.other.io": 1}
+    current = {"a.example.io": 1, "b.example.io": 2, "d.example.io": 1}
+    events = queue.Queue()
+
+    watch._resync(known, current, True, ["*.example.io"], lambda name: {"metadata": {"name": name}}, events)
+
+    reported = {(payload["type"], payload["object"]["metadata"]["name"]) for _, payload in _drain(events)}
+    assert reported == {("MODIFIED", "b.example.io"), ("ADDED", "d.example.io"), ("DELETED", "c.example.io")}
+    assert "x.other.io" not in known
+
+
+def test_first_listing_only_seeds_known():
+    known, events = {}, queue.Queue()
+    watch._resync(known, {"a.example.io": 1}, False, None, None, events)
+    assert known == {"a.example.io": 1}
+    assert events.empty()
+
+
+class _FakeClient:
+    def __init__(self, watch_errors):
+        self.watch_errors = list(watch_errors)
+        self.resource_versions = []
+        self.lists = 0
+        self.watching = threading.Event()
+
+    def list_resource_version(self, path):
+        self.lists += 1
+        return str(self.lists)
+
+    def iter_crd_metadata(self):
+        yield []
+
+    def get_crd(self, name):
+        return {"metadata": {"name": name}}
+
+    def watch(self, path, resource_version=None):
+        self.resource_versions.append(resource_version)
+        if self.watch_errors:
+            raise self.watch_errors.pop(0)
+        self.watching.set()
+        threading.Event().wait()
+        yield {}
+
+
+def _pump(monkeypatch, clients):
+    """Run _pump_events with the given clients handed out by get_kube_client, until the last one watches"""
+    handed_out = iter(clients)
+    evicted = []
+    monkeypatch.setattr(watch, "get_kube_client", lambda context: next(handed_out))
+    monkeypatch.setattr(watch, "evict_kube_client", evicted.append)
+    monkeypatch.setattr(watch, "_RETRY_SECONDS", 0)
+    events = queue.Queue()
+    threading.Thread(target=watch._pump_events, args=("ctx", None, events, {}), daemon=True).start()
+    assert clients[-1].watching.wait(10)
+    return evicted, _drain(events)
+
+
+def test_watch_relists_after_410(monkeypatch):
+    client = _FakeClient([KubeAPIError("410 Gone", status=410)])
+    _, events = _pump(monkeypatch, [client])
+
+    assert client.lists == 2
+    assert client.resource_versions == ["1", "2"]
+    assert not [payload for kind, payload in events if kind == "error"]
+
+
+def test_watch_renews_client_after_401(monkeypatch):
+    expired, renewed = _FakeClient([KubeAPIError("401 Unauthorized", status=401)]), _FakeClient([])
+    evicted, events = _pump(monkeypatch, [expired, renewed])
+
+    assert evicted == ["ctx"]
+    assert renewed.resource_versions == ["1"]
+    assert [kind for kind, _ in events].count("error") == 1